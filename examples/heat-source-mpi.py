@@ -35,11 +35,13 @@ from grudge import sym as grudge_sym
 from grudge.shortcuts import make_visualizer
 from grudge.symbolic.primitives import QTAG_NONE
 from mirgecom.integrators import rk4_step
+from mirgecom.exchange import free_exchange_resources
 from mirgecom.diffusion import (
-    diffusion_operator,
+    DiffusionOperator,
     DirichletDiffusionBoundary,
     NeumannDiffusionBoundary)
 from mirgecom.mpi import mpi_entry_point
+from mirgecom.stability import get_stable_timestep
 import pyopencl.tools as cl_tools
 
 
@@ -88,12 +90,6 @@ def main():
     discr = EagerDGDiscretization(actx, local_mesh, order=order,
                     mpi_communicator=comm)
 
-    if dim == 2:
-        # no deep meaning here, just a fudge factor
-        dt = 0.0025/(nel_1d*order**2)
-    else:
-        raise ValueError("don't have a stable time step guesstimate")
-
     source_width = 0.2
 
     nodes = thaw(actx, discr.nodes())
@@ -107,10 +103,15 @@ def main():
 
     vis = make_visualizer(discr, order+3 if dim == 2 else order)
 
+    diffusion_operator = DiffusionOperator(discr, quad_tag=QTAG_NONE, alpha=1,
+        boundaries=boundaries)
+    source = actx.np.exp(-np.dot(nodes, nodes)/source_width**2)
+
     def rhs(t, u):
-        return (diffusion_operator(
-            discr, quad_tag=QTAG_NONE, alpha=1, boundaries=boundaries, u=u)
-            + actx.np.exp(-np.dot(nodes, nodes)/source_width**2))
+        return diffusion_operator(u) + source
+
+    dt = get_stable_timestep(discr, rhs, u, rk4_step,
+        cache_key=("diffusion", 1))
 
     rank = comm.Get_rank()
 
@@ -133,6 +134,9 @@ def main():
         t += dt
         istep += 1
 
+    # Collective, so all ranks free the exchange resources here
+    free_exchange_resources(discr)
+
 
 if __name__ == "__main__":
     main()
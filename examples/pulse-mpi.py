@@ -37,6 +37,7 @@ from meshmode.mesh import BTAG_ALL, BTAG_NONE  # noqa
 from grudge.eager import EagerDGDiscretization
 from grudge.shortcuts import make_visualizer
 
+from mirgecom.exchange import free_exchange_resources
 from mirgecom.euler import (
     inviscid_operator,
     #    split_conserved
@@ -174,6 +175,9 @@ def main(ctx_factory=cl.create_some_context):
                   dt=(current_t - checkpoint_t),
                   state=current_state)
 
+    # Collective, so all ranks free the exchange resources here
+    free_exchange_resources(discr)
+
     if current_t - t_final < 0:
         raise ValueError("Simulation exited abnormally")
 
@@ -37,6 +37,7 @@ from grudge.eager import EagerDGDiscretization
 from grudge.shortcuts import make_visualizer
 
 
+from mirgecom.exchange import free_exchange_resources
 from mirgecom.euler import inviscid_operator
 from mirgecom.simutil import (
     inviscid_sim_timestep,
@@ -161,6 +162,9 @@ def main(ctx_factory=cl.create_some_context):
                   dt=(current_t - checkpoint_t),
                   state=current_state)
 
+    # Collective, so all ranks free the exchange resources here
+    free_exchange_resources(discr)
+
     if current_t - t_final < 0:
         raise ValueError("Simulation exited abnormally")
 
@@ -35,8 +35,13 @@ from meshmode.mesh import BTAG_ALL, BTAG_NONE  # noqa
 from grudge.eager import EagerDGDiscretization
 from grudge.shortcuts import make_visualizer
 
-from mirgecom.profiling import PyOpenCLProfilingArrayContext
+from mirgecom.profiling import (
+    PyOpenCLProfilingArrayContext,
+    TrackingMemoryPool,
+    gather_cross_rank_profile
+)
 
+from mirgecom.exchange import free_exchange_resources
 from mirgecom.euler import inviscid_operator
 from mirgecom.simutil import (
     inviscid_sim_timestep,
@@ -57,7 +62,8 @@ from logpyle import IntervalTimer
 from mirgecom.euler import extract_vars_for_logging, units_for_logging
 
 from mirgecom.logging_quantities import (initialize_logmgr,
-    logmgr_add_many_discretization_quantities, logmgr_add_device_name)
+    logmgr_add_many_discretization_quantities, logmgr_add_device_name,
+    logmgr_add_communication_profile, logmgr_add_device_memory_usage)
 
 
 logger = logging.getLogger(__name__)
@@ -76,13 +82,15 @@ def main(ctx_factory=cl.create_some_context, use_profiling=False, use_logmgr=Fal
     if use_profiling:
         queue = cl.CommandQueue(cl_ctx,
             properties=cl.command_queue_properties.PROFILING_ENABLE)
-        actx = PyOpenCLProfilingArrayContext(queue,
-            allocator=cl_tools.MemoryPool(cl_tools.ImmediateAllocator(queue)),
+        allocator = TrackingMemoryPool(
+            cl_tools.MemoryPool(cl_tools.ImmediateAllocator(queue)))
+        actx = PyOpenCLProfilingArrayContext(queue, allocator=allocator,
             logmgr=logmgr)
     else:
         queue = cl.CommandQueue(cl_ctx)
-        actx = PyOpenCLArrayContext(queue,
-            allocator=cl_tools.MemoryPool(cl_tools.ImmediateAllocator(queue)))
+        allocator = TrackingMemoryPool(
+            cl_tools.MemoryPool(cl_tools.ImmediateAllocator(queue)))
+        actx = PyOpenCLArrayContext(queue, allocator=allocator)
 
     dim = 2
     nel_1d = 16
@@ -132,9 +140,12 @@ def main(ctx_factory=cl.create_some_context, use_profiling=False, use_logmgr=Fal
         logmgr_add_device_name(logmgr, queue)
         logmgr_add_many_discretization_quantities(logmgr, discr, dim,
                              extract_vars_for_logging, units_for_logging)
+        logmgr_add_communication_profile(logmgr, discr)
+        logmgr_add_device_memory_usage(logmgr, allocator)
 
         logmgr.add_watches(["step.max", "t_step.max", "t_log.max",
-                            "min_temperature", "L2_norm_momentum1"])
+                            "min_temperature", "L2_norm_momentum1",
+                            "comm_wait_time.max", "device_memory_peak_active.max"])
 
         try:
             logmgr.add_watches(["memory_usage.max"])
@@ -195,6 +206,9 @@ def main(ctx_factory=cl.create_some_context, use_profiling=False, use_logmgr=Fal
                   dt=(current_t - checkpoint_t),
                   state=current_state)
 
+    # Collective, so all ranks free the exchange resources here
+    free_exchange_resources(discr)
+
     if current_t - t_final < 0:
         raise ValueError("Simulation exited abnormally")
 
@@ -203,6 +217,11 @@ def main(ctx_factory=cl.create_some_context, use_profiling=False, use_logmgr=Fal
     elif use_profiling:
         print(actx.tabulate_profiling_data())
 
+        cross_rank_profile = gather_cross_rank_profile(comm, actx, discr=discr)
+        if rank == 0:
+            print(cross_rank_profile.tabulate_ranks())
+            print(cross_rank_profile.tabulate_kernels())
+
 
 if __name__ == "__main__":
     logging.basicConfig(format="%(message)s", level=logging.INFO)
@@ -38,7 +38,9 @@ from grudge.eager import EagerDGDiscretization
 from grudge.shortcuts import make_visualizer
 from mirgecom.mpi import mpi_entry_point
 from mirgecom.integrators import rk4_step
-from mirgecom.wave import wave_operator
+from mirgecom.exchange import free_exchange_resources
+from mirgecom.stability import get_stable_timestep
+from mirgecom.wave import WaveOperator
 import pyopencl.tools as cl_tools
 
 
@@ -102,15 +104,6 @@ def main():
     discr = EagerDGDiscretization(actx, local_mesh, order=order,
                     mpi_communicator=comm)
 
-    if dim == 2:
-        # no deep meaning here, just a fudge factor
-        dt = 0.75/(nel_1d*order**2)
-    elif dim == 3:
-        # no deep meaning here, just a fudge factor
-        dt = 0.45/(nel_1d*order**2)
-    else:
-        raise ValueError("don't have a stable time step guesstimate")
-
     fields = flat_obj_array(
         bump(actx, discr),
         [discr.zeros(actx) for i in range(discr.dim)]
@@ -118,8 +111,12 @@ def main():
 
     vis = make_visualizer(discr, order+3 if dim == 2 else order)
 
+    wave_operator = WaveOperator(discr, c=1)
+
     def rhs(t, w):
-        return wave_operator(discr, c=1, w=w)
+        return wave_operator(w)
+
+    dt = get_stable_timestep(discr, rhs, fields, rk4_step, cache_key=("wave", 1))
 
     rank = comm.Get_rank()
 
@@ -140,6 +137,9 @@ def main():
         t += dt
         istep += 1
 
+    # Collective, so all ranks free the exchange resources here
+    free_exchange_resources(discr)
+
 
 if __name__ == "__main__":
     main()
@@ -6,6 +6,8 @@ Boundary Conditions
 .. autoclass:: PrescribedBoundary
 .. autoclass:: DummyBoundary
 .. autoclass:: AdiabaticSlipBoundary
+.. autoclass:: CharacteristicInflowBoundary
+.. autoclass:: CharacteristicOutflowBoundary
 """
 
 __copyright__ = """
@@ -32,22 +34,53 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+
 import numpy as np
-from meshmode.dof_array import thaw
+from pytools.obj_array import make_obj_array
 from meshmode.mesh import BTAG_ALL, BTAG_NONE  # noqa
 # from mirgecom.eos import IdealSingleGas
 from grudge.symbolic.primitives import TracePair
 from mirgecom.euler import split_conserved, join_conserved
+from mirgecom.geometry import get_geometry
 
 
 class PrescribedBoundary:
-    """Boundary condition prescribes boundary soln with user-specified function.
+    r"""Boundary condition prescribes boundary soln with user-specified function.
+
+    By default, the user function is evaluated on the boundary nodes every time
+    the boundary is evaluated. If the exterior solution is known to depend on
+    time in a simple way, it can instead be cached on the boundary
+    discretization:
+
+    - ``time_dependence="steady"``: the exterior solution does not depend on
+      time. It is computed on the first evaluation and then reused.
+    - ``time_dependence="periodic"``: the exterior solution is periodic in time
+      with period *period*. It is cached for each phase $t \bmod T$ at which it
+      is evaluated, rounded to 10 decimal places of $t/T$, keeping the
+      *max_cached_phases* most recently used phases. This only pays off if
+      the same phases recur, i.e. if the timestep divides the period (then
+      these are the same few stage times in every period). Otherwise no phase
+      is ever reused, and the cache merely holds up to *max_cached_phases*
+      exterior solutions per boundary in addition to evaluating the user
+      function on every call.
+    - *time_factor* $g$: the exterior solution is separable, i.e.
+      $f(\mathbf{x})\,g(t)$. The user function provides the spatial part
+      $f$, which is evaluated once, and *time_factor(t)* returns the (scalar or
+      per-component) factor $g(t)$.
+
+    Cached exterior solutions must not depend on the interior solution. They
+    are kept per discretization and boundary tag, and released along with the
+    discretization.
 
     .. automethod:: __init__
     .. automethod:: boundary_pair
+    .. automethod:: clear_cache
     """
 
-    def __init__(self, userfunc):
+    def __init__(self, userfunc, *, time_dependence=None, period=None,
+                 time_factor=None, max_cached_phases=64):
         """Set the boundary function.
 
         Parameters
@@ -57,16 +90,84 @@ class PrescribedBoundary:
             of the boundary. The given user function (*userfunc*) must take at
             least one parameter that specifies the coordinates at which to prescribe
             the solution.
+        time_dependence: str
+            *None* (the default) to evaluate *userfunc* on every call,
+            ``"steady"``, or ``"periodic"``
+        period: float
+            the period of the exterior solution if *time_dependence* is
+            ``"periodic"``
+        time_factor
+            a function of the time that returns the temporal part of a separable
+            exterior solution
+        max_cached_phases: int
+            the maximum number of phases cached per discretization and boundary
+            for a periodic exterior solution
         """
+        if time_dependence not in (None, "steady", "periodic"):
+            raise ValueError(f"unknown time dependence '{time_dependence}'")
+        if time_dependence == "periodic" and (period is None or period <= 0):
+            raise ValueError("periodic time dependence requires a positive period")
+        if time_dependence is not None and time_factor is not None:
+            raise ValueError("time_factor cannot be combined with time_dependence")
+
         self._userfunc = userfunc
+        self._time_dependence = time_dependence
+        self._period = period
+        self._time_factor = time_factor
+        self._max_cached_phases = max_cached_phases
+
+        # dict of discretization -> dict of btag -> cached exterior solution
+        # (steady or separable), or OrderedDict of phase -> cached exterior
+        # solution (periodic)
+        self._cache = WeakKeyDictionary()
+
+    def clear_cache(self):
+        """Discard the cached exterior solutions."""
+        self._cache.clear()
+
+    def _exterior_soln(self, discr, actx, btag, **kwargs):
+        def evaluate(**kwargs):
+            nodes = get_geometry(discr, actx).nodes(btag)
+            return self._userfunc(nodes, **kwargs)
+
+        cache = self._cache.setdefault(discr, {})
+
+        if self._time_factor is not None:
+            t = kwargs.pop("t", 0.)
+            if btag not in cache:
+                cache[btag] = evaluate(**kwargs)
+            return cache[btag] * self._time_factor(t)
+
+        if self._time_dependence == "steady":
+            if btag not in cache:
+                cache[btag] = evaluate(**kwargs)
+            return cache[btag]
+
+        if self._time_dependence == "periodic":
+            t = kwargs.get("t", 0.)
+            # Round the phase so that times that differ by multiples of the
+            # period map to the same entry despite roundoff
+            phase = round((t % self._period) / self._period, 10) % 1.
+
+            phases = cache.setdefault(btag, OrderedDict())
+            if phase in phases:
+                phases.move_to_end(phase)
+                return phases[phase]
+
+            kwargs["t"] = phase*self._period
+            result = evaluate(**kwargs)
+            phases[phase] = result
+            if len(phases) > self._max_cached_phases:
+                phases.popitem(last=False)
+            return result
+
+        return evaluate(**kwargs)
 
     def boundary_pair(self, discr, q, btag, **kwargs):
         """Get the interior and exterior solution on the boundary."""
         actx = q[0].array_context
 
-        boundary_discr = discr.discr_from_dd(btag)
-        nodes = thaw(actx, boundary_discr.nodes())
-        ext_soln = self._userfunc(nodes, **kwargs)
+        ext_soln = self._exterior_soln(discr, actx, btag, **kwargs)
         int_soln = discr.project("vol", btag, q)
         return TracePair(btag, interior=int_soln, exterior=ext_soln)
 
@@ -118,7 +219,7 @@ class AdiabaticSlipBoundary:
         actx = cv.mass.array_context
 
         # Grab a unit normal to the boundary
-        nhat = thaw(actx, discr.normal(btag))
+        nhat = get_geometry(discr, actx).normal(btag)
 
         # Get the interior/exterior solns
         int_soln = discr.project("vol", btag, q)
@@ -139,3 +240,162 @@ class AdiabaticSlipBoundary:
                                     species_mass=int_cv.species_mass)
 
         return TracePair(btag, interior=int_soln, exterior=bndry_soln)
+
+
+def _characteristic_exterior_state(actx, eos, nhat, int_cv, ref_cv):
+    r"""Return the exterior state from the Riemann invariants normal to the face.
+
+    The outgoing invariant $R^+ = v_n + \frac{2c}{\gamma-1}$ is taken from the
+    interior state *int_cv*, the incoming invariant
+    $R^- = v_n - \frac{2c}{\gamma-1}$ from the reference state *ref_cv*
+    (both from the upwind side at supersonic speeds). Entropy, tangential
+    velocity, and mass fractions are taken from the interior state at outflow
+    and from the reference state at inflow. Assumes a calorically perfect gas.
+    """
+    gamma = eos.gamma()
+
+    def where(criterion, then, else_):
+        if isinstance(then, np.ndarray):
+            return make_obj_array([where(criterion, then_i, else_i)
+                                   for then_i, else_i in zip(then, else_)])
+        return actx.np.where(criterion, then, else_)
+
+    int_vel = int_cv.momentum / int_cv.mass
+    ref_vel = ref_cv.momentum / ref_cv.mass
+    int_vn = np.dot(int_vel, nhat)
+    ref_vn = np.dot(ref_vel, nhat)
+    int_c = eos.sound_speed(int_cv)
+    ref_c = eos.sound_speed(ref_cv)
+
+    # Outgoing invariant from the interior, unless the flow enters
+    # supersonically
+    r_plus = where(ref_vn + ref_c < 0,
+        ref_vn + 2*ref_c/(gamma - 1), int_vn + 2*int_c/(gamma - 1))
+    # Incoming invariant from the reference state, unless the flow leaves
+    # supersonically
+    r_minus = where(int_vn - int_c > 0,
+        int_vn - 2*int_c/(gamma - 1), ref_vn - 2*ref_c/(gamma - 1))
+
+    vn = 0.5*(r_plus + r_minus)
+    c = 0.25*(gamma - 1)*(r_plus - r_minus)
+
+    outflow = vn > 0
+
+    entropy = where(outflow,
+        eos.pressure(int_cv) / int_cv.mass**gamma,
+        eos.pressure(ref_cv) / ref_cv.mass**gamma)
+    tangential_vel = where(outflow,
+        int_vel - nhat*int_vn,
+        ref_vel - nhat*ref_vn)
+    mass_fractions = [
+        where(outflow, int_y / int_cv.mass, ref_y / ref_cv.mass)
+        for int_y, ref_y in zip(int_cv.species_mass, ref_cv.species_mass)]
+
+    mass = (c**2 / (gamma*entropy))**(1/(gamma - 1))
+    pressure = mass*c**2/gamma
+    vel = tangential_vel + nhat*vn
+
+    return join_conserved(dim=len(nhat), mass=mass,
+                          energy=pressure/(gamma - 1) + 0.5*mass*np.dot(vel, vel),
+                          momentum=vel*mass,
+                          species_mass=make_obj_array(
+                              [mass*y for y in mass_fractions]))
+
+
+class CharacteristicInflowBoundary:
+    r"""Far-field (inflow or outflow) boundary based on Riemann invariants.
+
+    The exterior state is composed from the interior state and a reference
+    state prescribed by a user function: the outgoing Riemann invariant normal
+    to the boundary is extrapolated from the interior and the incoming one is
+    taken from the reference state. This is the classical far-field condition
+    based on the one-dimensional Riemann invariants of the Euler equations
+    normal to the face. It is not the Navier-Stokes characteristic boundary
+    condition (NSCBC) of [Poinsot_1992]_, which also involves the normal
+    derivatives of the solution and relaxation terms. Acoustic waves that leave
+    the domain normal to the boundary are not reflected (up to nonlinear
+    effects); waves at oblique incidence are partially reflected. With the
+    Riemann invariants $R^\pm = v_n \pm \frac{2c}{\gamma-1}$ normal to the
+    boundary, the exterior state has
+
+    .. math::
+
+        v_n^+ = \frac{R^+_{int} + R^-_{ref}}{2}, \qquad
+        c^+ = \frac{\gamma-1}{4}(R^+_{int} - R^-_{ref}),
+
+    and entropy, tangential velocity, and mass fractions of the reference state
+    at inflow (of the interior state at outflow). At supersonic speeds, both
+    invariants come from the upwind side. The gas is assumed to be calorically
+    perfect.
+
+    .. automethod:: __init__
+    .. automethod:: boundary_pair
+    """
+
+    def __init__(self, userfunc):
+        """Set the reference state.
+
+        Parameters
+        ----------
+        userfunc
+            User function that prescribes the reference state, called like the
+            user function of :class:`PrescribedBoundary`.
+        """
+        self._userfunc = userfunc
+
+    def boundary_pair(self, discr, q, btag, eos, **kwargs):
+        """Get the interior and exterior solution on the boundary."""
+        dim = discr.dim
+        actx = q[0].array_context
+        geometry = get_geometry(discr, actx)
+
+        int_soln = discr.project("vol", btag, q)
+        ref_soln = self._userfunc(geometry.nodes(btag), eos=eos, **kwargs)
+
+        ext_soln = _characteristic_exterior_state(actx, eos, geometry.normal(btag),
+            split_conserved(dim, int_soln), split_conserved(dim, ref_soln))
+
+        return TracePair(btag, interior=int_soln, exterior=ext_soln)
+
+
+class CharacteristicOutflowBoundary:
+    r"""Subsonic outflow boundary with a prescribed pressure.
+
+    Uses the same Riemann-invariant construction as
+    :class:`CharacteristicInflowBoundary`, with a reference state that has the
+    interior density and velocity and the prescribed pressure. The incoming
+    invariant thus drives the boundary pressure towards the prescribed value,
+    while acoustic waves leaving the domain normal to the boundary pass
+    without reflection (up to nonlinear effects).
+
+    .. automethod:: __init__
+    .. automethod:: boundary_pair
+    """
+
+    def __init__(self, pressure):
+        """Set the pressure.
+
+        Parameters
+        ----------
+        pressure: float or meshmode.dof_array.DOFArray
+            the pressure outside of the boundary (as a DOF array, on the
+            boundary discretization)
+        """
+        self._pressure = pressure
+
+    def boundary_pair(self, discr, q, btag, eos, **kwargs):
+        """Get the interior and exterior solution on the boundary."""
+        dim = discr.dim
+        actx = q[0].array_context
+
+        int_soln = discr.project("vol", btag, q)
+        int_cv = split_conserved(dim, int_soln)
+
+        ref_cv = split_conserved(dim, join_conserved(dim, mass=int_cv.mass,
+            energy=eos.total_energy(int_cv, self._pressure),
+            momentum=int_cv.momentum, species_mass=int_cv.species_mass))
+
+        ext_soln = _characteristic_exterior_state(actx, eos,
+            get_geometry(discr, actx).normal(btag), int_cv, ref_cv)
+
+        return TracePair(btag, interior=int_soln, exterior=ext_soln)
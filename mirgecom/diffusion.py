@@ -1,6 +1,7 @@
 r""":mod:`mirgecom.diffusion` computes the diffusion operator.
 
 .. autofunction:: diffusion_operator
+.. autoclass:: DiffusionOperator
 .. autoclass:: DiffusionBoundary
 .. autoclass:: DirichletDiffusionBoundary
 .. autoclass:: NeumannDiffusionBoundary
@@ -32,13 +33,21 @@ THE SOFTWARE.
 
 import abc
 import math
+from functools import lru_cache
+from inspect import signature
 import numpy as np
 import numpy.linalg as la  # noqa
-from pytools.obj_array import make_obj_array, obj_array_vectorize_n_args
+from pytools.obj_array import make_obj_array
 from meshmode.mesh import BTAG_ALL, BTAG_NONE  # noqa
-from meshmode.dof_array import thaw, DOFArray
+from meshmode.dof_array import DOFArray
 from grudge.symbolic.primitives import DOFDesc
-from grudge.eager import interior_trace_pair, cross_rank_trace_pairs
+from grudge.eager import interior_trace_pair
+from mirgecom.exchange import (
+    cross_rank_trace_pairs,
+    cross_rank_trace_pairs_many,
+)
+from mirgecom.geometry import get_geometry
+from mirgecom.timing import timed_region
 from grudge.symbolic.primitives import TracePair, as_dofdesc
 
 
@@ -56,17 +65,20 @@ def _grad(discr, x):
         return 0.
 
 
-def _q_flux(discr, quad_tag, alpha, u_tpair):
+def _q_flux(discr, quad_tag, alpha, u_tpair, *, alpha_quad=None,
+            sqrt_alpha_quad=None, normal_quad=None):
     actx = u_tpair.int.array_context
 
     dd = u_tpair.dd
     dd_quad = dd.with_qtag(quad_tag)
     dd_allfaces_quad = dd_quad.with_dtag("all_faces")
 
-    normal_quad = thaw(actx, discr.normal(dd_quad))
+    if normal_quad is None:
+        normal_quad = get_geometry(discr, actx).normal(dd_quad)
 
-    alpha_quad = discr.project("vol", dd_quad, alpha)
-    sqrt_alpha_quad = _sqrt(actx, alpha_quad)
+    if sqrt_alpha_quad is None:
+        alpha_quad = discr.project("vol", dd_quad, alpha)
+        sqrt_alpha_quad = _sqrt(actx, alpha_quad)
 
     u_avg_quad = discr.project(dd, dd_quad, u_tpair.avg)
 
@@ -74,17 +86,20 @@ def _q_flux(discr, quad_tag, alpha, u_tpair):
         -sqrt_alpha_quad * u_avg_quad * normal_quad)
 
 
-def _u_flux(discr, quad_tag, alpha, q_tpair):
+def _u_flux(discr, quad_tag, alpha, q_tpair, *, alpha_quad=None,
+            sqrt_alpha_quad=None, normal_quad=None):
     actx = q_tpair.int[0].array_context
 
     dd = q_tpair.dd
     dd_quad = dd.with_qtag(quad_tag)
     dd_allfaces_quad = dd_quad.with_dtag("all_faces")
 
-    normal_quad = thaw(actx, discr.normal(dd_quad))
+    if normal_quad is None:
+        normal_quad = get_geometry(discr, actx).normal(dd_quad)
 
-    alpha_quad = discr.project("vol", dd_quad, alpha)
-    sqrt_alpha_quad = _sqrt(actx, alpha_quad)
+    if sqrt_alpha_quad is None:
+        alpha_quad = discr.project("vol", dd_quad, alpha)
+        sqrt_alpha_quad = _sqrt(actx, alpha_quad)
 
     q_avg_quad = discr.project(dd, dd_quad, q_tpair.avg)
 
@@ -92,12 +107,33 @@ def _u_flux(discr, quad_tag, alpha, q_tpair):
         -sqrt_alpha_quad * np.dot(q_avg_quad, normal_quad))
 
 
+@lru_cache(maxsize=None)
+def _accepts_keywords(cls, method_name, names):
+    """Return whether the method *method_name* of *cls* accepts all *names*."""
+    params = signature(getattr(cls, method_name)).parameters
+    return all(name in params for name in names)
+
+
+_FLUX_COEFFICIENT_NAMES = ("alpha_quad", "sqrt_alpha_quad", "normal_quad")
+_SIPG_COEFFICIENT_NAMES = ("alpha_int", "normal")
+
+
 class DiffusionBoundary(metaclass=abc.ABCMeta):
     """
     Diffusion boundary base class.
 
+    Besides the positional arguments, :meth:`get_q_flux` and :meth:`get_u_flux`
+    may accept the keyword-only arguments *alpha_quad*, *sqrt_alpha_quad*, and
+    *normal_quad*: the diffusivity, its square root, and the normal on the
+    quadrature discretization of *dd*. Likewise, :meth:`get_sipg_exterior_values`
+    may accept *alpha_int* and *normal*, the diffusivity and the normal on *dd*.
+    :class:`DiffusionOperator` precomputes these values and passes them to the
+    methods whose signature names them; methods with the plain signature are
+    called as before and compute what they need themselves.
+
     .. automethod:: get_q_flux
     .. automethod:: get_u_flux
+    .. automethod:: get_sipg_exterior_values
     """
 
     @abc.abstractmethod
@@ -110,6 +146,39 @@ class DiffusionBoundary(metaclass=abc.ABCMeta):
         """Compute the flux for *u* on the boundary corresponding to *dd*."""
         raise NotImplementedError
 
+    def get_sipg_exterior_values(self, discr, alpha, dd, u_int, alpha_grad_u_int):
+        r"""
+        Compute the exterior values used by the interior penalty scheme.
+
+        Implementations may also accept the optional keyword arguments
+        described in :class:`DiffusionBoundary`.
+
+        Parameters
+        ----------
+        discr: grudge.eager.EagerDGDiscretization
+            the discretization to use
+        alpha: Union[numbers.Number, meshmode.dof_array.DOFArray]
+            the diffusivity value(s)
+        dd:
+            the boundary on which the values are computed
+        u_int: meshmode.dof_array.DOFArray
+            the interior trace of $u$ on *dd*
+        alpha_grad_u_int: numpy.ndarray
+            the interior trace of $\alpha\nabla u$ on *dd*
+
+        Returns
+        -------
+        tuple
+            the exterior values of $u$ and $\alpha\nabla u$ on *dd*
+
+        Boundaries that do not override this method cannot be used with the
+        ``"sipg"`` scheme of :class:`DiffusionOperator`, which checks for this
+        on construction. It is not abstract, so that boundaries that only
+        implement the other methods keep working with the ``"ldg"`` scheme.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support the interior penalty scheme")
+
 
 class DirichletDiffusionBoundary(DiffusionBoundary):
     r"""
@@ -140,15 +209,32 @@ class DirichletDiffusionBoundary(DiffusionBoundary):
         self.value = value
 
     # Observe: Dirichlet BC enforced on q, not u
-    def get_q_flux(self, discr, quad_tag, alpha, dd, u):  # noqa: D102
+    def get_q_flux(self, discr, quad_tag, alpha, dd, u, *,
+                   alpha_quad=None, sqrt_alpha_quad=None, normal_quad=None):
+        """Compute the flux for *q* on the boundary corresponding to *dd*."""
         u_int = discr.project("vol", dd, u)
         u_tpair = TracePair(dd, interior=u_int, exterior=2.*self.value-u_int)
-        return _q_flux(discr, quad_tag, alpha, u_tpair)
+        return _q_flux(discr, quad_tag, alpha, u_tpair,
+            sqrt_alpha_quad=sqrt_alpha_quad, normal_quad=normal_quad)
 
-    def get_u_flux(self, discr, quad_tag, alpha, dd, q):  # noqa: D102
+    def get_u_flux(self, discr, quad_tag, alpha, dd, q, *,
+                   alpha_quad=None, sqrt_alpha_quad=None, normal_quad=None):
+        """Compute the flux for *u* on the boundary corresponding to *dd*."""
         q_int = discr.project("vol", dd, q)
         q_tpair = TracePair(dd, interior=q_int, exterior=q_int)
-        return _u_flux(discr, quad_tag, alpha, q_tpair)
+        return _u_flux(discr, quad_tag, alpha, q_tpair,
+            sqrt_alpha_quad=sqrt_alpha_quad, normal_quad=normal_quad)
+
+    def get_sipg_exterior_values(self, discr, alpha, dd, u_int, alpha_grad_u_int,
+                                 *, alpha_int=None, normal=None):
+        r"""
+        Compute the exterior values used by the interior penalty scheme.
+
+        Returns $u^+ = 2 f - u^-$, so that the average of $u$ is $f$, and
+        $(\alpha\nabla u)^+ = (\alpha\nabla u)^-$. See
+        :meth:`DiffusionBoundary.get_sipg_exterior_values` for the parameters.
+        """
+        return 2.*self.value - u_int, alpha_grad_u_int
 
 
 class NeumannDiffusionBoundary(DiffusionBoundary):
@@ -174,6 +260,9 @@ class NeumannDiffusionBoundary(DiffusionBoundary):
 
                                         &= \alpha g
 
+    The interior penalty scheme instead uses exterior data $u^+ = u^-$ and
+    $(\alpha\nabla u)^+ = 2\alpha g\mathbf{\hat{n}} - (\alpha\nabla u)^-$.
+
     .. automethod:: __init__
     """
 
@@ -188,12 +277,17 @@ class NeumannDiffusionBoundary(DiffusionBoundary):
         """
         self.value = value
 
-    def get_q_flux(self, discr, quad_tag, alpha, dd, u):  # noqa: D102
+    def get_q_flux(self, discr, quad_tag, alpha, dd, u, *,
+                   alpha_quad=None, sqrt_alpha_quad=None, normal_quad=None):
+        """Compute the flux for *q* on the boundary corresponding to *dd*."""
         u_int = discr.project("vol", dd, u)
         u_tpair = TracePair(dd, interior=u_int, exterior=u_int)
-        return _q_flux(discr, quad_tag, alpha, u_tpair)
+        return _q_flux(discr, quad_tag, alpha, u_tpair,
+            sqrt_alpha_quad=sqrt_alpha_quad, normal_quad=normal_quad)
 
-    def get_u_flux(self, discr, quad_tag, alpha, dd, q):  # noqa: D102
+    def get_u_flux(self, discr, quad_tag, alpha, dd, q, *,
+                   alpha_quad=None, sqrt_alpha_quad=None, normal_quad=None):
+        """Compute the flux for *u* on the boundary corresponding to *dd*."""
         dd_quad = dd.with_qtag(quad_tag)
         dd_allfaces_quad = dd_quad.with_dtag("all_faces")
         # Compute the flux directly instead of constructing an external q value
@@ -202,13 +296,428 @@ class NeumannDiffusionBoundary(DiffusionBoundary):
         # q_tpair that lives in the quadrature discretization, as it involves
         # computing sqrt(alpha); _u_flux would need to be modified to accept such
         # values).
-        alpha_int_quad = discr.project("vol", dd_quad, alpha)
+        if alpha_quad is None:
+            alpha_quad = discr.project("vol", dd_quad, alpha)
         value_quad = discr.project(dd, dd_quad, self.value)
-        flux_quad = -alpha_int_quad*value_quad
+        flux_quad = -alpha_quad*value_quad
         return discr.project(dd_quad, dd_allfaces_quad, flux_quad)
 
+    def get_sipg_exterior_values(self, discr, alpha, dd, u_int, alpha_grad_u_int,
+                                 *, alpha_int=None, normal=None):
+        r"""
+        Compute the exterior values used by the interior penalty scheme.
+
+        Returns $u^+ = u^-$, so that the jump of $u$ vanishes, and
+        $(\alpha\nabla u)^+ = 2\alpha g\mathbf{\hat{n}} - (\alpha\nabla u)^-$,
+        so that the average normal flux is $\alpha g$. See
+        :meth:`DiffusionBoundary.get_sipg_exterior_values` for the parameters.
+        """
+        if normal is None:
+            normal = get_geometry(discr, u_int.array_context).normal(dd)
+        if alpha_int is None:
+            alpha_int = discr.project("vol", dd, alpha)
+        return u_int, 2.*alpha_int*self.value*normal - alpha_grad_u_int
+
+
+class DiffusionOperator:
+    r"""
+    The diffusion operator for a fixed diffusivity.
+
+    Computes $\nabla\cdot(\alpha\nabla u)$ like :func:`diffusion_operator`,
+    but precomputes all quantities that depend only on the diffusivity: its
+    projection to the quadrature discretization, its square root, and its
+    gradient in the volume, as well as its projection and square root on the
+    interior faces, on the domain boundaries, and on the boundaries with other
+    ranks. The values on a domain boundary are passed to the methods of its
+    :class:`DiffusionBoundary` that accept them. The face normals are taken
+    from :func:`mirgecom.geometry.get_geometry`.
+    Use this instead of :func:`diffusion_operator` to apply the operator
+    repeatedly with a time-independent diffusivity. For an object array of
+    components, the number of communication rounds does not depend on the
+    number of components, but the number of kernels launched for the volume
+    and face terms grows linearly with it.
+
+    Two discretizations are available. The default, ``"ldg"``, first computes
+    the auxiliary variable $\mathbf{q} = \sqrt{\alpha}\nabla u$ with central
+    fluxes and then its divergence, which requires two dependent exchanges of
+    traces with other ranks. The symmetric interior penalty scheme,
+    ``"sipg"``, uses the numerical flux
+
+    .. math::
+
+        \widehat{\alpha\nabla u}\cdot\mathbf{\hat{n}} =
+            \{\alpha\nabla u\}\cdot\mathbf{\hat{n}} - \sigma [u]
+
+    with the penalty parameter $\sigma = \frac{(p+1)(p+d)}{d}\frac{\alpha}{h}$,
+    where $p$ is the polynomial order, $d$ the dimension, and $h$ the smaller
+    of the ratios of volume to surface area of the two adjacent elements. Since
+    the gradient of $u$ is computed locally, the traces of $u$ and
+    $\alpha\nabla u$ are exchanged together in a single round. The penalty
+    parameter is computed on the first application and then reused. The length
+    scale $h$ on the faces is cached per discretization by
+    :meth:`mirgecom.geometry.DiscretizationGeometry.face_element_size`, so that
+    only the first operator on a discretization exchanges it with other ranks.
+
+    .. automethod:: __init__
+    .. automethod:: __call__
+    """
+
+    def __init__(self, discr, quad_tag, alpha, boundaries, scheme="ldg"):
+        """
+        Initialize the operator.
 
-def diffusion_operator(discr, quad_tag, alpha, boundaries, u):
+        Parameters
+        ----------
+        discr: grudge.eager.EagerDGDiscretization
+            the discretization to use
+        quad_tag:
+            quadrature tag indicating which discretization in *discr* to use for
+            overintegration
+        alpha: Union[numbers.Number, meshmode.dof_array.DOFArray]
+            the diffusivity value(s)
+        boundaries:
+            dictionary (or list of dictionaries) mapping boundary tags to
+            :class:`DiffusionBoundary` instances
+        scheme: str
+            the discretization to use, either ``"ldg"`` or ``"sipg"``
+        """
+        if scheme not in ("ldg", "sipg"):
+            raise ValueError(f"Unknown diffusion scheme '{scheme}'.")
+
+        boundaries_list = boundaries if isinstance(boundaries, list) \
+            else [boundaries]
+        for component_boundaries in boundaries_list:
+            for btag, bdry in component_boundaries.items():
+                if not isinstance(bdry, DiffusionBoundary):
+                    raise TypeError(f"Unrecognized boundary type for tag {btag}. "
+                        "Must be an instance of DiffusionBoundary.")
+                if scheme == "sipg" and (
+                        type(bdry).get_sipg_exterior_values
+                        is DiffusionBoundary.get_sipg_exterior_values):
+                    raise TypeError(f"Boundary for tag {btag} does not implement "
+                        "get_sipg_exterior_values, which the 'sipg' scheme "
+                        "requires.")
+
+        self.discr = discr
+        self.quad_tag = quad_tag
+        self.alpha = alpha
+        self.boundaries = boundaries
+        self.scheme = scheme
+
+        # dict of face DOFDesc -> penalty parameter on its quadrature
+        # discretization, computed on the first application of the SIPG scheme
+        self._sipg_penalties = None
+
+        actx = alpha.array_context if isinstance(alpha, DOFArray) else None
+
+        with timed_region("diffusion_coefficients"):
+            dd_quad = DOFDesc("vol", quad_tag)
+            self._alpha_quad = discr.project("vol", dd_quad, alpha)
+            self._sqrt_alpha_quad = _sqrt(actx, self._alpha_quad)
+            self._grad_alpha_quad = discr.project("vol", dd_quad,
+                _grad(discr, alpha))
+
+            # dict of face DOFDesc -> dict of coefficients on its quadrature
+            # discretization
+            self._face_coefficients = {}
+
+            from meshmode.mesh import BTAG_PARTITION
+            from grudge import sym
+            face_dds = (
+                [as_dofdesc("int_faces")]
+                + [as_dofdesc(btag)
+                   for component_boundaries in boundaries_list
+                   for btag in component_boundaries]
+                + [as_dofdesc(sym.DTAG_BOUNDARY(BTAG_PARTITION(remote_rank)))
+                   for remote_rank in discr.connected_ranks()])
+
+            for dd in face_dds:
+                if dd not in self._face_coefficients:
+                    alpha_quad = discr.project("vol", dd.with_qtag(quad_tag), alpha)
+                    self._face_coefficients[dd] = {
+                        "alpha_quad": alpha_quad,
+                        "sqrt_alpha_quad": _sqrt(actx, alpha_quad)}
+
+    def _get_face_coefficients(self, actx, dd):
+        """Return the coefficients on the quadrature discretization of *dd*."""
+        coefs = self._face_coefficients.setdefault(dd, {})
+
+        if "alpha_quad" not in coefs:
+            coefs["alpha_quad"] = self.discr.project(
+                "vol", dd.with_qtag(self.quad_tag), self.alpha)
+            coefs["sqrt_alpha_quad"] = _sqrt(actx, coefs["alpha_quad"])
+
+        return {
+            "alpha_quad": coefs["alpha_quad"],
+            "sqrt_alpha_quad": coefs["sqrt_alpha_quad"],
+            "normal_quad": get_geometry(self.discr, actx).normal(
+                dd.with_qtag(self.quad_tag))}
+
+    def _get_boundary_kwargs(self, actx, bdry, method_name, dd):
+        """Return the precomputed coefficients that *bdry*'s method accepts."""
+        if method_name == "get_sipg_exterior_values":
+            if not _accepts_keywords(type(bdry), method_name,
+                                     _SIPG_COEFFICIENT_NAMES):
+                return {}
+            coefs = self._face_coefficients.setdefault(dd, {})
+            if "alpha" not in coefs:
+                coefs["alpha"] = self.discr.project("vol", dd, self.alpha)
+            return {
+                "alpha_int": coefs["alpha"],
+                "normal": get_geometry(self.discr, actx).normal(dd)}
+
+        if not _accepts_keywords(type(bdry), method_name, _FLUX_COEFFICIENT_NAMES):
+            return {}
+        return self._get_face_coefficients(actx, dd)
+
+    def __call__(self, u):
+        r"""
+        Apply the operator to *u*.
+
+        All components of an object array *u* are processed together: the
+        traces of all components of *u* are exchanged with other ranks in a
+        single message per neighbor, and likewise for the auxiliary variable
+        *q* (or, for the interior penalty scheme, together with those of
+        $\alpha\nabla u$). Only the communication is batched: the volume and
+        face terms are still evaluated component by component, with one set of
+        kernels per component, since each component may have its own boundary
+        conditions.
+
+        Parameters
+        ----------
+        u: Union[meshmode.dof_array.DOFArray, numpy.ndarray]
+            the DOF array (or object array of DOF arrays) to which the operator
+            should be applied
+
+        Returns
+        -------
+        meshmode.dof_array.DOFArray or numpy.ndarray
+            the diffusion operator applied to *u*
+        """
+        if isinstance(u, np.ndarray):
+            if not isinstance(self.boundaries, list):
+                raise TypeError("boundaries must be a list if u is an object array")
+            if len(self.boundaries) != len(u):
+                raise TypeError("boundaries must be the same length as u")
+            return make_obj_array(self._get_apply()(self.boundaries, list(u)))
+
+        result, = self._get_apply()([self.boundaries], [u])
+        return result
+
+    def _get_apply(self):
+        return self._apply_sipg if self.scheme == "sipg" else self._apply
+
+    @timed_region("diffusion_operator")
+    def _apply(self, boundaries, u):
+        """Apply the operator to the list of components *u*.
+
+        *boundaries* is a list with the boundaries of each component.
+        """
+        discr = self.discr
+        quad_tag = self.quad_tag
+        alpha = self.alpha
+        actx = u[0].array_context
+        ncomponents = len(u)
+
+        dd_quad = DOFDesc("vol", quad_tag)
+        dd_allfaces_quad = DOFDesc("all_faces", quad_tag)
+
+        sqrt_alpha_quad = self._sqrt_alpha_quad
+
+        def face_coefs(dd):
+            return self._get_face_coefficients(actx, dd)
+
+        def component_pairs(tpair):
+            return [
+                TracePair(tpair.dd, interior=tpair.int[i], exterior=tpair.ext[i])
+                for i in range(ncomponents)]
+
+        def component_pairs_per_rank(tpairs):
+            return list(zip(*[component_pairs(tpair) for tpair in tpairs])) \
+                if tpairs else [() for _ in range(ncomponents)]
+
+        with timed_region("gradient"):
+            u_vec = make_obj_array(u)
+            u_quad = discr.project("vol", dd_quad, u_vec)
+
+            u_int_tpairs = component_pairs(interior_trace_pair(discr, u_vec))
+            u_rank_tpairs = component_pairs_per_rank(
+                cross_rank_trace_pairs(discr, u_vec))
+
+            q = np.empty((ncomponents, discr.dim), dtype=object)
+            for i in range(ncomponents):
+                q[i] = discr.inverse_mass(
+                    # Decompose phi_i*grad(sqrt(alpha)*phi_j) term via the product
+                    # rule in order to avoid having to define a new operator
+                    discr.mass(dd_quad,
+                        -0.5/sqrt_alpha_quad * self._grad_alpha_quad * u_quad[i])
+                    +  # noqa: W504
+                    discr.weak_grad(dd_quad, -sqrt_alpha_quad * u_quad[i])
+                    -  # noqa: W504
+                    discr.face_mass(
+                        dd_allfaces_quad,
+                        _q_flux(discr, quad_tag, alpha, u_int_tpairs[i],
+                            **face_coefs(u_int_tpairs[i].dd))
+                        + sum(
+                            bdry.get_q_flux(discr, quad_tag, alpha,
+                                as_dofdesc(btag), u[i],
+                                **self._get_boundary_kwargs(actx, bdry,
+                                    "get_q_flux", as_dofdesc(btag)))
+                            for btag, bdry in boundaries[i].items()
+                        )
+                        + sum(
+                            _q_flux(discr, quad_tag, alpha, tpair,
+                                **face_coefs(tpair.dd))
+                            for tpair in u_rank_tpairs[i]
+                        )
+                    ))
+
+        with timed_region("divergence"):
+            q_quad = discr.project("vol", dd_quad, q)
+
+            q_int_tpairs = component_pairs(interior_trace_pair(discr, q))
+            q_rank_tpairs = component_pairs_per_rank(
+                cross_rank_trace_pairs(discr, q))
+
+            return [
+                discr.inverse_mass(
+                    discr.weak_div(dd_quad, -sqrt_alpha_quad*q_quad[i])
+                    -  # noqa: W504
+                    discr.face_mass(
+                        dd_allfaces_quad,
+                        _u_flux(discr, quad_tag, alpha, q_int_tpairs[i],
+                            **face_coefs(q_int_tpairs[i].dd))
+                        + sum(
+                            bdry.get_u_flux(discr, quad_tag, alpha,
+                                as_dofdesc(btag), q[i],
+                                **self._get_boundary_kwargs(actx, bdry,
+                                    "get_u_flux", as_dofdesc(btag)))
+                            for btag, bdry in boundaries[i].items()
+                        )
+                        + sum(
+                            _u_flux(discr, quad_tag, alpha, tpair,
+                                **face_coefs(tpair.dd))
+                            for tpair in q_rank_tpairs[i])
+                        )
+                    )
+                for i in range(ncomponents)]
+
+    def _get_sipg_penalties(self, actx):
+        """Return a dict of face DOFDesc -> penalty parameter on its quadrature."""
+        if self._sipg_penalties is not None:
+            return self._sipg_penalties
+
+        discr = self.discr
+
+        with timed_region("sipg_penalty"):
+            # Elementwise length scale h = |K|/|dK|, taking the smaller one of
+            # the two adjacent elements on each face
+            geometry = get_geometry(discr, actx)
+
+            order = discr.discr_from_dd("vol").groups[0].order
+            coef = (order + 1) * (order + discr.dim) / discr.dim
+
+            self._sipg_penalties = {
+                dd: coef * self._get_face_coefficients(actx, dd)["alpha_quad"]
+                / discr.project(dd, dd.with_qtag(self.quad_tag),
+                                geometry.face_element_size(dd))
+                for dd in self._face_coefficients}
+
+        return self._sipg_penalties
+
+    @timed_region("diffusion_operator")
+    def _apply_sipg(self, boundaries, u):
+        """Apply the interior penalty scheme to the list of components *u*.
+
+        *boundaries* is a list with the boundaries of each component.
+        """
+        discr = self.discr
+        quad_tag = self.quad_tag
+        alpha = self.alpha
+        actx = u[0].array_context
+        ncomponents = len(u)
+
+        dd_quad = DOFDesc("vol", quad_tag)
+        dd_allfaces_quad = DOFDesc("all_faces", quad_tag)
+
+        penalties = self._get_sipg_penalties(actx)
+
+        def face_terms(dd, u_int, u_ext, flux_int, flux_ext):
+            """Return the flux and the jump term of a component on faces *dd*."""
+            dd_face_quad = dd.with_qtag(quad_tag)
+            normal_quad = self._get_face_coefficients(actx, dd)["normal_quad"]
+
+            jump_quad = discr.project(dd, dd_face_quad, u_int - u_ext)
+            flux_avg_quad = discr.project(dd, dd_face_quad,
+                0.5*(flux_int + flux_ext))
+
+            return (
+                discr.project(dd_face_quad, dd_allfaces_quad,
+                    np.dot(flux_avg_quad, normal_quad) - penalties[dd]*jump_quad),
+                discr.project(dd_face_quad, dd_allfaces_quad,
+                    0.5*jump_quad*normal_quad))
+
+        with timed_region("gradient"):
+            u_vec = make_obj_array(u)
+
+            grad_u = np.empty((ncomponents, discr.dim), dtype=object)
+            alpha_grad_u = np.empty((ncomponents, discr.dim), dtype=object)
+            for i in range(ncomponents):
+                grad_u[i] = discr.grad(u[i])
+                alpha_grad_u[i] = alpha*grad_u[i]
+
+        with timed_region("face_terms"):
+            # Traces of u and alpha*grad(u) are exchanged in one round
+            rank_tpairs = cross_rank_trace_pairs_many(discr, [u_vec, alpha_grad_u])
+
+            u_int_tpair = interior_trace_pair(discr, u_vec)
+            flux_int_tpair = interior_trace_pair(discr, alpha_grad_u)
+
+            # list of (dd, u_int, u_ext, flux_int, flux_ext) for each component
+            face_data = [
+                [(u_int_tpair.dd, u_int_tpair.int[i], u_int_tpair.ext[i],
+                  flux_int_tpair.int[i], flux_int_tpair.ext[i])]
+                for i in range(ncomponents)]
+
+            for u_tpair, flux_tpair in zip(*rank_tpairs):
+                for i in range(ncomponents):
+                    face_data[i].append((u_tpair.dd, u_tpair.int[i],
+                        u_tpair.ext[i], flux_tpair.int[i], flux_tpair.ext[i]))
+
+            for i in range(ncomponents):
+                for btag, bdry in boundaries[i].items():
+                    dd = as_dofdesc(btag)
+                    u_bdry = discr.project("vol", dd, u[i])
+                    flux_bdry = discr.project("vol", dd, alpha_grad_u[i])
+                    u_ext, flux_ext = bdry.get_sipg_exterior_values(discr, alpha,
+                        dd, u_bdry, flux_bdry,
+                        **self._get_boundary_kwargs(actx, bdry,
+                            "get_sipg_exterior_values", dd))
+                    face_data[i].append((dd, u_bdry, u_ext, flux_bdry, flux_ext))
+
+        with timed_region("divergence"):
+            result = []
+            for i in range(ncomponents):
+                flux_sum = 0
+                lift_sum = 0
+                for data in face_data[i]:
+                    flux, lift = face_terms(*data)
+                    flux_sum = flux_sum + flux
+                    lift_sum = lift_sum + lift
+
+                lift = discr.inverse_mass(
+                    discr.face_mass(dd_allfaces_quad, lift_sum))
+
+                result.append(
+                    discr.inverse_mass(
+                        -discr.weak_div(dd_quad, self._alpha_quad
+                            * discr.project("vol", dd_quad, grad_u[i] - lift))
+                        + discr.face_mass(dd_allfaces_quad, flux_sum)))
+
+            return result
+
+
+def diffusion_operator(discr, quad_tag, alpha, boundaries, u, scheme="ldg"):
     r"""
     Compute the diffusion operator.
 
@@ -216,7 +725,8 @@ def diffusion_operator(discr, quad_tag, alpha, boundaries, u):
     $\nabla\cdot(\alpha\nabla u)$, where $\alpha$ is the diffusivity and
     $u$ is a scalar field.
 
-    Uses unstabilized central numerical fluxes.
+    By default, uses unstabilized central numerical fluxes. See
+    :class:`DiffusionOperator` for the available schemes.
 
     Parameters
     ----------
@@ -233,75 +743,12 @@ def diffusion_operator(discr, quad_tag, alpha, boundaries, u):
     u: Union[meshmode.dof_array.DOFArray, numpy.ndarray]
         the DOF array (or object array of DOF arrays) to which the operator should be
         applied
+    scheme: str
+        the discretization to use, either ``"ldg"`` or ``"sipg"``
 
     Returns
     -------
     meshmode.dof_array.DOFArray or numpy.ndarray
         the diffusion operator applied to *u*
     """
-    if isinstance(u, np.ndarray):
-        if not isinstance(boundaries, list):
-            raise TypeError("boundaries must be a list if u is an object array")
-        if len(boundaries) != len(u):
-            raise TypeError("boundaries must be the same length as u")
-        return obj_array_vectorize_n_args(lambda boundaries_i, u_i:
-            diffusion_operator(discr, quad_tag, alpha, boundaries_i, u_i),
-            make_obj_array(boundaries), u)
-
-    for btag, bdry in boundaries.items():
-        if not isinstance(bdry, DiffusionBoundary):
-            raise TypeError(f"Unrecognized boundary type for tag {btag}. "
-                "Must be an instance of DiffusionBoundary.")
-
-    actx = u.array_context
-
-    dd_quad = DOFDesc("vol", quad_tag)
-    dd_allfaces_quad = DOFDesc("all_faces", quad_tag)
-
-    alpha_quad = discr.project("vol", dd_quad, alpha)
-    sqrt_alpha_quad = _sqrt(actx, alpha_quad)
-    grad_alpha_quad = discr.project("vol", dd_quad, _grad(discr, alpha))
-
-    u_quad = discr.project("vol", dd_quad, u)
-
-    q = discr.inverse_mass(
-        # Decompose phi_i*grad(sqrt(alpha)*phi_j) term via the product rule in
-        # order to avoid having to define a new operator
-        discr.mass(dd_quad, -0.5/sqrt_alpha_quad * grad_alpha_quad * u_quad)
-        +  # noqa: W504
-        discr.weak_grad(dd_quad, -sqrt_alpha_quad * u_quad)
-        -  # noqa: W504
-        discr.face_mass(
-            dd_allfaces_quad,
-            _q_flux(discr, quad_tag, alpha, interior_trace_pair(discr, u))
-            + sum(
-                bdry.get_q_flux(discr, quad_tag, alpha, as_dofdesc(btag),
-                    u)
-                for btag, bdry in boundaries.items()
-            )
-            + sum(
-                _q_flux(discr, quad_tag, alpha, tpair)
-                for tpair in cross_rank_trace_pairs(discr, u)
-            )
-        ))
-
-    q_quad = discr.project("vol", dd_quad, q)
-
-    return (
-        discr.inverse_mass(
-            discr.weak_div(dd_quad, -sqrt_alpha_quad*q_quad)
-            -  # noqa: W504
-            discr.face_mass(
-                dd_allfaces_quad,
-                _u_flux(discr, quad_tag, alpha, interior_trace_pair(discr, q))
-                + sum(
-                    bdry.get_u_flux(discr, quad_tag, alpha, as_dofdesc(btag),
-                        q)
-                    for btag, bdry in boundaries.items()
-                )
-                + sum(
-                    _u_flux(discr, quad_tag, alpha, tpair)
-                    for tpair in cross_rank_trace_pairs(discr, q))
-                )
-            )
-        )
+    return DiffusionOperator(discr, quad_tag, alpha, boundaries, scheme=scheme)(u)
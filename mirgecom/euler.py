@@ -63,12 +63,12 @@ THE SOFTWARE.
 from dataclasses import dataclass
 
 import numpy as np
-from meshmode.dof_array import thaw, DOFArray
+from meshmode.dof_array import DOFArray
 from meshmode.mesh import BTAG_ALL, BTAG_NONE  # noqa
-from grudge.eager import (
-    interior_trace_pair,
-    cross_rank_trace_pairs
-)
+from grudge.eager import interior_trace_pair
+from mirgecom.exchange import cross_rank_trace_pairs
+from mirgecom.geometry import get_geometry
+from mirgecom.timing import timed_region
 
 
 @dataclass(frozen=True)
@@ -266,7 +266,7 @@ def _facial_flux(discr, eos, q_tpair, local=False):
         _get_wavespeed(dim, eos=eos, cv=split_conserved(dim, q_tpair.ext))
     )
 
-    normal = thaw(actx, discr.normal(q_tpair.dd))
+    normal = get_geometry(discr, actx).normal(q_tpair.dd)
     flux_weak = (
         flux_avg @ normal
         - 0.5 * lam * (q_tpair.ext - q_tpair.int))
@@ -276,6 +276,29 @@ def _facial_flux(discr, eos, q_tpair, local=False):
     return flux_weak
 
 
+def _domain_boundary_flux(discr, eos, q_tpairs):
+    """Return the sum of the fluxes across the domain boundaries of *q_tpairs*.
+
+    The flux on each boundary is embedded into the faces of all domain
+    boundaries and summed there, so that only the sum is projected to
+    "all_faces", instead of projecting and summing an "all_faces" array per
+    boundary.
+    """
+    if len(q_tpairs) < 2:
+        return sum(_facial_flux(discr, eos=eos, q_tpair=tpair)
+                   for tpair in q_tpairs)
+
+    geometry = get_geometry(discr, q_tpairs[0].int[0].array_context)
+
+    flux = sum(
+        geometry.boundary_embedding(tpair.dd)(
+            _facial_flux(discr, eos=eos, q_tpair=tpair, local=True))
+        for tpair in q_tpairs)
+
+    return discr.project(BTAG_ALL, "all_faces", flux)
+
+
+@timed_region("inviscid_operator")
 def inviscid_operator(discr, eos, boundaries, q, t=0.0):
     r"""Compute RHS of the Euler flow equations.
 
@@ -314,36 +337,37 @@ def inviscid_operator(discr, eos, boundaries, q, t=0.0):
         Agglomerated object array of DOF arrays representing the RHS of the Euler
         flow equations.
     """
-    vol_flux = inviscid_flux(discr, eos, q)
-    dflux = discr.weak_div(vol_flux)
+    with timed_region("volume_flux"):
+        vol_flux = inviscid_flux(discr, eos, q)
+        dflux = discr.weak_div(vol_flux)
 
-    interior_face_flux = _facial_flux(
-        discr, eos=eos, q_tpair=interior_trace_pair(discr, q))
+    with timed_region("interior_face_flux"):
+        interior_face_flux = _facial_flux(
+            discr, eos=eos, q_tpair=interior_trace_pair(discr, q))
 
     # Domain boundaries
-    domain_boundary_flux = sum(
-        _facial_flux(
-            discr,
-            q_tpair=boundaries[btag].boundary_pair(discr,
-                                                   eos=eos,
-                                                   btag=btag,
-                                                   t=t,
-                                                   q=q),
-            eos=eos
-        )
-        for btag in boundaries
-    )
+    with timed_region("boundary_flux"):
+        domain_boundary_flux = _domain_boundary_flux(discr, eos, [
+            boundaries[btag].boundary_pair(discr,
+                                           eos=eos,
+                                           btag=btag,
+                                           t=t,
+                                           q=q)
+            for btag in boundaries
+        ])
 
     # Flux across partition boundaries
-    partition_boundary_flux = sum(
-        _facial_flux(discr, eos=eos, q_tpair=part_pair)
-        for part_pair in cross_rank_trace_pairs(discr, q)
-    )
+    with timed_region("partition_boundary_flux"):
+        partition_boundary_flux = sum(
+            _facial_flux(discr, eos=eos, q_tpair=part_pair)
+            for part_pair in cross_rank_trace_pairs(discr, q)
+        )
 
-    return discr.inverse_mass(
-        dflux - discr.face_mass(interior_face_flux + domain_boundary_flux
-                                + partition_boundary_flux)
-    )
+    with timed_region("lift"):
+        return discr.inverse_mass(
+            dflux - discr.face_mass(interior_face_flux + domain_boundary_flux
+                                    + partition_boundary_flux)
+        )
 
 
 def get_inviscid_cfl(discr, eos, dt, q):
@@ -0,0 +1,727 @@
+""":mod:`mirgecom.exchange` exchanges partition-boundary traces between ranks.
+
+Ranks that share a node exchange their traces through an MPI shared-memory
+window: the sending rank copies its trace into its segment of the window and the
+receiving rank copies it out, so that only zero-byte synchronization messages go
+through MPI. Traces for ranks on other nodes are exchanged via point-to-point
+messages.
+
+The traces of all components of an object array (or of several fields) are
+packed into one contiguous buffer per neighbor rank, which is sent in a single
+message, and the received buffer is unpacked into views. All exchanged fields
+must have the same dtype.
+
+The shared-memory window is allocated once per discretization, collectively
+over the ranks of each node, when the first exchange on the discretization
+takes place (or when :func:`configure_exchange` is called). Its size is fixed
+by a maximum number of components per exchange; exchanges with more components
+than that go through point-to-point messages instead. Freeing the window is
+also collective over the node, so it is not tied to garbage collection, which
+happens at different times on different ranks. Instead, all ranks call
+:func:`free_exchange_resources` at the same point, or use the return value of
+:func:`configure_exchange` as a context manager::
+
+    with configure_exchange(discr):
+        ...  # time stepping
+
+Resources that are not freed explicitly are released by ``MPI_Finalize``.
+
+.. autofunction:: cross_rank_trace_pairs
+.. autofunction:: cross_rank_trace_pairs_many
+.. autofunction:: configure_exchange
+.. autofunction:: free_exchange_resources
+
+Communication statistics
+^^^^^^^^^^^^^^^^^^^^^^^^
+
+Every exchange records the number of messages and bytes sent to and received
+from each neighbor rank, as well as the time spent waiting for the exchange to
+complete. See :class:`mirgecom.logging_quantities.CommunicationProfile` for
+logging these statistics.
+
+.. autoclass:: NeighborExchangeStatistics
+.. autoclass:: ExchangeStatistics
+.. autofunction:: get_exchange_statistics
+.. autofunction:: write_communication_matrix
+"""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+from dataclasses import dataclass
+from numbers import Number
+from time import perf_counter
+from weakref import WeakKeyDictionary
+
+import numpy as np
+from meshmode.dof_array import DOFArray, flatten, unflatten
+from meshmode.mesh import BTAG_PARTITION
+from grudge import sym
+from grudge.symbolic.primitives import TracePair
+from mirgecom.timing import timed_region
+
+logger = logging.getLogger(__name__)
+
+# Distinct from the tags used by grudge's exchange. Each tag offset passed to
+# an exchange reserves _TAGS_PER_OFFSET consecutive tags above _BASE_TAG, for the
+# data, the shared-memory notification, and the acknowledgment messages.
+_SETUP_TAG = 1372
+_BASE_TAG = 1373
+_DATA_TAG = 0
+_NOTIFY_TAG = 1
+_ACK_TAG = 2
+_TAGS_PER_OFFSET = 3
+
+# Default capacity of the shared-memory window, in components (of at most
+# _MAX_ITEMSIZE bytes each) per boundary DOF
+DEFAULT_MAX_COMPONENTS = 32
+_MAX_ITEMSIZE = 16
+
+
+def _get_base_tag(tag):
+    """Return the first of the MPI tags reserved for the tag offset *tag*."""
+    tag = tag or 0
+    if tag < 0:
+        raise ValueError("tag offsets must be non-negative")
+    return _BASE_TAG + _TAGS_PER_OFFSET*tag
+
+
+# {{{ communication statistics
+
+@dataclass
+class NeighborExchangeStatistics:
+    """Communication with a single neighbor rank.
+
+    .. attribute:: messages_sent
+    .. attribute:: messages_received
+    .. attribute:: bytes_sent
+    .. attribute:: bytes_received
+    .. attribute:: wait_time
+
+        Time (in seconds) spent waiting for messages from and to this neighbor
+        to complete.
+
+    Traces exchanged through shared memory are counted as one message each,
+    even though no data go through MPI.
+    """
+
+    messages_sent: int = 0
+    messages_received: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    wait_time: float = 0.0
+
+
+class ExchangeStatistics:
+    """Communication statistics of the partition exchanges of a discretization.
+
+    .. attribute:: num_exchanges
+    .. attribute:: neighbors
+
+        A :class:`dict` mapping remote ranks to
+        :class:`NeighborExchangeStatistics`.
+
+    .. automethod:: reset
+    .. automethod:: totals
+    """
+
+    def __init__(self):
+        self.num_exchanges = 0
+        self.neighbors = {}
+
+    def __getitem__(self, remote_rank):
+        """Return the statistics for *remote_rank*, creating them if needed."""
+        try:
+            return self.neighbors[remote_rank]
+        except KeyError:
+            result = NeighborExchangeStatistics()
+            self.neighbors[remote_rank] = result
+            return result
+
+    def reset(self):
+        """Reset all statistics to zero."""
+        self.num_exchanges = 0
+        self.neighbors = {}
+
+    def totals(self) -> NeighborExchangeStatistics:
+        """Return the statistics summed over all neighbors."""
+        result = NeighborExchangeStatistics()
+        for stats in self.neighbors.values():
+            result.messages_sent += stats.messages_sent
+            result.messages_received += stats.messages_received
+            result.bytes_sent += stats.bytes_sent
+            result.bytes_received += stats.bytes_received
+            result.wait_time += stats.wait_time
+        return result
+
+
+_statistics = WeakKeyDictionary()
+
+
+def get_exchange_statistics(discr) -> ExchangeStatistics:
+    """Return the :class:`ExchangeStatistics` of the exchanges of *discr*.
+
+    The statistics accumulate over all exchanges until they are reset with
+    :meth:`ExchangeStatistics.reset`.
+    """
+    try:
+        return _statistics[discr]
+    except KeyError:
+        result = ExchangeStatistics()
+        _statistics[discr] = result
+        return result
+
+
+def write_communication_matrix(discr, filename: str) -> None:
+    """Write the communication matrix of all ranks of *discr* to *filename*.
+
+    Collective over the ranks of *discr*. The statistics of all ranks are
+    gathered on rank 0, which writes a CSV file with one row per pair of
+    communicating ranks, with the columns ``sender``, ``receiver``,
+    ``messages``, ``bytes``, and ``receiver_wait_time``. If *filename* ends
+    with ``.json``, dense matrices (indexed by sender and receiver) of the
+    message counts, byte counts, and wait times are written as JSON instead.
+    """
+    stats = get_exchange_statistics(discr)
+    # (receiver, sender) -> (messages, bytes, wait time) on the receiving rank
+    local_rows = [
+        (remote_rank, neighbor.messages_received, neighbor.bytes_received,
+         neighbor.wait_time)
+        for remote_rank, neighbor in sorted(stats.neighbors.items())]
+
+    comm = discr.mpi_communicator
+    if comm is None:
+        all_rows = [local_rows]
+        rank = 0
+    else:
+        all_rows = comm.gather(local_rows, root=0)
+        rank = comm.Get_rank()
+
+    if rank != 0:
+        return
+
+    nranks = len(all_rows)
+    entries = [(sender, receiver, messages, nbytes, wait_time)
+               for receiver, rows in enumerate(all_rows)
+               for sender, messages, nbytes, wait_time in rows]
+
+    if filename.endswith(".json"):
+        import json
+        matrices = {key: [[0]*nranks for _ in range(nranks)]
+                    for key in ["messages", "bytes", "receiver_wait_time"]}
+        for sender, receiver, messages, nbytes, wait_time in entries:
+            matrices["messages"][sender][receiver] = messages
+            matrices["bytes"][sender][receiver] = nbytes
+            matrices["receiver_wait_time"][sender][receiver] = wait_time
+
+        with open(filename, "w") as outf:
+            json.dump({"nranks": nranks, **matrices}, outf)
+    else:
+        import csv
+        with open(filename, "w", newline="") as outf:
+            writer = csv.writer(outf)
+            writer.writerow(["sender", "receiver", "messages", "bytes",
+                             "receiver_wait_time"])
+            writer.writerows(sorted(entries))
+
+# }}}
+
+
+class _NeighborExchanger:
+    """Exchanges flat host buffers with the ranks connected to a discretization.
+
+    Each exchange is split into :meth:`start` and :meth:`finish`, and only one
+    exchange can be in flight at a time. Creating the exchanger is collective
+    over the communicator of the discretization, since it allocates the
+    shared-memory window of each node. The exchanges themselves only involve
+    the connected ranks. :meth:`free` is collective again.
+    """
+
+    def __init__(self, discr, max_components=DEFAULT_MAX_COMPONENTS,
+                 use_shared_memory=True):
+        from mpi4py import MPI
+
+        self.comm = discr.mpi_communicator
+        self.remote_ranks = sorted(discr.connected_ranks())
+        self.statistics = get_exchange_statistics(discr)
+
+        # Both sides of a partition boundary have the same number of DOFs
+        self.remote_ndofs = {
+            remote_rank: discr.discr_from_dd(
+                sym.DTAG_BOUNDARY(BTAG_PARTITION(remote_rank))).ndofs
+            for remote_rank in self.remote_ranks}
+
+        self.node_comm = None
+        self.intra_node_ranks = []
+
+        if use_shared_memory and MPI.VERSION >= 3:
+            self.node_comm = self.comm.Split_type(MPI.COMM_TYPE_SHARED)
+            node_size = self.node_comm.Get_size()
+
+            if node_size > 1:
+                node_group = self.node_comm.Get_group()
+                group = self.comm.Get_group()
+                node_to_comm_rank = MPI.Group.Translate_ranks(
+                    node_group, list(range(node_size)), group)
+                node_group.Free()
+                group.Free()
+
+                self._comm_to_node_rank = {
+                    comm_rank: node_rank
+                    for node_rank, comm_rank in enumerate(node_to_comm_rank)}
+                self.intra_node_ranks = [
+                    remote_rank for remote_rank in self.remote_ranks
+                    if remote_rank in self._comm_to_node_rank]
+            else:
+                self.node_comm.Free()
+                self.node_comm = None
+
+        self.inter_node_ranks = [
+            remote_rank for remote_rank in self.remote_ranks
+            if remote_rank not in self.intra_node_ranks]
+
+        self._win = None
+        # Capacity of the window segments, in bytes per boundary DOF
+        self._row_bytes = max_components*_MAX_ITEMSIZE
+        self._empty = np.empty(0, dtype=np.uint8)
+        self._pending = None
+        self._ack_reqs = []
+
+        if self.node_comm is not None:
+            # Offsets (in boundary DOFs) of the slots for each neighbor in our
+            # segment of the window, and of our slots in the neighbors' segments
+            segment_ndofs = 0
+            self._local_offsets = {}
+            for remote_rank in self.intra_node_ranks:
+                self._local_offsets[remote_rank] = segment_ndofs
+                segment_ndofs += self.remote_ndofs[remote_rank]
+
+            send_reqs = [
+                self.comm.isend(self._local_offsets[remote_rank], remote_rank,
+                                tag=_SETUP_TAG)
+                for remote_rank in self.intra_node_ranks]
+            self._remote_offsets = {
+                remote_rank: self.comm.recv(source=remote_rank, tag=_SETUP_TAG)
+                for remote_rank in self.intra_node_ranks}
+            MPI.Request.waitall(send_reqs)
+
+            # Collective over the node, including ranks without neighbors on it
+            self._win = MPI.Win.Allocate_shared(
+                max(self._row_bytes*segment_ndofs, 1), 1, comm=self.node_comm)
+
+            self._segments = {}
+            for remote_rank in self.intra_node_ranks:
+                buf, _ = self._win.Shared_query(
+                    self._comm_to_node_rank[remote_rank])
+                self._segments[remote_rank] = np.frombuffer(buf, dtype=np.uint8)
+
+            buf, _ = self._win.Shared_query(self.node_comm.Get_rank())
+            self._local_segment = np.frombuffer(buf, dtype=np.uint8)
+
+    def free(self):
+        """Free the shared-memory window and the node communicator.
+
+        Collective over the communicator of the discretization. Waits for the
+        neighbors to acknowledge the last exchange first, so that no rank frees
+        the window while another one still reads from it.
+        """
+        if self._pending is not None:
+            raise RuntimeError("cannot free the exchange while an exchange "
+                               "is in progress")
+
+        self._wait_for_acks()
+
+        if self._win is not None:
+            self._segments = {}
+            self._local_segment = None
+            self._win.Free()
+            self._win = None
+        if self.node_comm is not None:
+            self.node_comm.Free()
+            self.node_comm = None
+
+        self.intra_node_ranks = []
+        self.inter_node_ranks = self.remote_ranks
+
+    def _wait_for_acks(self):
+        self._wait(self._ack_reqs)
+        self._ack_reqs = []
+
+    def _wait(self, reqs):
+        """Wait for all *reqs*, a list of tuples *(remote_rank, request)*.
+
+        The time between two completions is attributed to the neighbor whose
+        request completed last.
+        """
+        from mpi4py import MPI
+
+        remote_ranks = [remote_rank for remote_rank, _ in reqs]
+        reqs = [req for _, req in reqs]
+
+        last = perf_counter()
+        for _ in range(len(reqs)):
+            index = MPI.Request.Waitany(reqs)
+            now = perf_counter()
+            self.statistics[remote_ranks[index]].wait_time += now - last
+            last = now
+
+    def start(self, local_data, ncomponents, dtype, tag=None):
+        """Start sending *local_data* to the connected ranks.
+
+        *local_data* is a :class:`dict` mapping remote ranks to flat
+        :class:`numpy.ndarray` buffers holding *ncomponents* values of type
+        *dtype* per boundary DOF. If these do not fit into the shared-memory
+        window, all data are sent through point-to-point messages.
+        """
+        assert self._pending is None
+
+        from mpi4py import MPI
+
+        dtype = np.dtype(dtype)
+        base_tag = _get_base_tag(tag)
+
+        row_bytes = ncomponents * dtype.itemsize
+
+        if self.intra_node_ranks and row_bytes > self._row_bytes:
+            logger.warning("exchanging %d components of %d bytes exceeds the "
+                           "shared-memory window capacity of %d bytes per DOF, "
+                           "falling back to point-to-point messages",
+                           ncomponents, dtype.itemsize, self._row_bytes)
+            shm_ranks = []
+            p2p_ranks = self.remote_ranks
+        else:
+            shm_ranks = self.intra_node_ranks
+            p2p_ranks = self.inter_node_ranks
+
+        send_reqs = []
+        recv_reqs = []
+        remote_data = {}
+
+        self.statistics.num_exchanges += 1
+        for remote_rank in self.remote_ranks:
+            stats = self.statistics[remote_rank]
+            stats.messages_sent += 1
+            stats.messages_received += 1
+            stats.bytes_sent += local_data[remote_rank].nbytes
+            stats.bytes_received += \
+                row_bytes*self.remote_ndofs[remote_rank]
+
+        for remote_rank in p2p_ranks:
+            remote_data[remote_rank] = np.empty(
+                ncomponents*self.remote_ndofs[remote_rank], dtype=dtype)
+            recv_reqs.append((remote_rank, self.comm.Irecv(
+                remote_data[remote_rank], remote_rank, base_tag + _DATA_TAG)))
+            send_reqs.append((remote_rank, self.comm.Isend(
+                local_data[remote_rank], remote_rank, base_tag + _DATA_TAG)))
+
+        if shm_ranks:
+            # Wait until the neighbors have read the previous exchange's data
+            # before overwriting it
+            self._wait_for_acks()
+            self._win.Lock_all(MPI.MODE_NOCHECK)
+
+            for remote_rank in shm_ranks:
+                start = self._local_offsets[remote_rank]*self._row_bytes
+                data = local_data[remote_rank].view(np.uint8)
+                self._local_segment[start:start+data.size] = data
+
+            self._win.Sync()
+
+            for remote_rank in shm_ranks:
+                send_reqs.append((remote_rank, self.comm.Isend(
+                    self._empty, remote_rank, base_tag + _NOTIFY_TAG)))
+                recv_reqs.append((remote_rank, self.comm.Irecv(
+                    self._empty, remote_rank, base_tag + _NOTIFY_TAG)))
+                self._ack_reqs.append((remote_rank, self.comm.Irecv(
+                    self._empty, remote_rank, base_tag + _ACK_TAG)))
+
+        self._pending = (send_reqs, recv_reqs, remote_data, shm_ranks,
+                         ncomponents, dtype, base_tag)
+
+    def finish(self):
+        """Wait for the exchange started by :meth:`start` to complete.
+
+        Returns a :class:`dict` mapping remote ranks to flat
+        :class:`numpy.ndarray` buffers of the received data.
+        """
+        (send_reqs, recv_reqs, remote_data, shm_ranks, ncomponents, dtype,
+            base_tag) = self._pending
+        self._pending = None
+
+        self._wait(recv_reqs)
+
+        if shm_ranks:
+            self._win.Sync()
+
+            for remote_rank in shm_ranks:
+                start = self._remote_offsets[remote_rank]*self._row_bytes
+                nbytes = ncomponents*dtype.itemsize*self.remote_ndofs[remote_rank]
+                remote_data[remote_rank] = (
+                    self._segments[remote_rank][start:start+nbytes]
+                    .view(dtype).copy())
+
+            self._win.Unlock_all()
+
+            for remote_rank in shm_ranks:
+                self._ack_reqs.append((remote_rank, self.comm.Isend(
+                    self._empty, remote_rank, base_tag + _ACK_TAG)))
+
+        self._wait(send_reqs)
+
+        return remote_data
+
+
+_exchangers = WeakKeyDictionary()
+
+
+def configure_exchange(discr, *, max_components=DEFAULT_MAX_COMPONENTS,
+                       use_shared_memory=True):
+    """Set up the partition boundary exchange of *discr*.
+
+    Collective over the communicator of *discr*. Calling this is optional: the
+    first exchange on *discr* sets up the exchange with the default parameters.
+    It must be called before that exchange, otherwise a :exc:`RuntimeError` is
+    raised.
+
+    Parameters
+    ----------
+    discr: grudge.eager.EagerDGDiscretization
+        the discretization whose traces are exchanged
+    max_components: int
+        the number of components (of up to 16 bytes each) per boundary DOF
+        for which the shared-memory window is allocated. Exchanges with more
+        components use point-to-point messages.
+    use_shared_memory: bool
+        whether to exchange traces with ranks on the same node through shared
+        memory
+
+    Returns
+    -------
+    contextlib.AbstractContextManager
+        a context manager that calls :func:`free_exchange_resources` on exit
+    """
+    if discr in _exchangers:
+        raise RuntimeError("exchange of this discretization is already set up")
+
+    _exchangers[discr] = _NeighborExchanger(discr, max_components=max_components,
+        use_shared_memory=use_shared_memory)
+
+    return _ExchangeResources(discr)
+
+
+class _ExchangeResources:
+    """Frees the exchange resources of a discretization on exit."""
+
+    def __init__(self, discr):
+        self.discr = discr
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        free_exchange_resources(self.discr)
+
+
+def free_exchange_resources(discr):
+    """Free the shared-memory window and communicators of the exchange of *discr*.
+
+    Collective over the communicator of *discr*: all ranks must call this at
+    the same point, after their last exchange on *discr*. Does nothing if no
+    exchange on *discr* took place. A later exchange sets up the exchange
+    again.
+    """
+    exchanger = _exchangers.pop(discr, None)
+    if exchanger is not None:
+        exchanger.free()
+
+
+def _get_exchanger(discr):
+    try:
+        return _exchangers[discr]
+    except KeyError:
+        exchanger = _NeighborExchanger(discr)
+        _exchangers[discr] = exchanger
+        return exchanger
+
+
+def _is_obj_array(vec):
+    return (isinstance(vec, np.ndarray)
+            and vec.dtype.char == "O"
+            and not isinstance(vec, DOFArray))
+
+
+@timed_region("partition_exchange")
+def _exchange_fields(discr, fields, tag=None):
+    """Exchange the traces of all *fields* in a single message per connected rank.
+
+    *fields* is a list of :class:`~meshmode.dof_array.DOFArray` or numbers.
+    Numbers are not exchanged, their traces are the numbers themselves.
+
+    Returns a :class:`dict` mapping each connected rank to a tuple of lists
+    *(interior, exterior)* of traces, one per field.
+    """
+    remote_ranks = discr.connected_ranks()
+
+    dof_array_indices = [i for i, field in enumerate(fields)
+                         if not isinstance(field, Number)]
+
+    if not dof_array_indices or discr.mpi_communicator is None:
+        return {remote_rank: (list(fields), list(fields))
+                for remote_rank in remote_ranks}
+
+    first_field = fields[dof_array_indices[0]]
+    actx = first_field.array_context
+
+    dtypes = {ary.dtype for i in dof_array_indices for ary in fields[i]}
+    if len(dtypes) > 1:
+        raise ValueError("all exchanged fields must have the same dtype, "
+                         f"got {sorted(str(dtype) for dtype in dtypes)}")
+    dtype, = dtypes or {np.dtype(np.float64)}
+    ncomponents = len(dof_array_indices)
+
+    exchanger = _get_exchanger(discr)
+
+    local_traces = {}
+    local_data = {}
+    for remote_rank in exchanger.remote_ranks:
+        remote_btag = BTAG_PARTITION(remote_rank)
+        traces = [discr.project("vol", remote_btag, field) for field in fields]
+
+        ndofs = exchanger.remote_ndofs[remote_rank]
+        buf = np.empty(ncomponents*ndofs, dtype=dtype)
+        for icomp, ifield in enumerate(dof_array_indices):
+            buf[icomp*ndofs:(icomp+1)*ndofs] = \
+                actx.to_numpy(flatten(traces[ifield]))
+
+        local_traces[remote_rank] = traces
+        local_data[remote_rank] = buf
+
+    exchanger.start(local_data, ncomponents=ncomponents, dtype=dtype, tag=tag)
+    with timed_region("exchange_wait"):
+        remote_data = exchanger.finish()
+
+    result = {}
+    for remote_rank in exchanger.remote_ranks:
+        remote_btag = BTAG_PARTITION(remote_rank)
+        bdry_discr = discr.discr_from_dd(remote_btag)
+        bdry_conn = discr.get_distributed_boundary_swap_connection(
+            sym.as_dofdesc(sym.DTAG_BOUNDARY(remote_btag)))
+
+        ndofs = exchanger.remote_ndofs[remote_rank]
+        remote_buf = actx.from_numpy(remote_data[remote_rank])
+
+        exterior = list(fields)
+        for icomp, ifield in enumerate(dof_array_indices):
+            exterior[ifield] = bdry_conn(unflatten(actx, bdry_discr,
+                remote_buf[icomp*ndofs:(icomp+1)*ndofs]))
+
+        result[remote_rank] = (local_traces[remote_rank], exterior)
+
+    return result
+
+
+def _flatten_fields(vec):
+    if _is_obj_array(vec):
+        return list(vec.ravel())
+    return [vec]
+
+
+def _unflatten_traces(vec, traces):
+    if _is_obj_array(vec):
+        result = np.empty(vec.shape, dtype=object)
+        for i, trace in enumerate(traces):
+            result.flat[i] = trace
+        return result
+    trace, = traces
+    return trace
+
+
+def cross_rank_trace_pairs(discr, vec, tag=None):
+    """Get the trace pairs on the boundaries with other ranks.
+
+    This is a drop-in replacement for :func:`grudge.eager.cross_rank_trace_pairs`.
+    All components of an object array are packed into a single message per
+    connected rank.
+
+    Parameters
+    ----------
+    discr: grudge.eager.EagerDGDiscretization
+        the discretization to use
+    vec: Union[numbers.Number, meshmode.dof_array.DOFArray, numpy.ndarray]
+        the field (or object array of fields, of any shape) whose traces are
+        exchanged
+    tag: int
+        a non-negative offset for the MPI tags of the exchange, to distinguish
+        concurrent exchanges
+
+    Returns
+    -------
+    list
+        a :class:`grudge.symbolic.primitives.TracePair` per connected rank
+    """
+    tpairs, = cross_rank_trace_pairs_many(discr, [vec], tag=tag)
+    return tpairs
+
+
+def cross_rank_trace_pairs_many(discr, vecs, tag=None):
+    """Get the trace pairs of several fields on the boundaries with other ranks.
+
+    The traces of all fields in *vecs* are packed into a single message per
+    connected rank.
+
+    Parameters
+    ----------
+    discr: grudge.eager.EagerDGDiscretization
+        the discretization to use
+    vecs
+        a sequence of fields, each of which is a number, a
+        :class:`~meshmode.dof_array.DOFArray`, or an object array of these
+    tag: int
+        a non-negative offset for the MPI tags of the exchange, to distinguish
+        concurrent exchanges
+
+    Returns
+    -------
+    list
+        for each field in *vecs*, a list with a
+        :class:`grudge.symbolic.primitives.TracePair` per connected rank
+    """
+    flat_fields = [_flatten_fields(vec) for vec in vecs]
+    field_offsets = np.cumsum([0] + [len(fields) for fields in flat_fields])
+
+    rank_to_traces = _exchange_fields(
+        discr, [field for fields in flat_fields for field in fields], tag=tag)
+
+    result = []
+    for ivec, vec in enumerate(vecs):
+        start, stop = field_offsets[ivec], field_offsets[ivec+1]
+        result.append([
+            TracePair(
+                dd=sym.as_dofdesc(sym.DTAG_BOUNDARY(BTAG_PARTITION(remote_rank))),
+                interior=_unflatten_traces(vec, interior[start:stop]),
+                exterior=_unflatten_traces(vec, exterior[start:stop]))
+            for remote_rank, (interior, exterior) in rank_to_traces.items()])
+
+    return result
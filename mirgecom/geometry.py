@@ -0,0 +1,289 @@
+r""":mod:`mirgecom.geometry` caches geometric quantities of a discretization.
+
+Operators need the nodes and face normals of a discretization on every
+evaluation. Thawing them anew each time copies them and allocates memory in
+the innermost loop of a simulation. :func:`get_geometry` instead returns a
+:class:`DiscretizationGeometry` per discretization that computes each
+quantity once per DOF descriptor and then returns the same array::
+
+    normal = get_geometry(discr, actx).normal(btag)
+
+The cached arrays are shared by all callers and must not be modified in place.
+Object arrays (such as the nodes and normals) are returned read-only, so that
+e.g. ``normal *= -1`` raises an error instead of corrupting the cache; compute
+``-normal`` instead. The DOF arrays they contain cannot be protected in this
+way. If the geometry of a discretization changes, or to release the memory held
+by the cache, call :func:`invalidate_geometry`.
+
+.. autoclass:: DiscretizationGeometry
+.. autofunction:: get_geometry
+.. autofunction:: invalidate_geometry
+"""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from weakref import WeakKeyDictionary, ref
+
+import numpy as np
+from meshmode.dof_array import thaw, DOFArray
+from grudge import bind, sym
+from grudge.symbolic.primitives import as_dofdesc
+
+
+class DiscretizationGeometry:
+    """Geometric quantities of a discretization, computed on first use.
+
+    .. automethod:: __init__
+    .. autoattribute:: discr
+    .. automethod:: nodes
+    .. automethod:: normal
+    .. automethod:: face_jacobian
+    .. automethod:: volume_jacobian
+    .. automethod:: element_size
+    .. automethod:: face_element_size
+    .. automethod:: boundary_embedding
+    .. automethod:: invalidate
+    """
+
+    def __init__(self, discr, actx):
+        """
+        Initialize an empty cache.
+
+        Parameters
+        ----------
+        discr: grudge.eager.EagerDGDiscretization
+            the discretization whose geometry is cached
+        actx: meshmode.array_context.ArrayContext
+            the array context in which the cached arrays are thawed
+        """
+        # Only a weak reference, since the discretization is the key of this
+        # object in the module-level cache
+        self._discr_ref = ref(discr)
+        self.actx = actx
+
+        # dict of (quantity name, DOFDesc) -> array
+        self._cache = {}
+
+    @property
+    def discr(self):
+        """The discretization whose geometry is cached."""
+        return self._discr_ref()
+
+    def _get(self, name, dd, compute):
+        key = (name, dd)
+        try:
+            return self._cache[key]
+        except KeyError:
+            result = compute()
+            if isinstance(result, np.ndarray):
+                result.flags.writeable = False
+            self._cache[key] = result
+            return result
+
+    def nodes(self, dd="vol"):
+        """Return the nodes of the discretization corresponding to *dd*."""
+        dd = as_dofdesc(dd)
+        return self._get("nodes", dd, lambda: thaw(self.actx,
+            self.discr.discr_from_dd(dd).nodes()))
+
+    def normal(self, dd):
+        """Return the outward unit normals on the faces corresponding to *dd*."""
+        dd = as_dofdesc(dd)
+        return self._get("normal", dd, lambda: thaw(self.actx,
+            self.discr.normal(dd)))
+
+    def face_jacobian(self, dd):
+        """Return the area element on the faces corresponding to *dd*."""
+        dd = as_dofdesc(dd)
+        discr = self.discr
+        return self._get("face_jacobian", dd, lambda: bind(discr,
+            sym.area_element(discr.ambient_dim, discr.dim - 1, dd=dd))(self.actx))
+
+    def volume_jacobian(self):
+        """Return the volume element of the volume discretization."""
+        discr = self.discr
+        return self._get("volume_jacobian", as_dofdesc("vol"), lambda: bind(discr,
+            sym.area_element(discr.ambient_dim, discr.dim))(self.actx))
+
+    def element_size(self):
+        """Return the ratio of volume to surface area of each element.
+
+        The result is a :class:`~meshmode.dof_array.DOFArray` on the volume
+        discretization that is constant on each element.
+        """
+        return self._get("element_size", as_dofdesc("vol"),
+                         self._compute_element_size)
+
+    def _compute_element_size(self):
+        discr = self.discr
+        actx = self.actx
+
+        ones = discr.zeros(actx) + 1.
+        volumes = discr.mass(ones)
+        areas = discr.face_mass(discr.project("vol", "all_faces", ones))
+
+        def group_element_size(vol_i, area_i):
+            vol_i = actx.to_numpy(vol_i)
+            h_i = vol_i.sum(axis=1) / actx.to_numpy(area_i).sum(axis=1)
+            return actx.from_numpy(
+                np.repeat(h_i[:, np.newaxis], vol_i.shape[1], axis=1))
+
+        return DOFArray.from_list(actx, [
+            group_element_size(vol_i, area_i)
+            for vol_i, area_i in zip(volumes, areas)])
+
+    def face_element_size(self, dd):
+        """Return the smaller :meth:`element_size` of the elements at each face.
+
+        On the interior faces and on the boundaries with other ranks, this is
+        the minimum of the element sizes on both sides, on other boundaries
+        that of the interior element. The element sizes on the boundaries with
+        other ranks are exchanged on first use for all neighbors at once, so
+        all ranks must first call this for such a boundary together.
+        """
+        dd = as_dofdesc(dd)
+        return self._get("face_element_size", dd,
+                         lambda: self._compute_face_element_size(dd))
+
+    def _compute_face_element_size(self, dd):
+        discr = self.discr
+        actx = self.actx
+        h = self.element_size()
+
+        if dd == as_dofdesc("int_faces"):
+            from grudge.eager import interior_trace_pair
+            tpair = interior_trace_pair(discr, h)
+            return actx.np.minimum(tpair.int, tpair.ext)
+
+        from meshmode.mesh import BTAG_PARTITION
+        if isinstance(dd.domain_tag, sym.DTAG_BOUNDARY) \
+                and isinstance(dd.domain_tag.tag, BTAG_PARTITION):
+            from mirgecom.exchange import cross_rank_trace_pairs
+            for tpair in cross_rank_trace_pairs(discr, h):
+                self._cache["face_element_size", tpair.dd] = \
+                    actx.np.minimum(tpair.int, tpair.ext)
+            return self._cache["face_element_size", dd]
+
+        return discr.project("vol", dd, h)
+
+    def boundary_embedding(self, dd):
+        """Return the connection from the boundary *dd* to all domain boundaries.
+
+        The returned connection maps a field on the faces of the boundary
+        corresponding to *dd* to the faces of :class:`~meshmode.mesh.BTAG_ALL`,
+        where it is zero on the faces that do not belong to *dd*. Fields on
+        several boundaries can thus be summed on the domain boundary before
+        they are projected to ``"all_faces"`` at once.
+        """
+        dd = as_dofdesc(dd)
+        return self._get("boundary_embedding", dd,
+                         lambda: self._compute_boundary_embedding(dd))
+
+    def _compute_boundary_embedding(self, dd):
+        discr = self.discr
+        actx = self.actx
+
+        from meshmode.mesh import BTAG_ALL
+        from meshmode.discretization.connection import (
+            DirectDiscretizationConnection,
+            DiscretizationConnectionElementGroup,
+            InterpolationBatch,
+        )
+
+        bdry_conn = discr.connection_from_dds("vol", dd)
+        all_bdry_conn = discr.connection_from_dds("vol", BTAG_ALL)
+
+        def to_numpy(ary):
+            return actx.to_numpy(actx.thaw(ary))
+
+        # dict of (volume group, face) -> array mapping the volume elements to
+        # the elements of the faces of all domain boundaries (or -1)
+        all_bdry_elements = {}
+        for cgrp in all_bdry_conn.groups:
+            for batch in cgrp.batches:
+                vol_elements = to_numpy(batch.from_element_indices)
+                lookup = np.full(
+                    discr.discr_from_dd("vol").groups[
+                        batch.from_group_index].nelements,
+                    -1, dtype=vol_elements.dtype)
+                lookup[vol_elements] = to_numpy(batch.to_element_indices)
+                all_bdry_elements[batch.from_group_index,
+                                  batch.to_element_face] = lookup
+
+        groups = []
+        for igrp, (cgrp, bdry_grp) in enumerate(
+                zip(bdry_conn.groups, bdry_conn.to_discr.groups)):
+            batches = []
+            for batch in cgrp.batches:
+                to_elements = all_bdry_elements[
+                    batch.from_group_index, batch.to_element_face][
+                        to_numpy(batch.from_element_indices)]
+                if (to_elements < 0).any():
+                    raise ValueError(f"faces of '{dd}' are not on the domain "
+                                     "boundary")
+
+                # Both restrictions place the nodes of a face in the same order
+                batches.append(InterpolationBatch(
+                    from_group_index=igrp,
+                    from_element_indices=batch.to_element_indices,
+                    to_element_indices=actx.freeze(actx.from_numpy(to_elements)),
+                    result_unit_nodes=bdry_grp.unit_nodes,
+                    to_element_face=None))
+
+            groups.append(DiscretizationConnectionElementGroup(batches))
+
+        return DirectDiscretizationConnection(
+            from_discr=bdry_conn.to_discr,
+            to_discr=all_bdry_conn.to_discr,
+            groups=groups,
+            is_surjective=False)
+
+    def invalidate(self):
+        """Discard all cached quantities."""
+        self._cache.clear()
+
+
+# dict of discretization -> DiscretizationGeometry
+_geometries = WeakKeyDictionary()
+
+
+def get_geometry(discr, actx):
+    """Return the :class:`DiscretizationGeometry` of *discr* in *actx*.
+
+    The cache is replaced if *actx* differs from the array context it was
+    created with.
+    """
+    geometry = _geometries.get(discr)
+    if geometry is None or geometry.actx is not actx:
+        geometry = DiscretizationGeometry(discr, actx)
+        _geometries[discr] = geometry
+    return geometry
+
+
+def invalidate_geometry(discr):
+    """Discard the cached geometric quantities of *discr*."""
+    geometry = _geometries.pop(discr, None)
+    if geometry is not None:
+        geometry.invalidate()
@@ -26,14 +26,21 @@ THE SOFTWARE.
 
 __doc__ = """
 .. autoclass:: StateConsumer
+.. autoclass:: DiscretizationConsumer
 .. autoclass:: DiscretizationBasedQuantity
+.. autoclass:: DiscretizationBasedQuantityGroup
 .. autoclass:: KernelProfile
+.. autoclass:: CommunicationProfile
+.. autoclass:: DeviceMemoryUsage
 .. autoclass:: PythonMemoryUsage
 .. autofunction:: initialize_logmgr
 .. autofunction:: logmgr_add_device_name
 .. autofunction:: logmgr_add_many_discretization_quantities
+.. autofunction:: logmgr_add_communication_profile
+.. autofunction:: logmgr_add_device_memory_usage
 .. autofunction:: add_package_versions
 .. autofunction:: set_sim_state
+.. autofunction:: set_discretization
 """
 
 from logpyle import (LogQuantity, LogManager, MultiLogQuantity, add_run_info,
@@ -77,20 +84,34 @@ def logmgr_add_device_name(logmgr: LogManager, queue: cl.CommandQueue):
 
 def logmgr_add_many_discretization_quantities(logmgr: LogManager, discr, dim,
       extract_vars_for_logging, units_for_logging):
-    """Add default discretization quantities to the logmgr."""
-    for op in ["min", "max", "L2_norm"]:
-        for quantity in ["pressure", "temperature"]:
-            logmgr.add_quantity(DiscretizationBasedQuantity(
-                discr, quantity, op, extract_vars_for_logging, units_for_logging))
+    """Add default discretization quantities to the logmgr.
 
-        for quantity in ["mass", "energy"]:
-            logmgr.add_quantity(DiscretizationBasedQuantity(
-                discr, quantity, op, extract_vars_for_logging, units_for_logging))
+    All quantities are evaluated by a single
+    :class:`DiscretizationBasedQuantityGroup`.
+    """
+    reductions = []
+    for op in ["min", "max", "L2_norm"]:
+        for quantity in ["pressure", "temperature", "mass", "energy"]:
+            reductions.append((quantity, op, None))
 
         for d in range(dim):
-            logmgr.add_quantity(DiscretizationBasedQuantity(
-                discr, "momentum", op, extract_vars_for_logging, units_for_logging,
-                axis=d))
+            reductions.append(("momentum", op, d))
+
+    logmgr.add_quantity(DiscretizationBasedQuantityGroup(
+        discr, reductions, extract_vars_for_logging, units_for_logging))
+
+
+def logmgr_add_communication_profile(logmgr: LogManager, discr):
+    """Add the partition exchange statistics of *discr* to the logmgr."""
+    logmgr.add_quantity(CommunicationProfile(discr))
+
+
+def logmgr_add_device_memory_usage(logmgr: LogManager, allocator):
+    """Add the device memory use tracked by *allocator* to the logmgr.
+
+    *allocator* is a :class:`mirgecom.profiling.TrackingMemoryPool`.
+    """
+    logmgr.add_quantity(DeviceMemoryUsage(allocator))
 
 
 # {{{ Package versions
@@ -152,6 +173,11 @@ def set_sim_state(mgr: LogManager, dim, state, eos) -> None:
     mgr
         The :class:`logpyle.LogManager` whose :class:`StateConsumer` quantities
         will receive *state*.
+
+    The state variables are not extracted here, but only once a quantity
+    accesses them, so that this costs (almost) nothing on steps in which no
+    quantities are gathered. Each extraction function is called at most once
+    per state, regardless of the number of quantities sharing it.
     """
     state_vars = {}
 
@@ -161,17 +187,34 @@ def set_sim_state(mgr: LogManager, dim, state, eos) -> None:
             if isinstance(gd.quantity, StateConsumer):
                 extract_state_vars_func = gd.quantity.extract_state_vars
                 if extract_state_vars_func not in state_vars:
-                    state_vars[extract_state_vars_func] = \
-                        extract_state_vars_func(dim, state, eos)
+                    state_vars[extract_state_vars_func] = _DeferredStateVars(
+                        extract_state_vars_func, dim, state, eos)
 
                 gd.quantity.set_state_vars(state_vars[extract_state_vars_func])
 
 
+class _DeferredStateVars:
+    """Extracts the state variables of a state when they are first requested."""
+
+    def __init__(self, extract_state_vars, dim, state, eos):
+        self._extract_state_vars = extract_state_vars
+        self._args = (dim, state, eos)
+        self._state_vars = None
+
+    def get(self) -> dict:
+        if self._state_vars is None:
+            self._state_vars = self._extract_state_vars(*self._args)
+            # The state is no longer needed
+            self._args = None
+        return self._state_vars
+
+
 class StateConsumer:
     """Base class for quantities that require a state for logging.
 
     .. automethod:: __init__
     .. automethod:: set_state_vars
+    .. autoattribute:: state_vars
     """
 
     def __init__(self, extract_vars_for_logging: Callable):
@@ -184,18 +227,69 @@ class StateConsumer:
             state.
         """
         self.extract_state_vars = extract_vars_for_logging
-        self.state_vars = None
+        self._state_vars = None
+
+    def set_state_vars(self, state_vars) -> None:
+        """Update the state vector of the object.
+
+        *state_vars* is either a :class:`dict` of state variables or an
+        object whose ``get`` method returns one when called, as passed by
+        :func:`set_sim_state`.
+        """
+        self._state_vars = state_vars
+
+    @property
+    def state_vars(self) -> Optional[dict]:
+        """The state variables, extracted from the state upon first access."""
+        if self._state_vars is None or isinstance(self._state_vars, dict):
+            return self._state_vars
+        return self._state_vars.get()
+
+
+def set_discretization(mgr: LogManager, discr) -> None:
+    """Evaluate all :class:`DiscretizationConsumer` of the log manager on *discr*.
+
+    Parameters
+    ----------
+    mgr
+        The :class:`logpyle.LogManager` whose :class:`DiscretizationConsumer`
+        quantities will be evaluated on *discr* from now on.
+
+    This is needed when the simulation moves to another discretization of the
+    same mesh, such as after a change of the polynomial order (see
+    :mod:`mirgecom.p_sequencing`). The state of the :class:`StateConsumer`
+    quantities still refers to the previous discretization and must be updated
+    with :func:`set_sim_state` before the next gathering.
+    """
+    for gd_lst in [mgr.before_gather_descriptors,
+            mgr.after_gather_descriptors]:
+        for gd in gd_lst:
+            if isinstance(gd.quantity, DiscretizationConsumer):
+                gd.quantity.set_discretization(discr)
+
+
+class DiscretizationConsumer:
+    """Base class for quantities that are evaluated on a discretization.
+
+    .. automethod:: __init__
+    .. automethod:: set_discretization
+    """
 
-    def set_state_vars(self, state_vars: np.ndarray) -> None:
-        """Update the state vector of the object."""
-        self.state_vars = state_vars
+    def __init__(self, discr):
+        """Store the discretization on which the quantity is evaluated."""
+        self.set_discretization(discr)
+
+    def set_discretization(self, discr) -> None:
+        """Evaluate the quantity on *discr* from now on."""
+        self.discr = discr
 
 # }}}
 
 # {{{ Discretization-based quantities
 
 
-class DiscretizationBasedQuantity(LogQuantity, StateConsumer):
+class DiscretizationBasedQuantity(LogQuantity, StateConsumer,
+                                  DiscretizationConsumer):
     """Logging support for physical quantities.
 
     Possible rank aggregation operations (``op``) are: min, max, L2_norm.
@@ -212,25 +306,34 @@ class DiscretizationBasedQuantity(LogQuantity, StateConsumer):
         LogQuantity.__init__(self, name, unit)
         StateConsumer.__init__(self, extract_vars_for_logging)
 
-        self.discr = discr
-
         self.quantity = quantity
         self.axis = axis
 
-        from functools import partial
-
         if op == "min":
-            self._discr_reduction = partial(self.discr.nodal_min, "vol")
             self.rank_aggr = min
         elif op == "max":
-            self._discr_reduction = partial(self.discr.nodal_max, "vol")
             self.rank_aggr = max
         elif op == "L2_norm":
-            self._discr_reduction = partial(self.discr.norm, p=2)
             self.rank_aggr = max
         else:
             raise ValueError(f"unknown operation {op}")
 
+        self.op = op
+        DiscretizationConsumer.__init__(self, discr)
+
+    def set_discretization(self, discr) -> None:
+        """Evaluate the quantity on *discr* from now on."""
+        DiscretizationConsumer.set_discretization(self, discr)
+
+        from functools import partial
+
+        if self.op == "min":
+            self._discr_reduction = partial(self.discr.nodal_min, "vol")
+        elif self.op == "max":
+            self._discr_reduction = partial(self.discr.nodal_max, "vol")
+        else:
+            self._discr_reduction = partial(self.discr.norm, p=2)
+
     @property
     def default_aggregator(self):
         """Rank aggregator to use."""
@@ -248,6 +351,205 @@ class DiscretizationBasedQuantity(LogQuantity, StateConsumer):
 
         return self._discr_reduction(quantity)
 
+
+def _free_mpi_op(op):
+    from mpi4py import MPI
+    if not MPI.Is_finalized():
+        op.Free()
+
+
+def _local_reductions(actx, field, jacobian, ref_mass_matrices):
+    """Return the local minimum, maximum, and squared $L^2$ norm of *field*.
+
+    A single kernel per element group computes all three reductions for
+    chunks of elements. Only the per-chunk results are transferred to the
+    host, where they are combined.
+    """
+    from pytools import memoize_in
+    import loopy as lp
+    from meshmode.array_context import make_loopy_program
+
+    @memoize_in(actx, (_local_reductions, "log_reductions_prg"))
+    def prg():
+        # Each work item reduces a chunk of 64 elements
+        return make_loopy_program(
+            """{[iel, i, jdof, kdof]:
+                0 <= iel < nchunks and
+                0 <= i < 64 and 64*iel + i < nelements and
+                0 <= jdof, kdof < ndofs}""",
+            """
+            partials[iel, 0] = reduce(min, [i, jdof], u[64*iel + i, jdof])
+            partials[iel, 1] = reduce(max, [i, jdof], u[64*iel + i, jdof])
+            partials[iel, 2] = sum([i, jdof, kdof],
+                u[64*iel + i, jdof] * ref_mass[jdof, kdof]
+                * jac[64*iel + i, kdof] * u[64*iel + i, kdof])
+            """,
+            [
+                lp.GlobalArg("partials", np.float64, shape="nchunks, 3"),
+                lp.GlobalArg("u", None, shape="nelements, ndofs"),
+                lp.GlobalArg("jac", None, shape="nelements, ndofs"),
+                lp.GlobalArg("ref_mass", None, shape="ndofs, ndofs"),
+                lp.ValueArg("nchunks", np.int32),
+                lp.ValueArg("nelements", np.int32),
+                lp.ValueArg("ndofs", np.int32),
+            ],
+            name="log_reductions")
+
+    minimum = np.inf
+    maximum = -np.inf
+    norm_squared = 0.
+
+    for u_i, jac_i, ref_mass_i in zip(field, jacobian, ref_mass_matrices):
+        nelements = u_i.shape[0]
+        if nelements == 0:
+            continue
+
+        partials = actx.to_numpy(actx.call_loopy(prg(), u=u_i, jac=jac_i,
+            ref_mass=ref_mass_i, nchunks=(nelements + 63) // 64)["partials"])
+
+        minimum = min(minimum, partials[:, 0].min())
+        maximum = max(maximum, partials[:, 1].max())
+        norm_squared += partials[:, 2].sum()
+
+    return minimum, maximum, norm_squared
+
+
+class DiscretizationBasedQuantityGroup(MultiLogQuantity, StateConsumer,
+                                       DiscretizationConsumer):
+    """Logging support for many physical quantities at once.
+
+    Evaluates the same reductions as a set of
+    :class:`DiscretizationBasedQuantity`, but with a single device pass per
+    field and a single collective per evaluation: one kernel per field (and
+    element group) computes the field's local minimum, maximum, and squared
+    :math:`L^2` norm together. The local values of all quantities are then
+    reduced across ranks by one ``Allreduce`` with a custom operation that
+    takes the minimum of the minima (and negated maxima) and sums the squared
+    norms. All ranks hence log the global values.
+
+    Parameters
+    ----------
+    reductions
+        A list of tuples *(quantity, op, axis)*, with *op* one of ``"min"``,
+        ``"max"``, and ``"L2_norm"``, and *axis* either *None* or the
+        component of a vector quantity (such as momentum).
+    """
+
+    def __init__(self, discr: Discretization, reductions: list,
+                 extract_vars_for_logging, units_logging):
+        for _, op, _ in reductions:
+            if op not in ["min", "max", "L2_norm"]:
+                raise ValueError(f"unknown operation {op}")
+
+        names = [f"{op}_{quantity}" + (str(axis) if axis is not None else "")
+                 for quantity, op, axis in reductions]
+        units = [units_logging(quantity) for quantity, _, _ in reductions]
+        MultiLogQuantity.__init__(self, names, units)
+        StateConsumer.__init__(self, extract_vars_for_logging)
+        DiscretizationConsumer.__init__(self, discr)
+
+        self.reductions = reductions
+
+        # The distinct fields, each of which is reduced once
+        self._fields = list(dict.fromkeys(
+            (quantity, axis) for quantity, _, axis in reductions))
+
+        # Order of the values in the packed buffer: minima, negated maxima, and
+        # squared norms, so that the first two blocks are reduced by min
+        self._order = (
+            [i for i, (_, op, _) in enumerate(reductions) if op == "min"]
+            + [i for i, (_, op, _) in enumerate(reductions) if op == "max"]
+            + [i for i, (_, op, _) in enumerate(reductions) if op == "L2_norm"])
+        self._nminmax = sum(1 for _, op, _ in reductions if op != "L2_norm")
+
+        self._mpi_op = None
+        self._ref_mass_matrices = None
+
+    @property
+    def default_aggregators(self):
+        """Rank aggregators to use."""
+        return [min if op == "min" else max for _, op, _ in self.reductions]
+
+    def set_discretization(self, discr) -> None:
+        """Evaluate the quantities on *discr* from now on."""
+        DiscretizationConsumer.set_discretization(self, discr)
+        self._ref_mass_matrices = None
+
+    def _get_mpi_op(self):
+        if self._mpi_op is None:
+            from mpi4py import MPI
+            from weakref import finalize
+            nminmax = self._nminmax
+
+            def min_then_sum(inbuf, outbuf, datatype):
+                a = np.frombuffer(inbuf, dtype=np.float64)
+                b = np.frombuffer(outbuf, dtype=np.float64)
+                np.minimum(a[:nminmax], b[:nminmax], out=b[:nminmax])
+                b[nminmax:] += a[nminmax:]
+
+            self._mpi_op = MPI.Op.Create(min_then_sum, commute=True)
+            finalize(self, _free_mpi_op, self._mpi_op)
+
+        return self._mpi_op
+
+    def _get_ref_mass_matrices(self, actx):
+        if self._ref_mass_matrices is None:
+            import modepy as mp
+            self._ref_mass_matrices = [
+                actx.from_numpy(mp.mass_matrix(grp.basis(), grp.unit_nodes))
+                for grp in self.discr.discr_from_dd("vol").groups]
+        return self._ref_mass_matrices
+
+    def __call__(self) -> list:
+        """Return the requested quantities."""
+        if self.state_vars is None:
+            return [None] * len(self.reductions)
+
+        from mirgecom.geometry import get_geometry
+
+        # dict of (quantity, axis) -> (min, max, squared L2 norm)
+        field_values = {}
+        for quantity, axis in self._fields:
+            field = self.state_vars[quantity]
+            if axis is not None:  # e.g. momentum
+                field = field[axis]
+
+            actx = field.array_context
+            field_values[quantity, axis] = _local_reductions(actx, field,
+                get_geometry(self.discr, actx).volume_jacobian(),
+                self._get_ref_mass_matrices(actx))
+
+        packed = np.empty(len(self.reductions), dtype=np.float64)
+        for j, i in enumerate(self._order):
+            quantity, op, axis = self.reductions[i]
+            minimum, maximum, norm_squared = field_values[quantity, axis]
+            if op == "min":
+                packed[j] = minimum
+            elif op == "max":
+                packed[j] = -maximum
+            else:
+                packed[j] = norm_squared
+
+        comm = self.discr.mpi_communicator
+        if comm is not None:
+            from mpi4py import MPI
+            result = np.empty_like(packed)
+            comm.Allreduce([packed, MPI.DOUBLE], [result, MPI.DOUBLE],
+                           op=self._get_mpi_op())
+            packed = result
+
+        values = [None] * len(self.reductions)
+        for j, i in enumerate(self._order):
+            op = self.reductions[i][1]
+            if op == "min":
+                values[i] = packed[j]
+            elif op == "max":
+                values[i] = -packed[j]
+            else:
+                values[i] = np.sqrt(packed[j])
+
+        return values
+
 # }}}
 
 
@@ -299,6 +601,88 @@ class KernelProfile(MultiLogQuantity):
 # }}}
 
 
+# {{{ Communication profile quantities
+
+class CommunicationProfile(MultiLogQuantity, DiscretizationConsumer):
+    """Logging support for the statistics of the partition exchanges.
+
+    Logs the number of exchanges and messages, the data sent and received, and
+    the time spent waiting for the exchanges to complete, summed over all
+    neighbor ranks, as well as the longest wait time for a single neighbor.
+    All values are accumulated since the previous log interval.
+
+    See :func:`mirgecom.exchange.get_exchange_statistics` for the per-neighbor
+    statistics and :func:`mirgecom.exchange.write_communication_matrix` for a
+    dump of the communication matrix.
+
+    Parameters
+    ----------
+    discr
+        The discretization whose exchanges are profiled.
+    """
+
+    def __init__(self, discr, name_prefix: str = "comm") -> None:
+        names = [f"{name_prefix}_{name}" for name in [
+            "num_exchanges", "messages_sent", "bytes_sent", "bytes_received",
+            "wait_time", "max_neighbor_wait_time"]]
+        units = ["1", "1", "MByte", "MByte", "s", "s"]
+        descriptions = [
+            "Number of partition exchanges",
+            "Number of messages sent to neighbor ranks",
+            "Data sent to neighbor ranks",
+            "Data received from neighbor ranks",
+            "Time spent waiting for partition exchanges",
+            "Longest time spent waiting for a single neighbor rank"]
+
+        MultiLogQuantity.__init__(self, names, units, descriptions)
+        DiscretizationConsumer.__init__(self, discr)
+
+    def set_discretization(self, discr) -> None:
+        """Profile the exchanges of *discr* from now on."""
+        DiscretizationConsumer.set_discretization(self, discr)
+        self._last_num_exchanges = 0
+        self._last_neighbors = {}
+
+    def __call__(self) -> list:
+        """Return the communication statistics since the last call."""
+        from dataclasses import replace
+        from mirgecom.exchange import (
+            get_exchange_statistics, NeighborExchangeStatistics)
+
+        stats = get_exchange_statistics(self.discr)
+
+        if stats.num_exchanges < self._last_num_exchanges:
+            # The statistics were reset in the meantime
+            self._last_num_exchanges = 0
+            self._last_neighbors = {}
+
+        diff = NeighborExchangeStatistics()
+        max_neighbor_wait_time = 0.
+
+        for remote_rank, neighbor in stats.neighbors.items():
+            last = self._last_neighbors.get(remote_rank,
+                                            NeighborExchangeStatistics())
+
+            diff.messages_sent += neighbor.messages_sent - last.messages_sent
+            diff.bytes_sent += neighbor.bytes_sent - last.bytes_sent
+            diff.bytes_received += neighbor.bytes_received - last.bytes_received
+            diff.wait_time += neighbor.wait_time - last.wait_time
+            max_neighbor_wait_time = max(max_neighbor_wait_time,
+                                         neighbor.wait_time - last.wait_time)
+
+        num_exchanges = stats.num_exchanges - self._last_num_exchanges
+
+        self._last_num_exchanges = stats.num_exchanges
+        self._last_neighbors = {remote_rank: replace(neighbor)
+                                for remote_rank, neighbor in stats.neighbors.items()}
+
+        return [num_exchanges, diff.messages_sent,
+                diff.bytes_sent / 1024 / 1024, diff.bytes_received / 1024 / 1024,
+                diff.wait_time, max_neighbor_wait_time]
+
+# }}}
+
+
 # {{{ Memory profiling
 
 class PythonMemoryUsage(LogQuantity):
@@ -321,4 +705,51 @@ class PythonMemoryUsage(LogQuantity):
         """Return the memory usage in MByte."""
         return self.process.memory_info()[0] / 1024 / 1024
 
+
+class DeviceMemoryUsage(MultiLogQuantity):
+    """Logging support for device memory usage of a memory pool.
+
+    Logs the memory currently held by the pool and in use, the peak memory in
+    use since the previous log interval, and the number of allocations and
+    pool misses since the previous log interval.
+
+    Parameters
+    ----------
+    allocator
+        The :class:`mirgecom.profiling.TrackingMemoryPool` to log.
+    """
+
+    def __init__(self, allocator, name_prefix: str = "device_memory") -> None:
+        names = [f"{name_prefix}_{name}" for name in [
+            "held", "active", "peak_active", "num_allocations", "num_misses"]]
+        units = ["MByte", "MByte", "MByte", "1", "1"]
+        descriptions = [
+            "Device memory held by the memory pool for reuse",
+            "Device memory in use",
+            "Peak device memory in use",
+            "Number of device memory allocations",
+            "Number of device memory allocations that missed the pool"]
+
+        super().__init__(names, units, descriptions)
+
+        self.allocator = allocator
+        self._last_num_allocations = allocator.num_allocations
+        self._last_num_misses = allocator.num_misses
+        allocator.reset_interval_peak()
+
+    def __call__(self) -> list:
+        """Return the memory usage in MByte and the allocation counts."""
+        a = self.allocator
+
+        peak = a.interval_peak_active_bytes
+        a.reset_interval_peak()
+
+        num_allocations = a.num_allocations - self._last_num_allocations
+        num_misses = a.num_misses - self._last_num_misses
+        self._last_num_allocations = a.num_allocations
+        self._last_num_misses = a.num_misses
+
+        return [a.held_bytes / 1024 / 1024, a.active_bytes / 1024 / 1024,
+                peak / 1024 / 1024, num_allocations, num_misses]
+
 # }}}
@@ -1,6 +1,8 @@
 """MPI helper functionality.
 
 .. autofunction:: mpi_entry_point
+.. autofunction:: shared_split_comm_world
+.. autofunction:: leader_rank_first
 """
 
 __copyright__ = """
@@ -46,6 +48,51 @@ def shared_split_comm_world():
         comm.Free()
 
 
+@contextmanager
+def leader_rank_first(scope="node"):
+    """Create a context manager that runs the enclosed code on a leader rank first.
+
+    The leader rank of *scope* executes the enclosed block while all other ranks
+    of *scope* wait for it. Once the leader is done, the remaining ranks execute
+    the block concurrently. Wrapping code that compiles kernels in this context
+    manager lets the leader compile each kernel once and write it to the kernel
+    caches, from which the other ranks then read the binary instead of compiling
+    (and locking the cache) redundantly.
+
+    The enclosed code must not communicate with other ranks of *scope*, since
+    those are blocked while the leader runs.
+
+    Parameters
+    ----------
+    scope: str
+        Either ``"node"`` (one leader per shared-memory node, see
+        :func:`shared_split_comm_world`) or ``"job"`` (a single leader
+        for all ranks of ``MPI.COMM_WORLD``).
+    """
+    from mpi4py import MPI
+
+    @contextmanager
+    def _leader_first(comm):
+        is_leader = comm.Get_rank() == 0
+        if not is_leader:
+            comm.Barrier()
+        try:
+            yield
+        finally:
+            if is_leader:
+                comm.Barrier()
+
+    if scope == "node":
+        with shared_split_comm_world() as node_comm:
+            with _leader_first(node_comm):
+                yield
+    elif scope == "job":
+        with _leader_first(MPI.COMM_WORLD):
+            yield
+    else:
+        raise ValueError(f"unknown scope '{scope}'")
+
+
 def _check_gpu_oversubscription():
     """
     Check whether multiple ranks are running on the same GPU on each node.
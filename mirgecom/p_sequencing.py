@@ -0,0 +1,292 @@
+r""":mod:`mirgecom.p_sequencing` changes the polynomial order of a solution.
+
+Reaching a statistically steady state is cheaper at low polynomial order.
+With p-sequencing, the early transient is computed on a low-order
+discretization, and the solution is then transferred to a higher-order
+discretization of the same mesh (or vice versa) by modal projection: on each
+element, the solution is expanded in an orthonormal polynomial basis, and the
+modes that are representable at the target order are evaluated at the target
+nodes. Increasing the order is exact, decreasing it is the $L^2$ projection
+onto the lower-order space.
+
+:func:`advance_state_p_sequenced` runs :func:`mirgecom.steppers.advance_state`
+for a sequence of :class:`OrderStage`\ s, changing the order between them. A
+solution read from a restart written at another order can be converted with
+:class:`OrderChange` before resuming.
+
+.. autoclass:: OrderChange
+.. autofunction:: make_order_change_matrix
+.. autoclass:: OrderStage
+.. autofunction:: advance_state_p_sequenced
+"""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+import numpy.linalg as la
+import loopy as lp
+import modepy as mp
+from pytools import memoize_in
+from meshmode.array_context import make_loopy_program
+from meshmode.dof_array import DOFArray
+from meshmode.discretization.poly_element import (
+    PolynomialSimplexElementGroupBase)
+
+from mirgecom.logging_quantities import set_discretization, set_sim_state
+from mirgecom.steppers import advance_state
+from mirgecom.timing import timed_region
+
+
+def make_order_change_matrix(from_group, to_group):
+    """Return the matrix that maps nodal values on *from_group* to *to_group*.
+
+    Both element groups must be polynomial simplex element groups (see
+    :mod:`meshmode.discretization.poly_element`) of the same dimension. The
+    matrix is computed on the host from Vandermonde matrices of the orthonormal
+    simplex basis, keeping only the modes whose total degree does not exceed
+    the lower of the two orders.
+
+    Returns
+    -------
+    numpy.ndarray
+        a matrix of shape ``(to_group.nunit_dofs, from_group.nunit_dofs)``
+    """
+    if not (isinstance(from_group, PolynomialSimplexElementGroupBase)
+            and isinstance(to_group, PolynomialSimplexElementGroupBase)):
+        raise TypeError("element groups must be polynomial simplex groups")
+
+    if from_group.dim != to_group.dim:
+        raise ValueError("element groups must have the same dimension")
+
+    dim = from_group.dim
+
+    mode_ids, basis = mp.simplex_onb_with_mode_ids(dim, from_group.order)
+
+    # nodal values -> modal coefficients on the source group
+    from_vdm = mp.vandermonde(basis, from_group.unit_nodes)
+    nodal_to_modal = la.inv(from_vdm)
+
+    # the mode identifiers are plain integers in 1D
+    kept = [i for i, mode_id in enumerate(mode_ids)
+            if np.sum(mode_id) <= min(from_group.order, to_group.order)]
+
+    # kept modal coefficients -> nodal values on the target group
+    to_vdm = mp.vandermonde([basis[i] for i in kept], to_group.unit_nodes)
+
+    return to_vdm @ nodal_to_modal[kept, :]
+
+
+def _apply_matrix(actx, matrix, ary):
+    """Apply *matrix* to the DOFs of each element of the group array *ary*."""
+    @memoize_in(actx, (_apply_matrix, "order_change_prg"))
+    def prg():
+        return make_loopy_program(
+            """{[iel, idof, jdof]:
+                0 <= iel < nelements and
+                0 <= idof < n_to_dofs and
+                0 <= jdof < n_from_dofs}""",
+            "result[iel, idof] = sum(jdof, mat[idof, jdof] * ary[iel, jdof])",
+            [
+                lp.GlobalArg("result", None, shape="nelements, n_to_dofs"),
+                lp.GlobalArg("mat", None, shape="n_to_dofs, n_from_dofs"),
+                lp.GlobalArg("ary", None, shape="nelements, n_from_dofs"),
+                lp.ValueArg("nelements", np.int32),
+                lp.ValueArg("n_to_dofs", np.int32),
+                lp.ValueArg("n_from_dofs", np.int32),
+            ],
+            name="change_order")
+
+    return actx.call_loopy(prg(), mat=matrix, ary=ary)["result"]
+
+
+class OrderChange:
+    """Transfers fields between two discretizations of the same mesh.
+
+    The transfer matrices are computed once per element group.
+
+    .. automethod:: __init__
+    .. automethod:: __call__
+    """
+
+    def __init__(self, actx, from_discr, to_discr):
+        """
+        Compute the transfer matrices.
+
+        Parameters
+        ----------
+        actx: meshmode.array_context.ArrayContext
+            the array context of the fields to transfer
+        from_discr: grudge.eager.EagerDGDiscretization
+            the discretization of the fields to transfer
+        to_discr: grudge.eager.EagerDGDiscretization
+            the discretization to which the fields are transferred; must have
+            the same mesh (and partition) as *from_discr*
+        """
+        from_vol_discr = from_discr.discr_from_dd("vol")
+        to_vol_discr = to_discr.discr_from_dd("vol")
+
+        if len(from_vol_discr.groups) != len(to_vol_discr.groups) or any(
+                from_grp.nelements != to_grp.nelements
+                for from_grp, to_grp in zip(from_vol_discr.groups,
+                                            to_vol_discr.groups)):
+            raise ValueError("discretizations must be of the same mesh")
+
+        self.actx = actx
+        self.from_discr = from_discr
+        self.to_discr = to_discr
+
+        self._matrices = [
+            actx.from_numpy(make_order_change_matrix(from_grp, to_grp))
+            for from_grp, to_grp in zip(from_vol_discr.groups, to_vol_discr.groups)]
+
+    @timed_region("order_change")
+    def __call__(self, field):
+        """Transfer *field* to the target discretization.
+
+        Parameters
+        ----------
+        field: Union[meshmode.dof_array.DOFArray, numpy.ndarray]
+            a DOF array, or an object array (of any shape) of DOF arrays, on
+            the volume of the source discretization
+
+        Returns
+        -------
+        meshmode.dof_array.DOFArray or numpy.ndarray
+            *field* on the volume of the target discretization
+        """
+        if isinstance(field, np.ndarray):
+            result = np.empty(field.shape, dtype=object)
+            for idx, field_i in np.ndenumerate(field):
+                result[idx] = self(field_i)
+            return result
+
+        return DOFArray(self.actx, tuple(
+            _apply_matrix(self.actx, matrix, group_ary)
+            for matrix, group_ary in zip(self._matrices, field)))
+
+
+@dataclass
+class OrderStage:
+    """One stage of a p-sequenced run.
+
+    .. attribute:: discr
+
+        The discretization used during this stage.
+
+    .. attribute:: rhs
+
+        The RHS function on *discr*, see
+        :func:`mirgecom.steppers.advance_state`.
+
+    .. attribute:: t_final
+
+        The simulated time at which this stage ends.
+
+    .. attribute:: get_timestep
+
+        The timestep function for this stage.
+
+    .. attribute:: checkpoint
+
+        The checkpoint function for this stage, or *None* to skip
+        checkpointing.
+    """
+
+    discr: object
+    rhs: Callable
+    t_final: float
+    get_timestep: Callable
+    checkpoint: Optional[Callable] = None
+
+
+def advance_state_p_sequenced(stages, timestepper, state, t=0.0, istep=0,
+                              logmgr=None, eos=None, dim=None):
+    """Advance *state* through several stages of increasing (or any) order.
+
+    Each stage is run by :func:`mirgecom.steppers.advance_state` on its own
+    discretization. Between stages, the state is transferred to the next
+    discretization with :class:`OrderChange`, and the
+    :class:`~mirgecom.logging_quantities.DiscretizationConsumer` quantities of
+    *logmgr* are moved to it with
+    :func:`~mirgecom.logging_quantities.set_discretization`. Quantities that
+    hold on to a discretization in other ways are not updated.
+
+    Parameters
+    ----------
+    stages
+        a sequence of :class:`OrderStage`
+    timestepper
+        function that advances the state from t=time to t=(time+dt)
+    state: numpy.ndarray
+        the initial state on the discretization of the first stage
+    t: float
+        time at which to start
+    istep: int
+        step number from which to start
+    logmgr: logpyle.LogManager
+        the log manager shared by all stages, or *None* to disable logging
+    eos: mirgecom.eos.GasEOS
+        the equation of state passed to the logging quantities with the state
+    dim: int
+        the spatial dimension passed to the logging quantities with the state
+
+    Returns
+    -------
+    istep: int
+        the current step number
+    t: float
+        the current time
+    state: numpy.ndarray
+        the state on the discretization of the last stage at which the run
+        stopped
+    """
+    def no_checkpoint(state, step, t, dt):
+        return 0
+
+    prev_discr = None
+    for stage in stages:
+        if prev_discr is not None and stage.discr is not prev_discr:
+            actx = state[0].array_context
+            state = OrderChange(actx, prev_discr, stage.discr)(state)
+
+            if logmgr:
+                set_discretization(logmgr, stage.discr)
+                set_sim_state(logmgr, dim, state, eos)
+
+        istep, t, state = advance_state(rhs=stage.rhs, timestepper=timestepper,
+            checkpoint=stage.checkpoint or no_checkpoint,
+            get_timestep=stage.get_timestep, state=state, t_final=stage.t_final,
+            t=t, istep=istep, logmgr=logmgr, eos=eos, dim=dim)
+
+        prev_discr = stage.discr
+
+        if t < stage.t_final:
+            # stopped early by the checkpoint or timestep function
+            break
+
+    return istep, t, state
@@ -29,16 +29,24 @@ import pyopencl as cl
 from pytools.py_codegen import PythonFunctionGenerator
 import loopy as lp
 import numpy as np
+from collections import deque
 from dataclasses import dataclass
+from typing import Optional
 import pytools
 from logpyle import LogManager
 from mirgecom.logging_quantities import KernelProfile
 from mirgecom.utils import StatisticsAccumulator
+from mirgecom.timing import current_region_path, get_region_timer
 
 __doc__ = """
 .. autoclass:: PyOpenCLProfilingArrayContext
 .. autoclass:: SingleCallKernelProfile
 .. autoclass:: MultiCallKernelProfile
+.. autoclass:: CrossRankProfile
+.. autofunction:: gather_cross_rank_profile
+.. autoclass:: DevicePeaks
+.. autofunction:: measure_device_peaks
+.. autoclass:: TrackingMemoryPool
 """
 
 
@@ -70,12 +78,79 @@ class ProfileEvent:
     cl_event: cl._cl.Event
     program: lp.kernel.LoopKernel
     args_tuple: tuple
+    region: Optional[str] = None
+
+
+_kernel_stats_cache = None
+
+
+def _get_kernel_stats_cache():
+    global _kernel_stats_cache
+    if _kernel_stats_cache is None:
+        from pytools.persistent_dict import WriteOncePersistentDict
+        from loopy.tools import LoopyKeyBuilder
+        _kernel_stats_cache = WriteOncePersistentDict(
+            "mirgecom-profiling-kernel-stats-v1",
+            key_builder=LoopyKeyBuilder())
+    return _kernel_stats_cache
+
+
+class _KernelProfileAccumulator:
+    """Accumulates the profiling results of all executions of a kernel."""
+
+    def __init__(self):
+        self.num_calls = 0
+        self.time = StatisticsAccumulator(scale_factor=1e-9)
+        self.flops = StatisticsAccumulator(scale_factor=1e-9)
+        self.bytes_accessed = StatisticsAccumulator(scale_factor=1e-9)
+        self.footprint_bytes = StatisticsAccumulator(scale_factor=1e-9)
+
+        # Flops/ns and bytes/ns, i.e. GFlops/s and GByte/s, no need to scale
+        self.flops_per_sec = StatisticsAccumulator()
+        self.bandwidth_access = StatisticsAccumulator()
+
+    def add_result(self, result: SingleCallKernelProfile) -> None:
+        self.num_calls += 1
+        self.time.add_value(result.time)
+        self.flops.add_value(result.flops)
+        self.bytes_accessed.add_value(result.bytes_accessed)
+        self.footprint_bytes.add_value(result.footprint_bytes)
+
+        if result.time > 0:
+            self.flops_per_sec.add_value(result.flops/result.time)
+            self.bandwidth_access.add_value(result.bytes_accessed/result.time)
 
 
 class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
     """An array context that profiles kernel executions.
 
+    Profile events of kernels that have not been collected yet are kept in a
+    buffer of at most *max_pending_events* entries. Events of completed
+    kernels are collected every *harvest_interval* kernel launches without
+    waiting for the device; only when the buffer is full does the array
+    context wait for the oldest kernel to complete. The collected results are
+    accumulated per kernel, so that memory use does not grow with the number
+    of kernel executions.
+
+    The flop and byte counts of each loopy kernel are determined by an analysis
+    of the kernel the first time it is called with arguments of a given shape.
+    If *use_persistent_stats_cache* is *True*, the results of this analysis
+    are stored in a persistent on-disk cache (in the same location as the
+    kernel caches of :mod:`loopy`), so that they are computed only once across
+    runs and across the ranks that share a cache directory.
+
+    The statistics are not computed on one rank and broadcast to the others,
+    since ranks may launch different sets of kernels (such as those for
+    boundaries that only some partitions have), which would make a broadcast
+    per kernel deadlock. Instead, a rank whose lookup misses computes them
+    itself. To compute them only once per node, evaluate the operators once
+    with this array context on a serial mesh inside
+    :func:`mirgecom.mpi.leader_rank_first` before the simulation, as
+    :mod:`mirgecom.warmup` does for the compiled kernels.
+
     .. automethod:: tabulate_profiling_data
+    .. automethod:: tabulate_roofline
+    .. automethod:: write_roofline
     .. automethod:: call_loopy
     .. automethod:: get_profiling_data_for_kernel
     .. automethod:: reset_profiling_data_for_kernel
@@ -83,7 +158,10 @@ class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
     Inherits from :class:`meshmode.array_context.PyOpenCLArrayContext`.
     """
 
-    def __init__(self, queue, allocator=None, logmgr: LogManager = None) -> None:
+    def __init__(self, queue, allocator=None, logmgr: LogManager = None,
+                 max_pending_events: int = 4096,
+                 harvest_interval: int = 256,
+                 use_persistent_stats_cache: bool = True) -> None:
         super().__init__(queue, allocator)
 
         if not queue.properties & cl.command_queue_properties.PROFILING_ENABLE:
@@ -91,21 +169,26 @@ class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
                  "Please create the queue with "
                  "cl.command_queue_properties.PROFILING_ENABLE.")
 
-        # list of ProfileEvents that haven't been transferred to profiled results yet
-        self.profile_events = []
+        # queue of ProfileEvents that haven't been transferred to profiled
+        # results yet, oldest first
+        self.profile_events = deque()
+        self.max_pending_events = max_pending_events
+        self.harvest_interval = harvest_interval
+        self._num_launches = 0
 
-        # dict of kernel name -> SingleCallKernelProfile results
+        # dict of kernel name -> _KernelProfileAccumulator
         self.profile_results = {}
 
         # dict of (Kernel, args_tuple) -> calculated number of flops, bytes
         self.kernel_stats = {}
+        self.use_persistent_stats_cache = use_persistent_stats_cache
         self.logmgr = logmgr
 
         cl.array.ARRAY_KERNEL_EXEC_HOOK = self.array_kernel_exec_hook
 
     def __del__(self):
         """Release resources and undo monkey patching."""
-        del self.profile_events[:]
+        self.profile_events.clear()
         self.profile_results.clear()
         self.kernel_stats.clear()
 
@@ -137,61 +220,162 @@ class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
         if self.logmgr and f"{name}_time" not in self.logmgr.quantity_data:
             self.logmgr.add_quantity(KernelProfile(self, name))
 
-        self.profile_events.append(ProfileEvent(evt, knl, args_tuple))
+        self._add_profile_event(ProfileEvent(evt, knl, args_tuple,
+                                             current_region_path()))
 
         return evt
 
+    def _add_profile_event(self, pevt: ProfileEvent) -> None:
+        self.profile_events.append(pevt)
+        self._num_launches += 1
+
+        if len(self.profile_events) >= self.max_pending_events:
+            # Make room by waiting for the oldest kernel
+            self.profile_events[0].cl_event.wait()
+            self._harvest_profile_events()
+        elif self._num_launches % self.harvest_interval == 0:
+            self._harvest_profile_events()
+
+    def _transfer_profile_event(self, pevt: ProfileEvent, region_timer) -> None:
+        program = pevt.program
+        if hasattr(program, "name"):
+            name = program.name
+        else:
+            name = program.function_name
+        r = self._get_kernel_stats(program, pevt.args_tuple)
+        time = pevt.cl_event.profile.end - pevt.cl_event.profile.start
+
+        new = SingleCallKernelProfile(time, r.flops, r.bytes_accessed,
+                                      r.footprint_bytes)
+
+        self.profile_results.setdefault(name, _KernelProfileAccumulator()) \
+            .add_result(new)
+
+        if region_timer is not None:
+            region_timer.add_device_time(pevt.region, time*1e-9)
+
+    def _harvest_profile_events(self) -> None:
+        """Collect the events of completed kernels without waiting."""
+        region_timer = get_region_timer()
+        complete = cl.command_execution_status.COMPLETE
+
+        # Kernels complete in launch order on an in-order queue, so stop at the
+        # first one that is still running
+        while self.profile_events:
+            pevt = self.profile_events[0]
+            if pevt.cl_event.command_execution_status > complete:
+                break
+            self.profile_events.popleft()
+            self._transfer_profile_event(pevt, region_timer)
+
     def _wait_and_transfer_profile_events(self) -> None:
         # First, wait for completion of all events
         if self.profile_events:
             cl.wait_for_events([pevt.cl_event for pevt in self.profile_events])
 
-        # Then, collect all events and store them
-        for t in self.profile_events:
-            program = t.program
-            if hasattr(program, "name"):
-                name = program.name
-            else:
-                name = program.function_name
-            r = self._get_kernel_stats(program, t.args_tuple)
-            time = t.cl_event.profile.end - t.cl_event.profile.start
-
-            new = SingleCallKernelProfile(time, r.flops, r.bytes_accessed,
-                                          r.footprint_bytes)
+        region_timer = get_region_timer()
 
-            self.profile_results.setdefault(name, []).append(new)
-
-        self.profile_events = []
+        # Then, collect all events and store them
+        while self.profile_events:
+            self._transfer_profile_event(self.profile_events.popleft(),
+                                         region_timer)
 
     def get_profiling_data_for_kernel(self, kernel_name: str) \
           -> MultiCallKernelProfile:
         """Return profiling data for kernel `kernel_name`."""
         self._wait_and_transfer_profile_events()
 
-        time = StatisticsAccumulator(scale_factor=1e-9)
-        gflops = StatisticsAccumulator(scale_factor=1e-9)
-        gbytes_accessed = StatisticsAccumulator(scale_factor=1e-9)
-        fprint_gbytes = StatisticsAccumulator(scale_factor=1e-9)
-        num_calls = 0
-
-        if kernel_name in self.profile_results:
-            knl_results = self.profile_results[kernel_name]
-
-            num_calls = len(knl_results)
+        r = self.profile_results.get(kernel_name, _KernelProfileAccumulator())
 
-            for r in knl_results:
-                time.add_value(r.time)
-                gflops.add_value(r.flops)
-                gbytes_accessed.add_value(r.bytes_accessed)
-                fprint_gbytes.add_value(r.footprint_bytes)
-
-        return MultiCallKernelProfile(num_calls, time, gflops, gbytes_accessed,
-                                      fprint_gbytes)
+        return MultiCallKernelProfile(r.num_calls, r.time, r.flops,
+                                      r.bytes_accessed, r.footprint_bytes)
 
     def reset_profiling_data_for_kernel(self, kernel_name: str) -> None:
         """Reset profiling data for kernel `kernel_name`."""
         self.profile_results.pop(kernel_name, None)
 
+    def _roofline_rows(self, peaks: "DevicePeaks") -> list:
+        """Return a list with a :class:`dict` of roofline metrics per kernel."""
+        self._wait_and_transfer_profile_events()
+
+        rows = []
+        for knl, r in self.profile_results.items():
+            time = r.time.sum()
+            gflops = r.flops.sum()
+            gbytes = r.bytes_accessed.sum()
+
+            if not time or not gflops or not gbytes:
+                continue
+
+            intensity = gflops / gbytes
+            achieved = gflops / time
+            attainable = min(peaks.flops, intensity * peaks.bandwidth)
+
+            rows.append({
+                "kernel": knl,
+                "num_calls": r.num_calls,
+                "time": time,
+                "intensity": intensity,
+                "gflops_per_sec": achieved,
+                "gbytes_per_sec": gbytes / time,
+                "attainable_gflops_per_sec": attainable,
+                "percent_of_attainable": 100 * achieved / attainable,
+                "bound": ("memory" if intensity * peaks.bandwidth < peaks.flops
+                          else "compute"),
+                })
+
+        # Kernels with the most time first
+        return sorted(rows, key=lambda row: -row["time"])
+
+    def tabulate_roofline(self, peaks: "DevicePeaks") -> pytools.Table:
+        """Return a :class:`pytools.Table` placing each kernel on a roofline.
+
+        For each kernel with a nonzero number of flops, the table shows its
+        arithmetic intensity (flops/byte), its achieved flop rate, the flop rate
+        attainable at this intensity according to the device *peaks* (see
+        :func:`measure_device_peaks`), the achieved percentage of the
+        attainable rate, and whether the kernel is memory or compute bound.
+        """
+        g = ".4g"
+
+        tbl = pytools.Table()
+        tbl.add_row(["Function", "Calls", "Time_sum [s]",
+                     "Intensity (flops/byte)", "GFlops/s", "GByte/s",
+                     "Attainable GFlops/s", "% of attainable", "Bound"])
+
+        for row in self._roofline_rows(peaks):
+            tbl.add_row([row["kernel"], row["num_calls"], f"{row['time']:{g}}",
+                         f"{row['intensity']:{g}}", f"{row['gflops_per_sec']:{g}}",
+                         f"{row['gbytes_per_sec']:{g}}",
+                         f"{row['attainable_gflops_per_sec']:{g}}",
+                         f"{row['percent_of_attainable']:.1f}", row["bound"]])
+
+        return tbl
+
+    def write_roofline(self, peaks: "DevicePeaks", filename: str) -> None:
+        """Write the roofline metrics of :meth:`tabulate_roofline` to *filename*.
+
+        Writes JSON (including the device *peaks*) if *filename* ends with
+        ``.json``, and CSV otherwise.
+        """
+        rows = self._roofline_rows(peaks)
+
+        if filename.endswith(".json"):
+            import json
+            from dataclasses import asdict
+            with open(filename, "w") as outf:
+                json.dump({"peaks": asdict(peaks), "kernels": rows}, outf)
+        else:
+            import csv
+            fieldnames = ["kernel", "num_calls", "time", "intensity",
+                          "gflops_per_sec", "gbytes_per_sec",
+                          "attainable_gflops_per_sec", "percent_of_attainable",
+                          "bound"]
+            with open(filename, "w", newline="") as outf:
+                writer = csv.DictWriter(outf, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(rows)
+
     def tabulate_profiling_data(self) -> pytools.Table:
         """Return a :class:`pytools.Table` with the profiling results."""
         self._wait_and_transfer_profile_events()
@@ -201,6 +385,7 @@ class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
         # Table header
         tbl.add_row(["Function", "Calls",
             "Time_sum [s]", "Time_min [s]", "Time_avg [s]", "Time_max [s]",
+            "Time_p50 [s]", "Time_p99 [s]", "Time_std [s]",
             "GFlops/s_min", "GFlops/s_avg", "GFlops/s_max",
             "BWAcc_min [GByte/s]", "BWAcc_mean [GByte/s]", "BWAcc_max [GByte/s]",
             "BWFoot_min [GByte/s]", "BWFoot_mean [GByte/s]", "BWFoot_max [GByte/s]",
@@ -216,15 +401,9 @@ class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
             r = self.get_profiling_data_for_kernel(knl)
 
             # Extra statistics that are derived from the main values returned by
-            # self.get_profiling_data_for_kernel(). These are already GFlops/s and
-            # GBytes/s respectively, so no need to scale them.
-            flops_per_sec = StatisticsAccumulator()
-            bandwidth_access = StatisticsAccumulator()
-
-            knl_results = self.profile_results[knl]
-            for knl_res in knl_results:
-                flops_per_sec.add_value(knl_res.flops/knl_res.time)
-                bandwidth_access.add_value(knl_res.bytes_accessed/knl_res.time)
+            # self.get_profiling_data_for_kernel()
+            flops_per_sec = self.profile_results[knl].flops_per_sec
+            bandwidth_access = self.profile_results[knl].bandwidth_access
 
             total_calls += r.num_calls
 
@@ -234,6 +413,9 @@ class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
             time_min = f"{r.time.min():{g}}"
             time_avg = f"{r.time.mean():{g}}"
             time_max = f"{r.time.max():{g}}"
+            time_p50 = f"{r.time.percentile(50):{g}}"
+            time_p99 = f"{r.time.percentile(99):{g}}"
+            time_std = f"{r.time.std():{g}}"
 
             if r.footprint_bytes.sum() is not None:
                 fprint_mean = f"{r.footprint_bytes.mean():{g}}"
@@ -244,7 +426,7 @@ class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
                 fprint_min = "--"
                 fprint_max = "--"
 
-            if r.flops.sum() > 0:
+            if r.flops.sum() > 0 and flops_per_sec.num_values > 0:
                 bytes_per_flop_mean = f"{r.bytes_accessed.sum() / r.flops.sum():{g}}"
                 flops_per_sec_min = f"{flops_per_sec.min():{g}}"
                 flops_per_sec_mean = f"{flops_per_sec.mean():{g}}"
@@ -255,18 +437,23 @@ class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
                 flops_per_sec_mean = "--"
                 flops_per_sec_max = "--"
 
-            bandwidth_access_min = f"{bandwidth_access.min():{g}}"
-            bandwidth_access_mean = f"{bandwidth_access.sum():{g}}"
-            bandwidth_access_max = f"{bandwidth_access.max():{g}}"
+            if bandwidth_access.num_values > 0:
+                bandwidth_access_min = f"{bandwidth_access.min():{g}}"
+                bandwidth_access_mean = f"{bandwidth_access.mean():{g}}"
+                bandwidth_access_max = f"{bandwidth_access.max():{g}}"
+            else:
+                bandwidth_access_min = "--"
+                bandwidth_access_mean = "--"
+                bandwidth_access_max = "--"
 
             tbl.add_row([knl, r.num_calls, time_sum,
-                time_min, time_avg, time_max,
+                time_min, time_avg, time_max, time_p50, time_p99, time_std,
                 flops_per_sec_min, flops_per_sec_mean, flops_per_sec_max,
                 bandwidth_access_min, bandwidth_access_mean, bandwidth_access_max,
                 fprint_min, fprint_mean, fprint_max,
                 bytes_per_flop_mean])
 
-        tbl.add_row(["Total", total_calls, f"{total_time:{g}}"] + ["--"] * 13)
+        tbl.add_row(["Total", total_calls, f"{total_time:{g}}"] + ["--"] * 16)
 
         return tbl
 
@@ -274,6 +461,64 @@ class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
       -> SingleCallKernelProfile:
         return self.kernel_stats[program][args_tuple]
 
+    def _compute_kernel_stats(self, program: lp.kernel.LoopKernel,
+                              kwargs: dict) -> SingleCallKernelProfile:
+        """Calculate the flops and bytes of a program with its args."""
+        executor = program.target.get_kernel_executor(program, self.queue)
+        info = executor.kernel_info(executor.arg_to_dtype_set(kwargs))
+
+        kernel = executor.get_typed_and_scheduled_kernel(
+            executor.arg_to_dtype_set(kwargs))
+
+        idi = info.implemented_data_info
+
+        types = {k: v for k, v in kwargs.items()
+            if hasattr(v, "dtype") and not v.dtype == object}
+
+        param_dict = kwargs.copy()
+        param_dict.update({k: None for k in kernel.arg_dict.keys()
+            if k not in param_dict})
+
+        param_dict.update(
+            {d.name: None for d in idi if d.name not in param_dict})
+
+        # Generate the wrapper code
+        wrapper = executor.get_wrapper_generator()
+
+        gen = PythonFunctionGenerator("_mcom_gen_args_profile", list(param_dict))
+
+        wrapper.generate_integer_arg_finding_from_shapes(gen, kernel, idi)
+        wrapper.generate_integer_arg_finding_from_offsets(gen, kernel, idi)
+        wrapper.generate_integer_arg_finding_from_strides(gen, kernel, idi)
+
+        param_names = program.all_params()
+        gen("return {%s}" % ", ".join(
+            f"{repr(name)}: {name}" for name in param_names))
+
+        # Run the wrapper code, save argument values in domain_params
+        domain_params = gen.get_picklable_function()(**param_dict)
+
+        # Get flops/memory statistics
+        kernel = lp.add_and_infer_dtypes(kernel, types)
+        op_map = lp.get_op_map(kernel, subgroup_size="guess")
+        bytes_accessed = lp.get_mem_access_map(kernel, subgroup_size="guess") \
+          .to_bytes().eval_and_sum(domain_params)
+
+        flops = op_map.filter_by(dtype=[np.float32, np.float64]).eval_and_sum(
+            domain_params)
+
+        try:
+            footprint = lp.gather_access_footprint_bytes(kernel)
+            footprint_bytes = sum(footprint[k].eval_with_dict(domain_params)
+                for k in footprint)
+
+        except lp.symbolic.UnableToDetermineAccessRange:
+            footprint_bytes = None
+
+        return SingleCallKernelProfile(
+            time=0, flops=flops, bytes_accessed=bytes_accessed,
+            footprint_bytes=footprint_bytes)
+
     def _cache_kernel_stats(self, program: lp.kernel.LoopKernel, kwargs: dict) \
       -> tuple:
         """Generate the kernel stats for a program with its args."""
@@ -286,81 +531,492 @@ class PyOpenCLProfilingArrayContext(PyOpenCLArrayContext):
             self.kernel_stats[program][args_tuple]
             return args_tuple
         except KeyError:
-            # If not, calculate and cache the stats
-            executor = program.target.get_kernel_executor(program, self.queue)
-            info = executor.kernel_info(executor.arg_to_dtype_set(kwargs))
+            pass
+
+        # If not, look them up in the persistent cache, or calculate them
+        res = None
+        dtypes = tuple((key, str(value.dtype)) for key, value in kwargs.items()
+                       if hasattr(value, "dtype"))
+        key = (program, args_tuple, dtypes)
+        cache = _get_kernel_stats_cache() \
+            if self.use_persistent_stats_cache else None
+
+        if cache is not None:
+            from pytools.persistent_dict import NoSuchEntryError
+            try:
+                res = cache.fetch(key)
+            except NoSuchEntryError:
+                pass
+            except TypeError:
+                # Some argument value cannot be hashed persistently
+                cache = None
 
-            kernel = executor.get_typed_and_scheduled_kernel(
-                executor.arg_to_dtype_set(kwargs))
+        if res is None:
+            res = self._compute_kernel_stats(program, kwargs)
+            if cache is not None:
+                cache.store_if_not_present(key, res)
 
-            idi = info.implemented_data_info
+        self.kernel_stats.setdefault(program, {})[args_tuple] = res
 
-            types = {k: v for k, v in kwargs.items()
-                if hasattr(v, "dtype") and not v.dtype == object}
+        if self.logmgr:
+            if f"{program.name}_time" not in self.logmgr.quantity_data:
+                self.logmgr.add_quantity(KernelProfile(self, program.name))
 
-            param_dict = kwargs.copy()
-            param_dict.update({k: None for k in kernel.arg_dict.keys()
-                if k not in param_dict})
+        return args_tuple
 
-            param_dict.update(
-                {d.name: None for d in idi if d.name not in param_dict})
+    def call_loopy(self, program, **kwargs) -> dict:
+        """Execute the loopy kernel and profile it."""
+        program = self.transform_loopy_program(program)
+        assert program.options.return_dict
+        assert program.options.no_numpy
 
-            # Generate the wrapper code
-            wrapper = executor.get_wrapper_generator()
+        evt, result = program(self.queue, **kwargs, allocator=self.allocator)
 
-            gen = PythonFunctionGenerator("_mcom_gen_args_profile", list(param_dict))
+        # Generate the stats here so we don't need to carry around the kwargs
+        args_tuple = self._cache_kernel_stats(program, kwargs)
 
-            wrapper.generate_integer_arg_finding_from_shapes(gen, kernel, idi)
-            wrapper.generate_integer_arg_finding_from_offsets(gen, kernel, idi)
-            wrapper.generate_integer_arg_finding_from_strides(gen, kernel, idi)
+        self._add_profile_event(ProfileEvent(evt, program, args_tuple,
+                                             current_region_path()))
 
-            param_names = program.all_params()
-            gen("return {%s}" % ", ".join(
-                f"{repr(name)}: {name}" for name in param_names))
+        return result
 
-            # Run the wrapper code, save argument values in domain_params
-            domain_params = gen.get_picklable_function()(**param_dict)
 
-            # Get flops/memory statistics
-            kernel = lp.add_and_infer_dtypes(kernel, types)
-            op_map = lp.get_op_map(kernel, subgroup_size="guess")
-            bytes_accessed = lp.get_mem_access_map(kernel, subgroup_size="guess") \
-              .to_bytes().eval_and_sum(domain_params)
+# {{{ cross-rank profile
 
-            flops = op_map.filter_by(dtype=[np.float32, np.float64]).eval_and_sum(
-                domain_params)
+@dataclass
+class CrossRankProfile:
+    """Per-rank timings of kernels and regions, gathered from all ranks.
 
-            try:
-                footprint = lp.gather_access_footprint_bytes(kernel)
-                footprint_bytes = sum(footprint[k].eval_with_dict(domain_params)
-                    for k in footprint)
+    Created by :func:`gather_cross_rank_profile`.
 
-            except lp.symbolic.UnableToDetermineAccessRange:
-                footprint_bytes = None
+    .. attribute:: ranks
 
-            res = SingleCallKernelProfile(
-                time=0, flops=flops, bytes_accessed=bytes_accessed,
-                footprint_bytes=footprint_bytes)
+        A list with a :class:`dict` per rank, containing the rank's ``rank``,
+        the number of its mesh ``partition``, the ``hostname`` of its node,
+        and the number of elements (``nelements``) of its partition. The
+        partition and number of elements are *None* if unknown.
 
-            self.kernel_stats.setdefault(program, {})[args_tuple] = res
+    .. attribute:: kernel_times
 
-            if self.logmgr:
-                if f"{program.name}_time" not in self.logmgr.quantity_data:
-                    self.logmgr.add_quantity(KernelProfile(self, program.name))
+        A :class:`dict` mapping kernel names to :class:`numpy.ndarray` of the
+        total time (in seconds) spent in the kernel by each rank.
 
-            return args_tuple
+    .. attribute:: region_times
 
-    def call_loopy(self, program, **kwargs) -> dict:
-        """Execute the loopy kernel and profile it."""
-        program = self.transform_loopy_program(program)
-        assert program.options.return_dict
-        assert program.options.no_numpy
+        A :class:`dict` mapping region paths (see :mod:`mirgecom.timing`) to
+        :class:`numpy.ndarray` of the total time (in seconds) spent in the
+        region by each rank.
 
-        evt, result = program(self.queue, **kwargs, allocator=self.allocator)
+    .. automethod:: tabulate_kernels
+    .. automethod:: tabulate_regions
+    .. automethod:: tabulate_ranks
+    .. automethod:: write_json
+    """
 
-        # Generate the stats here so we don't need to carry around the kwargs
-        args_tuple = self._cache_kernel_stats(program, kwargs)
+    ranks: list
+    kernel_times: dict
+    region_times: dict
 
-        self.profile_events.append(ProfileEvent(evt, program, args_tuple))
+    def _tabulate(self, label: str, times: dict, num_slowest: int) \
+          -> pytools.Table:
+        g = ".4g"
 
+        tbl = pytools.Table()
+        tbl.add_row([label, "Time_min [s]", "Time_mean [s]", "Time_max [s]",
+                     "Imbalance", "Slowest ranks"])
+
+        # Most imbalanced (in absolute terms) first
+        for name, rank_times in sorted(times.items(),
+                key=lambda item: -(item[1].max() - item[1].mean())):
+            mean = rank_times.mean()
+            imbalance = (rank_times.max() - mean) / mean if mean > 0 else 0
+            slowest = np.argsort(-rank_times, kind="stable")[:num_slowest]
+
+            tbl.add_row([name, f"{rank_times.min():{g}}", f"{mean:{g}}",
+                         f"{rank_times.max():{g}}", f"{imbalance:.3f}",
+                         ", ".join(str(rank) for rank in slowest)])
+
+        return tbl
+
+    def tabulate_kernels(self, num_slowest: int = 3) -> pytools.Table:
+        """Return a :class:`pytools.Table` with the kernel times over all ranks.
+
+        For each kernel, the table contains the minimum, mean, and maximum over
+        the ranks of the total time spent in the kernel, the imbalance
+        ``(max-mean)/mean``, and the *num_slowest* slowest ranks.
+        """
+        return self._tabulate("Function", self.kernel_times, num_slowest)
+
+    def tabulate_regions(self, num_slowest: int = 3) -> pytools.Table:
+        """Return a :class:`pytools.Table` with the region times over all ranks.
+
+        See :meth:`tabulate_kernels` for the contents of the table.
+        """
+        return self._tabulate("Region", self.region_times, num_slowest)
+
+    def tabulate_ranks(self) -> pytools.Table:
+        """Return a :class:`pytools.Table` with the partition and times per rank."""
+        g = ".4g"
+
+        tbl = pytools.Table()
+        tbl.add_row(["Rank", "Partition", "Host", "Elements",
+                     "Kernel time [s]", "Region time [s]"])
+
+        for info in self.ranks:
+            rank = info["rank"]
+            kernel_time = sum(t[rank] for t in self.kernel_times.values())
+            # Only count top-level regions, nested regions are included in them
+            region_time = sum(t[rank] for path, t in self.region_times.items()
+                              if "/" not in path)
+            tbl.add_row([rank,
+                         info["partition"] if info["partition"] is not None
+                         else "--",
+                         info["hostname"],
+                         info["nelements"] if info["nelements"] is not None
+                         else "--",
+                         f"{kernel_time:{g}}", f"{region_time:{g}}"])
+
+        return tbl
+
+    def write_json(self, filename: str) -> None:
+        """Write the per-rank information and timings to *filename* as JSON."""
+        import json
+
+        with open(filename, "w") as outf:
+            json.dump({
+                "ranks": self.ranks,
+                "kernel_times": {name: times.tolist()
+                                 for name, times in self.kernel_times.items()},
+                "region_times": {path: times.tolist()
+                                 for path, times in self.region_times.items()},
+                }, outf)
+
+
+def gather_cross_rank_profile(
+        comm, actx: PyOpenCLProfilingArrayContext = None, region_timer=None,
+        discr=None) -> Optional[CrossRankProfile]:
+    """Gather the kernel and region timings of all ranks of *comm* on rank 0.
+
+    Collective over *comm*. The total time per kernel is taken from the
+    profiling data of *actx*, and the total time per region from
+    *region_timer* (by default, the active
+    :class:`mirgecom.timing.RegionTimer`). Kernels or regions that did not
+    execute on a rank contribute a time of zero for that rank.
+
+    If *discr* is given, the number of its mesh partition and its number of
+    elements are recorded for each rank. :mod:`grudge` numbers the partitions by
+    the ranks of the discretization's communicator, which need not coincide
+    with the ranks of *comm*. Otherwise, the partition is recorded as *None*.
+
+    Returns
+    -------
+    CrossRankProfile
+        The gathered timings on rank 0, *None* on all other ranks.
+    """
+    from mpi4py import MPI
+
+    if region_timer is None:
+        region_timer = get_region_timer()
+
+    local_kernel_times = {}
+    if actx is not None:
+        actx._wait_and_transfer_profile_events()
+        for name in list(actx.profile_results):
+            time = actx.get_profiling_data_for_kernel(name).time.sum()
+            local_kernel_times[name] = time if time is not None else 0
+
+    local_region_times = {}
+    if region_timer is not None:
+        local_region_times = {
+            path: stats.sum()
+            for path, stats in region_timer.region_times.items()}
+
+    partition = None
+    nelements = None
+    if discr is not None:
+        nelements = discr.mesh.nelements
+        if discr.mpi_communicator is not None:
+            partition = discr.mpi_communicator.Get_rank()
+
+    rank = comm.Get_rank()
+    local_info = {
+        "rank": rank,
+        "partition": partition,
+        "hostname": MPI.Get_processor_name(),
+        "nelements": nelements,
+        }
+
+    gathered = comm.gather(
+        (local_info, local_kernel_times, local_region_times), root=0)
+
+    if rank != 0:
+        return None
+
+    nranks = len(gathered)
+
+    def to_arrays(index):
+        result = {}
+        for irank, data in enumerate(gathered):
+            for name, time in data[index].items():
+                result.setdefault(name, np.zeros(nranks))[irank] = time
         return result
+
+    return CrossRankProfile(
+        ranks=[info for info, _, _ in gathered],
+        kernel_times=to_arrays(1),
+        region_times=to_arrays(2))
+
+# }}}
+
+
+# {{{ device peaks
+
+@dataclass
+class DevicePeaks:
+    """Measured peak performance of an OpenCL device.
+
+    .. attribute:: device_name
+    .. attribute:: bandwidth
+
+        Achievable memory bandwidth (in GByte/s), measured with a STREAM triad.
+
+    .. attribute:: flops
+
+        Achievable floating point performance (in GFlops/s), measured with
+        independent chains of fused multiply-adds.
+    """
+
+    device_name: str
+    bandwidth: float
+    flops: float
+
+
+_PEAK_KERNELS = """
+#if __OPENCL_C_VERSION__ < 120
+#pragma OPENCL EXTENSION cl_khr_fp64: enable
+#endif
+
+__kernel void triad(__global double *a, __global const double *b,
+    __global const double *c, double s)
+{
+    size_t i = get_global_id(0);
+    a[i] = b[i] + s*c[i];
+}
+
+__kernel void fma_chains(__global double *out, double a, double b)
+{
+    double x0 = get_global_id(0) * 1e-9;
+    double x1 = x0 + 1, x2 = x0 + 2, x3 = x0 + 3;
+    double x4 = x0 + 4, x5 = x0 + 5, x6 = x0 + 6, x7 = x0 + 7;
+
+    for (int i = 0; i < NITER; ++i)
+    {
+        x0 = fma(x0, a, b); x1 = fma(x1, a, b);
+        x2 = fma(x2, a, b); x3 = fma(x3, a, b);
+        x4 = fma(x4, a, b); x5 = fma(x5, a, b);
+        x6 = fma(x6, a, b); x7 = fma(x7, a, b);
+    }
+
+    out[get_global_id(0)] = x0 + x1 + x2 + x3 + x4 + x5 + x6 + x7;
+}
+"""
+
+
+def measure_device_peaks(queue: cl.CommandQueue, nbytes: int = 2**28,
+                         fma_iterations: int = 4096,
+                         ntrials: int = 5) -> DevicePeaks:
+    """Measure the achievable bandwidth and flop rate of the device of *queue*.
+
+    The bandwidth is measured with a STREAM triad on three arrays of
+    *nbytes* bytes of double precision values each, and the flop rate with
+    *fma_iterations* fused multiply-adds on eight independent chains per
+    work item. Each measurement is the best of *ntrials* runs, timed with
+    OpenCL profiling events.
+
+    Returns
+    -------
+    DevicePeaks
+        The measured peaks, which can be passed to
+        :meth:`PyOpenCLProfilingArrayContext.tabulate_roofline`.
+    """
+    import pyopencl.array  # noqa: F401
+
+    if not queue.properties & cl.command_queue_properties.PROFILING_ENABLE:
+        queue = cl.CommandQueue(queue.context,
+            properties=cl.command_queue_properties.PROFILING_ENABLE)
+
+    prg = cl.Program(queue.context, _PEAK_KERNELS).build(
+        options=[f"-DNITER={fma_iterations}"])
+
+    def best_time(launch):
+        times = []
+        for _ in range(ntrials + 1):
+            evt = launch()
+            evt.wait()
+            times.append((evt.profile.end - evt.profile.start) * 1e-9)
+        # The first run is a warmup
+        return min(times[1:])
+
+    # {{{ bandwidth
+
+    n = nbytes // 8
+    a = cl.array.empty(queue, n, np.float64)
+    b = cl.array.zeros(queue, n, np.float64) + 1
+    c = cl.array.zeros(queue, n, np.float64) + 2
+
+    triad_time = best_time(
+        lambda: prg.triad(queue, (n,), None, a.data, b.data, c.data,
+                          np.float64(3)))
+    bandwidth = 3 * n * 8 / triad_time * 1e-9
+
+    # }}}
+
+    # {{{ flops
+
+    nitems = 64 * queue.device.max_compute_units * 1024
+    out = cl.array.empty(queue, nitems, np.float64)
+
+    fma_time = best_time(
+        lambda: prg.fma_chains(queue, (nitems,), None, out.data,
+                               np.float64(0.999999), np.float64(1e-6)))
+    flops = nitems * fma_iterations * 8 * 2 / fma_time * 1e-9
+
+    # }}}
+
+    return DevicePeaks(device_name=queue.device.name, bandwidth=bandwidth,
+                       flops=flops)
+
+# }}}
+
+
+# {{{ memory pool tracking
+
+class TrackingMemoryPool:
+    """An allocator that tracks the device memory use of a memory pool.
+
+    Wraps a :class:`pyopencl.tools.MemoryPool` and can be used in its place as
+    the allocator of an array context::
+
+        allocator = TrackingMemoryPool(
+            cl_tools.MemoryPool(cl_tools.ImmediateAllocator(queue)))
+        actx = PyOpenCLArrayContext(queue, allocator=allocator)
+
+    Sizes are those of the pool's blocks, which may be larger than the
+    requested sizes. An allocation is a miss if the pool had no suitable held
+    block and had to allocate a new one. Peak memory use is also recorded per
+    timing region (see :mod:`mirgecom.timing`), where the peak of a region
+    includes those of its nested regions.
+
+    .. attribute:: active_bytes
+
+        Bytes in blocks that are currently in use.
+
+    .. attribute:: held_bytes
+
+        Bytes in blocks that are held by the pool for reuse. The pool frees all
+        held blocks on its own when an allocation fails for lack of memory,
+        which is detected through the pool's count of held blocks.
+
+    .. attribute:: peak_active_bytes
+
+        Maximum of :attr:`active_bytes` since the creation of the tracker.
+
+    .. attribute:: interval_peak_active_bytes
+
+        Maximum of :attr:`active_bytes` since the last call of
+        :meth:`reset_interval_peak`.
+
+    .. attribute:: num_allocations
+    .. attribute:: num_misses
+    .. attribute:: region_peak_active_bytes
+
+        A :class:`dict` mapping region paths to the maximum of
+        :attr:`active_bytes` while the region was entered.
+
+    .. automethod:: reset_interval_peak
+    .. automethod:: free_held
+    .. automethod:: tabulate_region_peaks
+    """
+
+    def __init__(self, pool: "cl.tools.MemoryPool") -> None:
+        self.pool = pool
+
+        self.active_bytes = 0
+        self._held_bytes = 0
+        self.peak_active_bytes = 0
+        self.interval_peak_active_bytes = 0
+        self.num_allocations = 0
+        self.num_misses = 0
+        self.region_peak_active_bytes = {}
+
+    def __call__(self, nbytes: int):
+        """Allocate a buffer of *nbytes* from the pool."""
+        from weakref import finalize
+
+        held_blocks = self.pool.held_blocks
+        buf = self.pool(nbytes)
+        size = self.pool.alloc_size(self.pool.bin_number(nbytes))
+
+        self.num_allocations += 1
+        if self.pool.held_blocks == held_blocks - 1:
+            # Reused a held block
+            self._held_bytes -= size
+        else:
+            # The pool allocated a new block, possibly after freeing all held
+            # blocks to make room for it
+            self.num_misses += 1
+
+        if self.pool.held_blocks == 0:
+            self._held_bytes = 0
+
+        self.active_bytes += size
+        self.peak_active_bytes = max(self.peak_active_bytes, self.active_bytes)
+        self.interval_peak_active_bytes = max(self.interval_peak_active_bytes,
+                                              self.active_bytes)
+
+        path = current_region_path()
+        while path is not None:
+            peaks = self.region_peak_active_bytes
+            peaks[path] = max(peaks.get(path, 0), self.active_bytes)
+            path = path.rsplit("/", 1)[0] if "/" in path else None
+
+        finalize(buf, self._release, size)
+
+        return buf
+
+    @property
+    def held_bytes(self) -> int:
+        """Bytes in blocks that are held by the pool for reuse."""
+        if self.pool.held_blocks == 0:
+            # The pool freed its held blocks without going through free_held
+            self._held_bytes = 0
+        return self._held_bytes
+
+    def _release(self, size: int) -> None:
+        # The pool keeps the block for reuse. This runs before the block is
+        # returned to the pool, so the pool's held blocks cannot be checked here.
+        self.active_bytes -= size
+        self._held_bytes += size
+
+    def reset_interval_peak(self) -> None:
+        """Start a new interval for :attr:`interval_peak_active_bytes`."""
+        self.interval_peak_active_bytes = self.active_bytes
+
+    def free_held(self) -> None:
+        """Release the blocks held by the pool."""
+        self.pool.free_held()
+        self._held_bytes = 0
+
+    def tabulate_region_peaks(self) -> pytools.Table:
+        """Return a :class:`pytools.Table` with the peak memory use per region."""
+        tbl = pytools.Table()
+        tbl.add_row(["Region", "Peak active [MByte]"])
+
+        for path, peak in sorted(self.region_peak_active_bytes.items()):
+            tbl.add_row([path, f"{peak / 1024 / 1024:.4g}"])
+
+        tbl.add_row(["Total", f"{self.peak_active_bytes / 1024 / 1024:.4g}"])
+
+        return tbl
+
+# }}}
@@ -34,11 +34,12 @@ THE SOFTWARE.
 import logging
 
 import numpy as np
-from meshmode.dof_array import thaw
 from mirgecom.io import make_status_message
 from mirgecom.euler import (
     get_inviscid_timestep,
 )
+from mirgecom.geometry import get_geometry
+from mirgecom.timing import timed_region
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +92,7 @@ class ExactSolutionMismatch(Exception):
         self.state = state
 
 
+@timed_region("sim_checkpoint")
 def sim_checkpoint(discr, visualizer, eos, q, vizname, exact_soln=None,
                    step=0, t=0, dt=0, cfl=1.0, nstatus=-1, nviz=-1, exittol=1e-16,
                    constant_cfl=False, comm=None, viz_fields=None, overwrite=False,
@@ -111,12 +113,13 @@ def sim_checkpoint(discr, visualizer, eos, q, vizname, exact_soln=None,
 
     maxerr = 0.0
     if exact_soln is not None:
-        actx = cv.mass.array_context
-        nodes = thaw(actx, discr.nodes())
-        expected_state = exact_soln(x_vec=nodes, t=t, eos=eos)
-        exp_resid = q - expected_state
-        err_norms = [discr.norm(v, np.inf) for v in exp_resid]
-        maxerr = max(err_norms)
+        with timed_region("exact_solution_error"):
+            actx = cv.mass.array_context
+            nodes = get_geometry(discr, actx).nodes()
+            expected_state = exact_soln(x_vec=nodes, t=t, eos=eos)
+            exp_resid = q - expected_state
+            err_norms = [discr.norm(v, np.inf) for v in exp_resid]
+            maxerr = max(err_norms)
 
     if do_viz:
         io_fields = [
@@ -141,7 +144,7 @@ def sim_checkpoint(discr, visualizer, eos, q, vizname, exact_soln=None,
         else:
             ctm = nullcontext()
 
-        with ctm:
+        with ctm, timed_region("visualization"):
             visualizer.write_parallel_vtk_file(comm, rank_fn, io_fields,
                 overwrite=overwrite, par_manifest_filename=make_par_fname(
                     basename=vizname, step=step, t=t))
@@ -150,8 +153,9 @@ def sim_checkpoint(discr, visualizer, eos, q, vizname, exact_soln=None,
         #        if constant_cfl is False:
         #            current_cfl = get_inviscid_cfl(discr=discr, q=q,
         #                                           eos=eos, dt=dt)
-        statusmesg = make_status_message(discr=discr, t=t, step=step, dt=dt,
-                                         cfl=cfl, dependent_vars=dependent_vars)
+        with timed_region("status"):
+            statusmesg = make_status_message(discr=discr, t=t, step=step, dt=dt,
+                                             cfl=cfl, dependent_vars=dependent_vars)
         if exact_soln is not None:
             statusmesg += (
                 "\n------- errors="
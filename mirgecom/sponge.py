@@ -0,0 +1,174 @@
+r""":mod:`mirgecom.sponge` provides an absorbing sponge-layer source term.
+
+A sponge layer damps outgoing waves before they reach the domain boundary by
+relaxing the state $\mathbf{q}$ towards a target state $\mathbf{q}_t$,
+
+.. math::
+
+    \partial_t \mathbf{q} = \ldots + \sigma(\mathbf{x})(\mathbf{q}_t - \mathbf{q}),
+
+where the damping weight $\sigma$ vanishes in the region of interest and grows
+smoothly inside the layer. The weight is computed once, for example with
+:func:`box_sponge_weight`, and the source term is evaluated by one fused kernel
+per state component and element group::
+
+    sponge = SpongeSource(box_sponge_weight(nodes, inner_min=(-1, -1),
+                                            inner_max=(1, 1), thickness=0.5,
+                                            amplitude=100),
+                          target=Uniform(dim=2)(nodes))
+
+    def rhs(t, q):
+        return inviscid_operator(discr, eos=eos, boundaries=boundaries, q=q, t=t)
+
+    rhs = add_sponge(rhs, sponge)
+
+.. autoclass:: SpongeSource
+.. autofunction:: box_sponge_weight
+.. autofunction:: add_sponge
+"""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from pytools import memoize_in
+from pytools.obj_array import make_obj_array
+from meshmode.array_context import make_loopy_program
+from meshmode.dof_array import DOFArray
+
+from mirgecom.euler import ConservedVars, join_conserved
+from mirgecom.timing import timed_region
+
+
+def _relax(actx, weight, target, q):
+    """Return ``weight*(target - q)`` for one component, one kernel per group."""
+    @memoize_in(actx, (_relax, "sponge_relaxation_prg"))
+    def prg():
+        return make_loopy_program(
+            "{[iel, idof]: 0 <= iel < nelements and 0 <= idof < ndofs}",
+            "result[iel, idof] = weight[iel, idof]"
+            " * (target[iel, idof] - q[iel, idof])",
+            name="sponge_relaxation")
+
+    return DOFArray(actx, tuple(
+        actx.call_loopy(prg(), weight=weight_i, target=target_i, q=q_i)["result"]
+        for weight_i, target_i, q_i in zip(weight, target, q)))
+
+
+class SpongeSource:
+    r"""Relaxation of the state towards a target state inside a sponge layer.
+
+    .. automethod:: __init__
+    .. automethod:: __call__
+    """
+
+    def __init__(self, weight, target):
+        r"""Set the damping weight and the target state.
+
+        Parameters
+        ----------
+        weight: meshmode.dof_array.DOFArray
+            the damping weight $\sigma$ (with units of inverse time), zero
+            outside of the sponge layer
+        target: Union[numpy.ndarray, mirgecom.euler.ConservedVars]
+            the state towards which the solution is relaxed, as a state vector
+            or as conserved variables
+        """
+        if isinstance(target, ConservedVars):
+            target = join_conserved(len(target.momentum), mass=target.mass,
+                energy=target.energy, momentum=target.momentum,
+                species_mass=target.species_mass)
+
+        self.weight = weight
+        self.target = target
+
+    @timed_region("sponge")
+    def __call__(self, q):
+        r"""Return the source term $\sigma(\mathbf{q}_t - \mathbf{q})$."""
+        actx = self.weight.array_context
+        return make_obj_array([
+            _relax(actx, self.weight, target_i, q_i)
+            for target_i, q_i in zip(self.target, q)])
+
+
+def box_sponge_weight(nodes, *, inner_min, inner_max, thickness, amplitude,
+                      exponent=2):
+    r"""Return a damping weight that vanishes inside an axis-aligned box.
+
+    Outside of the box $[\mathbf{a}, \mathbf{b}]$ given by *inner_min* and
+    *inner_max*, the weight grows with the distance $d$ from the box as
+    $A\,(d/\delta)^n$, where $A$ is *amplitude*, $\delta$ is *thickness*, and
+    $n$ is *exponent*, such that it reaches *amplitude* at a distance of
+    *thickness*. The distance is taken as the maximum over the coordinate
+    directions.
+
+    Parameters
+    ----------
+    nodes: numpy.ndarray
+        the nodes of the volume discretization
+    inner_min
+        the lower corner of the box containing the region of interest
+    inner_max
+        the upper corner of the box containing the region of interest
+    thickness: float
+        the thickness of the sponge layer
+    amplitude: float
+        the damping weight at the outer edge of the layer
+    exponent: float
+        the exponent of the weight profile
+
+    Returns
+    -------
+    meshmode.dof_array.DOFArray
+        the damping weight
+    """
+    actx = nodes[0].array_context
+
+    # Distance from the box, zero inside
+    distance = 0*nodes[0]
+    for x_i, a_i, b_i in zip(nodes, inner_min, inner_max):
+        distance = actx.np.maximum(distance,
+            actx.np.maximum(a_i - x_i, x_i - b_i))
+
+    return amplitude * (distance/thickness)**exponent
+
+
+def add_sponge(rhs, sponge):
+    """Return an RHS function that adds the source term *sponge* to *rhs*.
+
+    Parameters
+    ----------
+    rhs
+        a function with signature ``rhs(t, q)``
+    sponge: SpongeSource
+        the sponge source term
+
+    Returns
+    -------
+    callable
+        a function with signature ``rhs(t, q)``
+    """
+    def rhs_with_sponge(t, q):
+        return rhs(t, q) + sponge(q)
+
+    return rhs_with_sponge
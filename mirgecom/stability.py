@@ -0,0 +1,325 @@
+r""":mod:`mirgecom.stability` estimates stable timesteps from the spectrum.
+
+An explicit integrator applied to $\partial_t u = R(u)$ is stable if
+$\Delta t\,\lambda$ lies in the integrator's region of absolute stability for all
+eigenvalues $\lambda$ of the Jacobian of $R$. :func:`estimate_eigenvalues`
+approximates the eigenvalues of largest magnitude of the Jacobian by a few
+steps of the Arnoldi iteration, and :func:`stability_region_radius` computes how
+far the stability region of an integrator extends in a given direction of the
+complex plane. Together, they give the largest stable timestep via
+:func:`get_stable_timestep`::
+
+    dt = get_stable_timestep(discr, rhs, u, rk4_step,
+                             cache_key=("diffusion", alpha))
+
+By default, the direction of each estimated eigenvalue is taken into account,
+so that operators with eigenvalues near the imaginary axis (such as the wave
+operator) and near the negative real axis (such as the diffusion operator) are
+handled alike.
+
+.. autofunction:: estimate_eigenvalues
+.. autofunction:: estimate_spectral_radius
+.. autofunction:: stability_region_radius
+.. autofunction:: get_stable_timestep
+"""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+from functools import lru_cache
+from weakref import WeakKeyDictionary
+
+import numpy as np
+from meshmode.dof_array import DOFArray
+
+from mirgecom.timing import timed_region
+
+logger = logging.getLogger(__name__)
+
+
+# dict of discretization -> dict of cache key -> eigenvalue estimates
+_eigenvalue_estimates = WeakKeyDictionary()
+
+
+def _components(x):
+    """Return a list of the :class:`DOFArray` components of *x*."""
+    if isinstance(x, np.ndarray):
+        return [c for xi in x.flat for c in _components(xi)]
+    return [x]
+
+
+def _allreduce_sum(discr, local_values):
+    """Return the sum of the array *local_values* over all ranks."""
+    comm = discr.mpi_communicator
+    if comm is None:
+        return local_values
+
+    from mpi4py import MPI
+    return comm.allreduce(local_values, op=MPI.SUM)
+
+
+def _local_inner_product(discr, x, y):
+    """Return the $L^2$ inner product of *x* and *y* on the local part."""
+    # by polarization, in terms of the norm provided by the discretization
+    return sum(
+        (discr.norm(x_i + y_i, 2)**2 - discr.norm(x_i - y_i, 2)**2) / 4
+        for x_i, y_i in zip(_components(x), _components(y)))
+
+
+def _norm(discr, x):
+    """Return the $L^2$ norm of *x* over the whole (distributed) domain."""
+    local_norm_squared = sum(discr.norm(c, 2)**2 for c in _components(x))
+    return np.sqrt(_allreduce_sum(discr, np.array(local_norm_squared)))
+
+
+def _orthogonalize(discr, w, basis):
+    """Orthogonalize *w* against the orthonormal *basis*.
+
+    Uses classical Gram-Schmidt applied twice, which needs one reduction over
+    all ranks per pass and is as stable as the modified variant. Returns the
+    orthogonalized *w* and its coefficients in *basis*.
+    """
+    coefficients = np.zeros(len(basis))
+    for _ in range(2):
+        projections = _allreduce_sum(discr, np.array([
+            _local_inner_product(discr, w, v) for v in basis]))
+        for h, v in zip(projections, basis):
+            w = w - h*v
+        coefficients += projections
+    return w, coefficients
+
+
+def _random_like(x, rng):
+    """Return a field shaped like *x* with uniformly distributed random values."""
+    if isinstance(x, np.ndarray):
+        result = np.empty(x.shape, dtype=object)
+        for idx, xi in np.ndenumerate(x):
+            result[idx] = _random_like(xi, rng)
+        return result
+
+    actx = x.array_context
+    return DOFArray(actx, tuple(
+        actx.from_numpy(rng.uniform(-1., 1., size=ary.shape))
+        for ary in x))
+
+
+def estimate_eigenvalues(discr, rhs, state, t=0., *, niterations=12,
+                         rtol=1e-3, epsilon=1e-7, seed=0, cache_key=None):
+    r"""Estimate the eigenvalues of largest magnitude of the Jacobian of *rhs*.
+
+    Runs the Arnoldi iteration on the Jacobian of *rhs* at *state*, whose
+    action is approximated by a finite difference, and returns the eigenvalues
+    of the resulting Hessenberg matrix (the Ritz values). Unlike power
+    iteration, this also resolves pairs of complex conjugate eigenvalues, as
+    those of the wave operator with upwind fluxes. Each iteration requires one
+    evaluation of *rhs* and stores one more vector the size of *state*. All
+    inner products are computed over the whole domain, so that all ranks
+    obtain the same estimates.
+
+    The Ritz values are neither upper nor lower bounds of the eigenvalues in
+    general, since the Jacobians of DG operators are not normal. The estimate
+    of the largest magnitude is usually accurate to a few percent after a few
+    iterations; :func:`get_stable_timestep` applies a safety factor to account
+    for the error.
+
+    Parameters
+    ----------
+    discr: grudge.eager.EagerDGDiscretization
+        the discretization of *state*
+    rhs
+        a function with signature ``rhs(t, state)``
+    state: Union[meshmode.dof_array.DOFArray, numpy.ndarray]
+        the state at which *rhs* is linearized
+    t: float
+        the time at which *rhs* is linearized
+    niterations: int
+        the maximum number of Arnoldi iterations
+    rtol: float
+        stop once the largest estimated magnitude changes by less than this
+        relative tolerance
+    epsilon: float
+        the relative size of the finite difference perturbation
+    seed: int
+        seed for the random initial vector (offset by the rank)
+    cache_key
+        if not *None*, the estimates are cached per discretization under this
+        key and returned on later calls with the same key. The key must be
+        hashable and identify the operator and its coefficients, e.g.
+        ``("diffusion", alpha)`` for a constant diffusivity *alpha*.
+
+    Returns
+    -------
+    numpy.ndarray
+        the complex eigenvalue estimates, in order of decreasing magnitude
+    """
+    if cache_key is not None:
+        discr_estimates = _eigenvalue_estimates.setdefault(discr, {})
+        if cache_key in discr_estimates:
+            return discr_estimates[cache_key]
+
+    comm = discr.mpi_communicator
+    rank = 0 if comm is None else comm.Get_rank()
+    rng = np.random.default_rng(seed + rank)
+
+    with timed_region("spectral_radius"):
+        rhs_state = rhs(t, state)
+        fd_step = epsilon * (1. + _norm(discr, state))
+
+        v = _random_like(state, rng)
+        basis = [v / _norm(discr, v)]
+        hessenberg = np.zeros((niterations + 1, niterations))
+
+        eigenvalues = np.zeros(1, dtype=np.complex128)
+        for j in range(niterations):
+            w = (rhs(t, state + fd_step*basis[j]) - rhs_state) / fd_step
+            w, hessenberg[:j+1, j] = _orthogonalize(discr, w, basis)
+            hessenberg[j+1, j] = _norm(discr, w)
+
+            radius = abs(eigenvalues[0])
+            eigenvalues = np.linalg.eigvals(hessenberg[:j+1, :j+1])
+            eigenvalues = eigenvalues[np.argsort(-abs(eigenvalues))]
+
+            new_radius = abs(eigenvalues[0])
+            if (j > 0 and abs(new_radius - radius) <= rtol*new_radius
+                    or hessenberg[j+1, j] <= 1e-12*new_radius):
+                # converged, or the Krylov space is invariant
+                break
+
+            basis.append(w / hessenberg[j+1, j])
+
+        logger.info("estimated spectral radius %g after %d iterations",
+                    abs(eigenvalues[0]), j+1)
+
+    if cache_key is not None:
+        discr_estimates[cache_key] = eigenvalues
+
+    return eigenvalues
+
+
+def estimate_spectral_radius(discr, rhs, state, t=0., **kwargs):
+    r"""Estimate the largest eigenvalue magnitude of the Jacobian of *rhs*.
+
+    Returns the largest magnitude of the eigenvalues estimated by
+    :func:`estimate_eigenvalues`, to which all arguments are passed.
+    """
+    return abs(estimate_eigenvalues(discr, rhs, state, t, **kwargs)[0])
+
+
+@lru_cache(maxsize=None)
+def stability_region_radius(integrator, eigenvalue_angle=np.pi, rtol=1e-8):
+    r"""Return the extent of the stability region of *integrator* along a ray.
+
+    Finds the largest $r$ such that the integrator is stable for
+    $z = r e^{i\theta}$, $\theta$ = *eigenvalue_angle*, i.e. that one step of
+    size 1 applied to $y' = zy$ satisfies $|y_1| \le |y_0|$.
+
+    Parameters
+    ----------
+    integrator
+        a time stepper with the signature of :func:`mirgecom.integrators.rk4_step`
+    eigenvalue_angle: float
+        the angle $\theta$ of the ray in the complex plane, e.g. $\pi$ for the
+        negative real axis and $\pi/2$ for the imaginary axis
+    rtol: float
+        the relative tolerance of the bisection
+
+    Returns
+    -------
+    float
+        the radius of the stability region along the ray, which is 0 if the
+        integrator is unstable for all nonzero $z$ on the ray
+    """
+    direction = np.exp(1j*eigenvalue_angle)
+
+    def is_stable(r):
+        z = r*direction
+        y = integrator(state=1.+0j, t=0., dt=1., rhs=lambda t, y: z*y)
+        return abs(y) <= 1.
+
+    # Find a stable point on the ray
+    lower = 0.125
+    while not is_stable(lower):
+        lower /= 2
+        if lower < 1e-6:
+            return 0.
+
+    # Find an unstable point on the ray
+    upper = 2*lower
+    while is_stable(upper):
+        lower = upper
+        upper *= 2
+        if upper > 1e3:
+            raise ValueError("stability region appears to be unbounded")
+
+    while upper - lower > rtol*upper:
+        middle = 0.5*(lower + upper)
+        if is_stable(middle):
+            lower = middle
+        else:
+            upper = middle
+
+    return lower
+
+
+def get_stable_timestep(discr, rhs, state, integrator, t=0., *,
+                        eigenvalue_angle=None, safety_factor=0.8,
+                        cache_key=None, **kwargs):
+    r"""Return the largest stable timestep of *integrator* for *rhs*.
+
+    Computes $\Delta t = s \min_\lambda r(\theta_\lambda)/|\lambda|$, where $s$
+    is *safety_factor*, $\lambda$ ranges over the eigenvalue estimates of the
+    Jacobian of *rhs* at *state* (see :func:`estimate_eigenvalues`, to which
+    *cache_key* and the remaining keyword arguments are passed), and
+    $r(\theta)$ is the extent of the integrator's stability region along the
+    angle $\theta$ (see :func:`stability_region_radius`).
+
+    $\theta_\lambda$ is the angle of $\lambda$, or *eigenvalue_angle* for all
+    eigenvalues if given. Estimates with a positive real part, which a stable
+    semi-discretization only has due to the error of the estimate, are treated
+    as imaginary. The default *safety_factor* accounts for the error of the
+    estimates.
+    """
+    eigenvalues = estimate_eigenvalues(discr, rhs, state, t,
+                                       cache_key=cache_key, **kwargs)
+    eigenvalues = eigenvalues[eigenvalues != 0]
+    if len(eigenvalues) == 0:
+        raise ValueError("the Jacobian of rhs appears to vanish")
+
+    if eigenvalue_angle is None:
+        # the stability regions are symmetric about the real axis
+        angles = np.round(np.angle(
+            np.minimum(eigenvalues.real, 0) + 1j*abs(eigenvalues.imag)), 4)
+    else:
+        angles = np.full(len(eigenvalues), eigenvalue_angle)
+
+    dt = np.inf
+    for eigenvalue, angle in zip(eigenvalues, angles):
+        radius = stability_region_radius(integrator, float(angle))
+        if radius == 0:
+            raise ValueError("integrator is not stable along the eigenvalue "
+                             f"angle {angle:g}")
+        dt = min(dt, radius / abs(eigenvalue))
+
+    return safety_factor * dt
@@ -29,8 +29,10 @@ THE SOFTWARE.
 
 from logpyle import set_dt
 from mirgecom.logging_quantities import set_sim_state
+from mirgecom.timing import timed_region
 
 
+@timed_region("advance_state")
 def advance_state(rhs, timestepper, checkpoint, get_timestep,
                   state, t_final, t=0.0, istep=0, logmgr=None, eos=None, dim=None):
     """Advance state from some time (t) to some time (t_final).
@@ -76,20 +78,24 @@ def advance_state(rhs, timestepper, checkpoint, get_timestep,
         if logmgr:
             logmgr.tick_before()
 
-        dt = get_timestep(state=state)
+        with timed_region("get_timestep"):
+            dt = get_timestep(state=state)
         if dt < 0:
             return istep, t, state
 
-        checkpoint(state=state, step=istep, t=t, dt=dt)
+        with timed_region("checkpoint"):
+            checkpoint(state=state, step=istep, t=t, dt=dt)
 
-        state = timestepper(state=state, t=t, dt=dt, rhs=rhs)
+        with timed_region("timestep"):
+            state = timestepper(state=state, t=t, dt=dt, rhs=rhs)
 
         t += dt
         istep += 1
 
         if logmgr:
-            set_dt(logmgr, dt)
-            set_sim_state(logmgr, dim, state, eos)
-            logmgr.tick_after()
+            with timed_region("logging"):
+                set_dt(logmgr, dt)
+                set_sim_state(logmgr, dim, state, eos)
+                logmgr.tick_after()
 
     return istep, t, state
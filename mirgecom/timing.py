@@ -0,0 +1,255 @@
+""":mod:`mirgecom.timing` provides nestable named timing regions.
+
+Regions are entered via :func:`timed_region`, either as a context manager or as
+a decorator::
+
+    with timed_region("volume_flux"):
+        ...
+
+    @timed_region("my_rhs")
+    def rhs(t, state):
+        ...
+
+Regions nest, and each region is identified by its path, i.e. the names of all
+enclosing regions joined by ``/``, such as
+``advance_state/timestep/inviscid_operator/volume_flux``. Timing is disabled
+by default, in which case entering a region costs a single check. Once enabled
+via :func:`enable_region_timing`, a :class:`RegionTimer` records per-region
+statistics for a summary table as well as a timeline that can be written as a
+Chrome trace (viewable in ``chrome://tracing`` or Perfetto).
+
+Since kernels execute asynchronously, the host time spent in a region does not
+necessarily include the device time of the kernels launched in it. Regions can
+synchronize with the device on entry and exit (at the cost of serializing host
+and device), and :class:`mirgecom.profiling.PyOpenCLProfilingArrayContext`
+attributes the profiled device time of each kernel to the region it was
+launched in.
+
+.. autoclass:: RegionTimer
+.. autofunction:: timed_region
+.. autofunction:: enable_region_timing
+.. autofunction:: disable_region_timing
+.. autofunction:: get_region_timer
+.. autofunction:: current_region_path
+"""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Optional
+
+from mirgecom.utils import StatisticsAccumulator
+
+
+class RegionTimer:
+    """Records the timing regions entered on this rank.
+
+    .. automethod:: __init__
+    .. automethod:: enter
+    .. automethod:: exit
+    .. autoattribute:: current_path
+    .. automethod:: add_device_time
+    .. automethod:: write_chrome_trace
+    .. automethod:: tabulate
+    """
+
+    def __init__(self, actx=None, synchronize: bool = False,
+                 max_trace_events: int = 100000) -> None:
+        """Initialize an empty RegionTimer.
+
+        Parameters
+        ----------
+        actx
+            A :class:`meshmode.array_context.PyOpenCLArrayContext` whose queue
+            is finished on region entry and exit if *synchronize* is *True*.
+        synchronize
+            Wait for all enqueued kernels to complete on region entry and exit,
+            so that host times include the device time of the region's kernels.
+        max_trace_events
+            Maximum number of timeline events to keep for the Chrome trace.
+            Later events are only included in the summary statistics.
+        """
+        if synchronize and actx is None:
+            raise ValueError("synchronizing regions requires an array context")
+
+        self.actx = actx
+        self.synchronize = synchronize
+        self.max_trace_events = max_trace_events
+
+        self._stack = []
+        self._t0 = perf_counter()
+
+        # list of (path, start time [s], duration [s]) for the timeline
+        self.trace_events = []
+        self.num_dropped_trace_events = 0
+
+        # dict of region path -> StatisticsAccumulator of host times [s]
+        self.region_times = {}
+
+        # dict of region path -> StatisticsAccumulator of kernel times [s]
+        self.device_times = {}
+
+    @property
+    def current_path(self) -> Optional[str]:
+        """Path of the innermost region that is currently entered."""
+        if not self._stack:
+            return None
+        return self._stack[-1][0]
+
+    def enter(self, name: str) -> None:
+        """Enter region *name*, nested in the current region."""
+        if self.synchronize:
+            self.actx.queue.finish()
+
+        parent = self.current_path
+        path = name if parent is None else f"{parent}/{name}"
+        self._stack.append((path, perf_counter()))
+
+    def exit(self) -> None:
+        """Exit the current region."""
+        if self.synchronize:
+            self.actx.queue.finish()
+
+        path, start = self._stack.pop()
+        duration = perf_counter() - start
+
+        self.region_times.setdefault(path, StatisticsAccumulator()) \
+            .add_value(duration)
+
+        if len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append((path, start - self._t0, duration))
+        else:
+            self.num_dropped_trace_events += 1
+
+    def add_device_time(self, path: Optional[str], time: float) -> None:
+        """Attribute *time* seconds of kernel execution to region *path*."""
+        if path is None:
+            path = "(no region)"
+        self.device_times.setdefault(path, StatisticsAccumulator()).add_value(time)
+
+    def write_chrome_trace(self, filename: str, rank: int = 0) -> None:
+        """Write the timeline of the regions in Chrome trace format.
+
+        *filename* may contain a ``{rank}`` placeholder, which is replaced with
+        *rank*. The rank is also used as the process ID of the trace events, so
+        that the traces of several ranks can be merged into one timeline.
+        """
+        import json
+
+        events = [{
+            "name": path.rsplit("/", 1)[-1],
+            "cat": "region",
+            "ph": "X",
+            "ts": start * 1e6,
+            "dur": duration * 1e6,
+            "pid": rank,
+            "tid": 0,
+            "args": {"path": path},
+            } for path, start, duration in self.trace_events]
+
+        with open(filename.format(rank=rank), "w") as outf:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {
+                           "num_dropped_events": self.num_dropped_trace_events}},
+                      outf)
+
+    def tabulate(self):
+        """Return a :class:`pytools.Table` with the time spent in each region.
+
+        Inclusive times contain the time spent in nested regions.
+        """
+        import pytools
+
+        tbl = pytools.Table()
+        tbl.add_row(["Region", "Calls", "Time_sum [s]", "Time_min [s]",
+                     "Time_avg [s]", "Time_max [s]", "Time_p50 [s]", "Time_p99 [s]",
+                     "Device_time_sum [s]"])
+
+        def fmt(value):
+            return "--" if value is None else f"{value:.4g}"
+
+        for path in sorted(set(self.region_times) | set(self.device_times)):
+            r = self.region_times.get(path, StatisticsAccumulator())
+            d = self.device_times.get(path, StatisticsAccumulator())
+
+            tbl.add_row([path, r.num_values, fmt(r.sum()), fmt(r.min()),
+                         fmt(r.mean()), fmt(r.max()), fmt(r.percentile(50)),
+                         fmt(r.percentile(99)), fmt(d.sum())])
+
+        return tbl
+
+
+_region_timer = None
+
+
+def enable_region_timing(actx=None, synchronize: bool = False,
+                         max_trace_events: int = 100000) -> RegionTimer:
+    """Start recording timing regions with a new :class:`RegionTimer`.
+
+    The arguments are passed to :meth:`RegionTimer.__init__`. Returns the new
+    timer.
+    """
+    global _region_timer
+    _region_timer = RegionTimer(actx, synchronize=synchronize,
+                                max_trace_events=max_trace_events)
+    return _region_timer
+
+
+def disable_region_timing() -> None:
+    """Stop recording timing regions."""
+    global _region_timer
+    _region_timer = None
+
+
+def get_region_timer() -> Optional[RegionTimer]:
+    """Return the active :class:`RegionTimer`, or *None* if timing is disabled."""
+    return _region_timer
+
+
+def current_region_path() -> Optional[str]:
+    """Return the path of the current region, or *None*."""
+    if _region_timer is None:
+        return None
+    return _region_timer.current_path
+
+
+@contextmanager
+def timed_region(name: str):
+    """Time the enclosed code as region *name* if region timing is enabled.
+
+    Can be used as a context manager or as a function decorator.
+    """
+    timer = _region_timer
+
+    if timer is None:
+        yield
+        return
+
+    timer.enter(name)
+    try:
+        yield
+    finally:
+        timer.exit()
@@ -32,6 +32,7 @@ __doc__ = """
 .. autofunction:: asdict_shallow
 """
 
+from math import floor, log10
 from typing import Optional
 
 
@@ -50,22 +51,42 @@ def asdict_shallow(dc_instance) -> dict:
 class StatisticsAccumulator:
     """Class that provides statistical functions for multiple values.
 
+    In addition to the sum, minimum, and maximum, the accumulator keeps the
+    variance (using Welford's algorithm) and a histogram with logarithmically
+    spaced bins, from which approximate percentiles are computed. Values are
+    not stored, so memory use only depends on the range of the values: with
+    *bins_per_decade* bins per factor of ten, a range of twelve orders of
+    magnitude (e.g., from nanoseconds to hours) needs at most a few hundred
+    bins. Percentiles are accurate to within a relative error of about
+    ``10**(1/(2*bins_per_decade)) - 1``, i.e., 6% by default.
+
+    The histogram only covers positive values, which is what the accumulator is
+    meant for (timings, counts). Zero and negative values are counted in a
+    single bin below all others, so any percentile that falls among them is
+    reported as the minimum.
+
     .. automethod:: __init__
     .. automethod:: add_value
     .. automethod:: sum
     .. automethod:: mean
     .. automethod:: max
     .. automethod:: min
+    .. automethod:: variance
+    .. automethod:: std
+    .. automethod:: percentile
+    .. automethod:: histogram
     .. autoattribute:: num_values
     """
 
-    def __init__(self, scale_factor: float = 1) -> None:
+    def __init__(self, scale_factor: float = 1, bins_per_decade: int = 20) -> None:
         """Initialize an empty StatisticsAccumulator object.
 
         Parameters
         ----------
         scale_factor
             Scale returned statistics by this factor.
+        bins_per_decade
+            Number of histogram bins per factor of ten.
         """
         self.num_values: int = 0
         """Number of values stored in the StatisticsAccumulator."""
@@ -75,8 +96,24 @@ class StatisticsAccumulator:
         self._max = None
         self.scale_factor = scale_factor
 
+        # Running mean and sum of squared differences from the mean (Welford)
+        self._mean = 0.
+        self._m2 = 0.
+
+        # dict of bin index -> number of values. Bin i holds the positive values
+        # in [10**(i/bins_per_decade), 10**((i+1)/bins_per_decade)), values <= 0
+        # are counted separately.
+        self.bins_per_decade = bins_per_decade
+        self._bins = {}
+        self._num_nonpositive = 0
+
     def add_value(self, v: float) -> None:
-        """Add a new value to the statistics."""
+        """Add a new value to the statistics.
+
+        Values that are not positive enter the sum, extremes and variance
+        exactly, but share a single histogram bin; see
+        :class:`StatisticsAccumulator`.
+        """
         if v is None:
             return
         self.num_values += 1
@@ -86,6 +123,16 @@ class StatisticsAccumulator:
         if self._max is None or v > self._max:
             self._max = v
 
+        delta = v - self._mean
+        self._mean += delta / self.num_values
+        self._m2 += delta * (v - self._mean)
+
+        if v > 0:
+            i = floor(log10(v) * self.bins_per_decade)
+            self._bins[i] = self._bins.get(i, 0) + 1
+        else:
+            self._num_nonpositive += 1
+
     def sum(self) -> Optional[float]:
         """Return the sum of added values."""
         if self.num_values == 0:
@@ -113,3 +160,74 @@ class StatisticsAccumulator:
             return None
 
         return self._min * self.scale_factor
+
+    def variance(self) -> Optional[float]:
+        """Return the (population) variance of added values."""
+        if self.num_values == 0:
+            return None
+
+        return self._m2 / self.num_values * self.scale_factor**2
+
+    def std(self) -> Optional[float]:
+        """Return the (population) standard deviation of added values."""
+        if self.num_values == 0:
+            return None
+
+        return (self._m2 / self.num_values)**0.5 * abs(self.scale_factor)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the approximate *q*-th percentile of added values.
+
+        *q* must be between 0 and 100. Except for the exact minimum (*q* = 0)
+        and maximum (*q* = 100), the result is the geometric center of the
+        histogram bin that contains the percentile, clipped to the range of the
+        added values.
+        """
+        if not 0 <= q <= 100:
+            raise ValueError(f"percentile {q} is not in [0, 100]")
+
+        if self.num_values == 0:
+            return None
+
+        # The extremes are known exactly
+        if q == 0:
+            return self._min * self.scale_factor
+        if q == 100:
+            return self._max * self.scale_factor
+
+        # Number of values that are at most the percentile (at least one)
+        rank = max(1, q / 100 * self.num_values)
+
+        if rank <= self._num_nonpositive:
+            return self._min * self.scale_factor
+
+        count = self._num_nonpositive
+        for i in sorted(self._bins):
+            count += self._bins[i]
+            if count >= rank:
+                value = 10**((i + 0.5) / self.bins_per_decade)
+                break
+        else:
+            value = self._max
+
+        value = min(max(value, self._min), self._max)
+        return value * self.scale_factor
+
+    def histogram(self) -> tuple:
+        """Return the histogram of the positive added values.
+
+        Returns
+        -------
+        tuple
+            A tuple *(edges, counts)* of lists, where *edges[i]* is a tuple
+            *(lower, upper)* of the bounds of a bin, and *counts[i]* is the
+            number of values in it. Only nonempty bins are included.
+        """
+        edges = []
+        counts = []
+        for i in sorted(self._bins):
+            edges.append((10**(i / self.bins_per_decade) * self.scale_factor,
+                          10**((i + 1) / self.bins_per_decade) * self.scale_factor))
+            counts.append(self._bins[i])
+
+        return edges, counts
@@ -0,0 +1,338 @@
+r"""Ahead-of-time compilation of the kernels used by a simulation case.
+
+The first evaluation of an operator compiles all the kernels it uses, which can
+dominate the run time of short jobs. Running the operators of a case once on a
+tiny mesh beforehand fills the persistent kernel caches, so that the production
+run loads the compiled kernels from the caches instead::
+
+    $ mirgecom-warmup --dim 3 --order 3 --nspecies 7 \
+          --operators inviscid,diffusion --integrator lsrk4
+
+Since the number of elements is a runtime parameter of the kernels, the
+kernels compiled on the tiny mesh are reused by runs on larger meshes with the
+same dimension, order, and number of species.
+
+The warmup covers the volume, face, and domain boundary kernels of the chosen
+operators (with slip wall and Dirichlet boundaries) and the kernels of the time
+integrator. Kernels that are specific to a partitioned mesh, such as those that
+gather and scatter the traces exchanged between ranks, are only compiled when
+the warmup itself runs on a partitioned mesh, i.e. under MPI::
+
+    $ export XDG_CACHE_HOME=/path/to/persistent/cache
+    $ mpiexec -n 4 python -m mpi4py -m mirgecom.warmup --leader-first node ...
+
+Kernels for other boundary conditions, initializers, I/O, and logging are not
+covered. The caches are only useful to the production run if it uses the same
+``XDG_CACHE_HOME``, which therefore should not be cleared between the jobs.
+
+.. autofunction:: warm_up_kernels
+.. autofunction:: main
+"""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from time import perf_counter
+
+import numpy as np
+import pyopencl as cl
+import pyopencl.tools as cl_tools
+import pytools
+from pytools.obj_array import flat_obj_array, make_obj_array
+from meshmode.array_context import PyOpenCLArrayContext
+from meshmode.dof_array import thaw
+from meshmode.mesh import BTAG_ALL
+
+from mirgecom.integrators import rk4_step, lsrk4_step, euler_step
+
+INTEGRATORS = {
+    "rk4": rk4_step,
+    "lsrk4": lsrk4_step,
+    "euler": euler_step,
+}
+
+OPERATORS = ("inviscid", "diffusion", "wave")
+
+
+class _CompileTimingArrayContext(PyOpenCLArrayContext):
+    """An array context that records the time of the first call of each kernel.
+
+    The first call of a kernel includes its code generation and compilation (or
+    the retrieval of the compiled kernel from the persistent caches).
+    """
+
+    def __init__(self, queue, allocator=None):
+        super().__init__(queue, allocator)
+
+        # dict of program -> (kernel name, time of the first call [s])
+        self.first_call_times = {}
+
+    def call_loopy(self, program, **kwargs):
+        """Execute the loopy kernel, timing it if this is its first call."""
+        if program in self.first_call_times:
+            return super().call_loopy(program, **kwargs)
+
+        start = perf_counter()
+        result = super().call_loopy(program, **kwargs)
+        self.queue.finish()
+        self.first_call_times[program] = (program.name, perf_counter() - start)
+
+        return result
+
+    def tabulate_first_call_times(self) -> pytools.Table:
+        """Return a :class:`pytools.Table` with the first call time per kernel."""
+        name_to_times = {}
+        for name, time in self.first_call_times.values():
+            name_to_times.setdefault(name, []).append(time)
+
+        tbl = pytools.Table()
+        tbl.add_row(["Function", "Variants", "First call time [s]"])
+
+        for name, times in sorted(name_to_times.items(),
+                                  key=lambda item: -sum(item[1])):
+            tbl.add_row([name, len(times), f"{sum(times):.4g}"])
+
+        total_time = sum(sum(times) for times in name_to_times.values())
+        tbl.add_row(["Total", len(self.first_call_times), f"{total_time:.4g}"])
+
+        return tbl
+
+
+def _make_rhs(actx, discr, operator, nspecies):
+    """Return a tuple (rhs, initial state) for *operator* on *discr*."""
+    dim = discr.dim
+    nodes = thaw(actx, discr.nodes())
+
+    if operator == "inviscid":
+        from mirgecom.euler import inviscid_operator
+        from mirgecom.eos import IdealSingleGas
+        from mirgecom.initializers import Uniform
+        from mirgecom.boundary import AdiabaticSlipBoundary
+
+        eos = IdealSingleGas()
+        boundaries = {BTAG_ALL: AdiabaticSlipBoundary()}
+        state = Uniform(dim=dim, nspecies=nspecies)(nodes, eos=eos)
+
+        def rhs(t, state):
+            return inviscid_operator(discr, eos=eos, boundaries=boundaries, q=state,
+                                     t=t)
+
+        return rhs, state
+
+    if operator == "diffusion":
+        from grudge.symbolic.primitives import QTAG_NONE
+        from mirgecom.diffusion import (
+            diffusion_operator,
+            DirichletDiffusionBoundary)
+
+        boundaries = {BTAG_ALL: DirichletDiffusionBoundary(0.)}
+        u = actx.np.exp(-np.dot(nodes, nodes))
+
+        if nspecies > 0:
+            boundaries = [boundaries] * nspecies
+            u = make_obj_array([u] * nspecies)
+
+        def rhs(t, u):
+            return diffusion_operator(discr, quad_tag=QTAG_NONE, alpha=1,
+                                      boundaries=boundaries, u=u)
+
+        return rhs, u
+
+    if operator == "wave":
+        from mirgecom.wave import wave_operator
+
+        w = flat_obj_array(
+            actx.np.exp(-np.dot(nodes, nodes)),
+            [discr.zeros(actx) for _ in range(dim)])
+
+        def rhs(t, w):
+            return wave_operator(discr, c=1, w=w)
+
+        return rhs, w
+
+    raise ValueError(f"unknown operator '{operator}'")
+
+
+def _make_mesh(dim, nel_1d, comm=None):
+    """Return the (local part of the) warmup mesh.
+
+    If *comm* has more than one rank, the mesh is refined until each rank
+    receives at least two elements, and then partitioned among the ranks.
+    """
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+
+    if comm is None or comm.Get_size() == 1:
+        return generate_regular_rect_mesh(a=(-0.5,)*dim, b=(0.5,)*dim,
+                                          n=(nel_1d,)*dim)
+
+    from meshmode.distributed import MPIMeshDistributor, get_partition_by_pymetis
+    mesh_dist = MPIMeshDistributor(comm)
+    num_parts = comm.Get_size()
+
+    if mesh_dist.is_mananger_rank():
+        from math import factorial
+        # nel_1d is the number of vertices per axis, and each box of the mesh is
+        # split into dim! simplices
+        while (nel_1d - 1)**dim * factorial(dim) < 2*num_parts:
+            nel_1d += 1
+
+        mesh = generate_regular_rect_mesh(a=(-0.5,)*dim, b=(0.5,)*dim,
+                                          n=(nel_1d,)*dim)
+        part_per_element = get_partition_by_pymetis(mesh, num_parts)
+        return mesh_dist.send_mesh_parts(mesh, part_per_element, num_parts)
+
+    return mesh_dist.receive_mesh_part()
+
+
+def warm_up_kernels(queue, *, dim, order, nspecies=0, operators=("inviscid",),
+                    integrator="rk4", nel_1d=2, comm=None) -> pytools.Table:
+    """Compile the kernels used by a case by running its operators on a tiny mesh.
+
+    Each operator in *operators* is evaluated within one step of *integrator*
+    on a mesh with *nel_1d* vertices per axis.
+
+    Without *comm*, the mesh is serial and no communication takes place, so
+    this can be wrapped in :func:`mirgecom.mpi.leader_rank_first`. With *comm*,
+    the mesh is partitioned among its ranks, which additionally compiles the
+    kernels for the partition boundaries. This is a collective operation on
+    *comm*.
+
+    Parameters
+    ----------
+    queue: pyopencl.CommandQueue
+        The queue whose device the kernels are compiled for.
+    dim: int
+        Spatial dimension of the case.
+    order: int
+        Polynomial order of the discretization.
+    nspecies: int
+        Number of mixture species. The diffusion operator is applied to one
+        field per species if this is nonzero.
+    operators
+        Sequence of operator names, any of ``"inviscid"``, ``"diffusion"``,
+        and ``"wave"``.
+    integrator: str
+        Name of the time integrator, one of ``"rk4"``, ``"lsrk4"``, and
+        ``"euler"``.
+    nel_1d: int
+        Number of mesh vertices per axis, increased as needed to give each
+        rank of *comm* some elements.
+    comm: mpi4py.MPI.Intracomm
+        The communicator among whose ranks the mesh is partitioned, or *None*
+        for a serial mesh.
+
+    Returns
+    -------
+    pytools.Table
+        The time of the first call of each compiled kernel.
+    """
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"unknown integrator '{integrator}'")
+    timestepper = INTEGRATORS[integrator]
+
+    actx = _CompileTimingArrayContext(queue,
+        allocator=cl_tools.MemoryPool(cl_tools.ImmediateAllocator(queue)))
+
+    mesh = _make_mesh(dim, nel_1d, comm)
+
+    from grudge.eager import EagerDGDiscretization
+    discr = EagerDGDiscretization(actx, mesh, order=order, mpi_communicator=comm)
+
+    for operator in operators:
+        rhs, state = _make_rhs(actx, discr, operator, nspecies)
+        timestepper(state=state, t=0, dt=1e-8, rhs=rhs)
+
+    return actx.tabulate_first_call_times()
+
+
+def main(argv=None):
+    """Run :func:`warm_up_kernels` as a command-line program.
+
+    Runs serially by default. When launched with ``python -m mpi4py -m
+    mirgecom.warmup --leader-first node``, one rank per node first compiles the
+    kernels on a serial mesh before the other ranks load them from the caches.
+    Then, all ranks together compile the partition boundary kernels on a
+    partitioned mesh.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile the kernels used by a "
+        "simulation case ahead of time, filling the persistent kernel caches.")
+    parser.add_argument("--dim", type=int, default=2)
+    parser.add_argument("--order", type=int, default=3)
+    parser.add_argument("--nspecies", type=int, default=0)
+    parser.add_argument("--operators", default="inviscid",
+        help="comma-separated list of operators out of: " + ", ".join(OPERATORS))
+    parser.add_argument("--integrator", default="rk4", choices=list(INTEGRATORS))
+    parser.add_argument("--nel-1d", type=int, default=2,
+        help="number of vertices per axis of the warmup mesh")
+    parser.add_argument("--leader-first", choices=["node", "job"], default=None,
+        help="run under MPI, compiling on one leader rank per node (or job) "
+        "before all other ranks, then on a mesh partitioned among all ranks")
+    args = parser.parse_args(argv)
+
+    operators = [op.strip() for op in args.operators.split(",") if op.strip()]
+    for op in operators:
+        if op not in OPERATORS:
+            parser.error(f"unknown operator '{op}'")
+
+    def run(queue, comm=None):
+        return warm_up_kernels(queue, dim=args.dim, order=args.order,
+            nspecies=args.nspecies, operators=operators,
+            integrator=args.integrator, nel_1d=args.nel_1d, comm=comm)
+
+    if args.leader_first is None:
+        cl_ctx = cl.create_some_context()
+        print(run(cl.CommandQueue(cl_ctx)))
+        return
+
+    from mirgecom.mpi import mpi_entry_point, leader_rank_first
+
+    @mpi_entry_point
+    def run_leader_first():
+        from mpi4py import MPI
+        comm = MPI.COMM_WORLD
+
+        cl_ctx = cl.create_some_context()
+        queue = cl.CommandQueue(cl_ctx)
+
+        with leader_rank_first(scope=args.leader_first):
+            tbl = run(queue)
+
+        if comm.Get_rank() == 0:
+            print("Serial mesh:")
+            print(tbl)
+
+        if comm.Get_size() > 1:
+            tbl = run(queue, comm)
+
+            if comm.Get_rank() == 0:
+                print("Partitioned mesh:")
+                print(tbl)
+
+    run_leader_first()
+
+
+if __name__ == "__main__":
+    main()
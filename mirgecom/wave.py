@@ -1,6 +1,7 @@
 """:mod:`mirgecom.wave` computes the rhs of the wave equation.
 
 .. autofunction:: wave_operator
+.. autoclass:: WaveOperator
 """
 
 __copyright__ = """
@@ -29,20 +30,22 @@ THE SOFTWARE.
 
 import numpy as np
 import numpy.linalg as la  # noqa
-from pytools.obj_array import flat_obj_array
+from pytools.obj_array import flat_obj_array, make_obj_array
 from meshmode.mesh import BTAG_ALL, BTAG_NONE  # noqa
-from meshmode.dof_array import thaw
-from grudge.symbolic.primitives import TracePair
-from grudge.eager import interior_trace_pair, cross_rank_trace_pairs
+from grudge.symbolic.primitives import TracePair, as_dofdesc
+from grudge.eager import interior_trace_pair
+from mirgecom.exchange import cross_rank_trace_pairs
+from mirgecom.geometry import get_geometry
+from mirgecom.timing import timed_region
 
 
-def _flux(discr, c, w_tpair):
+def _flux(discr, c, w_tpair, normal=None):
     u = w_tpair[0]
     v = w_tpair[1:]
 
-    actx = w_tpair.int[0].array_context
-
-    normal = thaw(actx, discr.normal(w_tpair.dd))
+    if normal is None:
+        actx = w_tpair.int[0].array_context
+        normal = get_geometry(discr, actx).normal(w_tpair.dd)
 
     flux_weak = flat_obj_array(
         np.dot(v.avg, normal),
@@ -58,6 +61,114 @@ def _flux(discr, c, w_tpair):
     return discr.project(w_tpair.dd, "all_faces", c*flux_weak)
 
 
+class WaveOperator:
+    r"""The wave operator for a fixed wave speed.
+
+    Computes the RHS of the wave equation like :func:`wave_operator`.
+    The wave speed $c$ may vary in space, in which case the RHS of
+
+    .. math::
+
+        u_t = c\nabla\cdot\mathbf{v}, \qquad \mathbf{v}_t = c\nabla u
+
+    is computed by applying $c$ pointwise to the RHS for unit wave speed. This
+    is accurate for smoothly varying $c$.
+
+    Several independent wave fields can be processed in one application,
+    in which case their traces are exchanged with other ranks in a single
+    message per neighbor.
+
+    .. automethod:: __init__
+    .. automethod:: __call__
+    """
+
+    def __init__(self, discr, c):
+        """
+        Initialize the operator.
+
+        Parameters
+        ----------
+        discr: grudge.eager.EagerDGDiscretization
+            the discretization to use
+        c: Union[numbers.Number, meshmode.dof_array.DOFArray]
+            the wave speed value(s)
+        """
+        self.discr = discr
+        self.c = c
+
+    def __call__(self, w):
+        """Compute the RHS of the wave equation.
+
+        Parameters
+        ----------
+        w: numpy.ndarray
+            an object array of DOF arrays, representing the state vector, or a
+            two-dimensional object array whose rows are the state vectors of
+            several independent wave fields
+
+        Returns
+        -------
+        numpy.ndarray
+            an object array of DOF arrays of the same shape as *w*,
+            representing the ODE RHS
+        """
+        if w.ndim == 1:
+            result, = self._apply([w])
+            return result
+
+        result = np.empty(w.shape, dtype=object)
+        for i, field_result in enumerate(self._apply(list(w))):
+            result[i] = field_result
+        return result
+
+    @timed_region("wave_operator")
+    def _apply(self, ws):
+        """Apply the operator to the list of state vectors *ws*."""
+        discr = self.discr
+        actx = ws[0][0].array_context
+        geometry = get_geometry(discr, actx)
+        nfields = len(ws)
+
+        w_all = np.empty((nfields, len(ws[0])), dtype=object)
+        for i, w in enumerate(ws):
+            w_all[i] = w
+
+        int_tpair = interior_trace_pair(discr, w_all)
+        rank_tpairs = cross_rank_trace_pairs(discr, w_all)
+        w_bdry = discr.project("vol", BTAG_ALL, w_all)
+
+        def flux(dd, w_int, w_ext):
+            return _flux(discr, c=1, w_tpair=TracePair(dd, interior=w_int,
+                exterior=w_ext), normal=geometry.normal(dd))
+
+        results = []
+        for i, w in enumerate(ws):
+            u = w[0]
+            v = w[1:]
+
+            dir_bval = w_bdry[i]
+            dir_bc = flat_obj_array(-dir_bval[0], dir_bval[1:])
+
+            rhs = discr.inverse_mass(
+                flat_obj_array(
+                    -discr.weak_div(v),
+                    -discr.weak_grad(u)
+                    )
+                +  # noqa: W504
+                discr.face_mass(
+                    flux(int_tpair.dd, int_tpair.int[i], int_tpair.ext[i])
+                    + flux(as_dofdesc(BTAG_ALL), dir_bval, dir_bc)
+                    + sum(
+                        flux(tpair.dd, tpair.int[i], tpair.ext[i])
+                        for tpair in rank_tpairs)
+                    )
+                )
+
+            results.append(make_obj_array([self.c*rhs_i for rhs_i in rhs]))
+
+        return results
+
+
 def wave_operator(discr, c, w):
     """Compute the RHS of the wave equation.
 
@@ -65,8 +176,8 @@ def wave_operator(discr, c, w):
     ----------
     discr: grudge.eager.EagerDGDiscretization
         the discretization to use
-    c: float
-        the (constant) wave speed
+    c: Union[numbers.Number, meshmode.dof_array.DOFArray]
+        the wave speed value(s), see :class:`WaveOperator`
     w: numpy.ndarray
         an object array of DOF arrays, representing the state vector
 
@@ -75,28 +186,4 @@ def wave_operator(discr, c, w):
     numpy.ndarray
         an object array of DOF arrays, representing the ODE RHS
     """
-    u = w[0]
-    v = w[1:]
-
-    dir_u = discr.project("vol", BTAG_ALL, u)
-    dir_v = discr.project("vol", BTAG_ALL, v)
-    dir_bval = flat_obj_array(dir_u, dir_v)
-    dir_bc = flat_obj_array(-dir_u, dir_v)
-
-    return (
-        discr.inverse_mass(
-            flat_obj_array(
-                -c*discr.weak_div(v),
-                -c*discr.weak_grad(u)
-                )
-            +  # noqa: W504
-            discr.face_mass(
-                _flux(discr, c=c, w_tpair=interior_trace_pair(discr, w))
-                + _flux(discr, c=c,
-                    w_tpair=TracePair(BTAG_ALL, interior=dir_bval, exterior=dir_bc))
-                + sum(
-                    _flux(discr, c=c, w_tpair=tpair)
-                    for tpair in cross_rank_trace_pairs(discr, w))
-                )
-            )
-        )
+    return WaveOperator(discr, c)(w)
@@ -62,6 +62,12 @@ def main():
               "importlib-resources>=1.1.0; python_version < '3.9'",
           ],
 
+          entry_points={
+              "console_scripts": [
+                  "mirgecom-warmup=mirgecom.warmup:main",
+              ],
+          },
+
           include_package_data=True,)
 
 
@@ -29,11 +29,12 @@ import numpy.linalg as la  # noqa
 import logging
 import pytest
 
+from pytools.obj_array import make_obj_array
 from meshmode.dof_array import thaw
 from meshmode.mesh import BTAG_ALL, BTAG_NONE  # noqa
 from mirgecom.euler import split_conserved
 from mirgecom.initializers import Lump
-from mirgecom.boundary import AdiabaticSlipBoundary
+from mirgecom.boundary import AdiabaticSlipBoundary, PrescribedBoundary
 from mirgecom.eos import IdealSingleGas
 from grudge.eager import EagerDGDiscretization
 from meshmode.array_context import (  # noqa
@@ -177,3 +178,268 @@ def test_slipwall_flux(actx_factory, dim, order):
         eoc.order_estimate() >= order - 0.5
         or eoc.max_error() < 1e-12
     )
+
+
+@pytest.mark.parametrize("time_dependence", ["steady", "periodic", "separable"])
+def test_prescribed_boundary_cache(actx_factory, time_dependence):
+    """Check the exterior solutions cached by the prescribed boundary.
+
+    Cached exterior solutions must match direct evaluations of the user
+    function, which must only be evaluated when necessary.
+    """
+    actx = actx_factory()
+
+    dim = 2
+    nel_1d = 4
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+
+    mesh = generate_regular_rect_mesh(
+        a=(-0.5,) * dim, b=(0.5,) * dim, n=(nel_1d,) * dim
+    )
+
+    discr = EagerDGDiscretization(actx, mesh, order=3)
+    nodes = thaw(actx, discr.nodes())
+    bnd_nodes = thaw(actx, discr.discr_from_dd(BTAG_ALL).nodes())
+    eos = IdealSingleGas()
+
+    lump = Lump(dim=dim, velocity=np.ones(dim))
+    state = lump(nodes, t=0.0, eos=eos)
+
+    period = 1.0
+    ncalls = [0]
+
+    def userfunc(x_vec, t=0.0, eos=eos, **kwargs):
+        ncalls[0] += 1
+        if time_dependence == "periodic":
+            # periodic in time by construction
+            return lump(x_vec, t=np.sin(2*np.pi*t/period), eos=eos)
+        return lump(x_vec, t=0.0, eos=eos)
+
+    def time_factor(t):
+        return 1.0 + 0.5*np.cos(t)
+
+    def expected(t):
+        if time_dependence == "steady":
+            return lump(bnd_nodes, t=0.0, eos=eos)
+        if time_dependence == "periodic":
+            return lump(bnd_nodes, t=np.sin(2*np.pi*t/period), eos=eos)
+        return lump(bnd_nodes, t=0.0, eos=eos) * time_factor(t)
+
+    if time_dependence == "separable":
+        bndry = PrescribedBoundary(userfunc, time_factor=time_factor)
+    else:
+        bndry = PrescribedBoundary(userfunc, time_dependence=time_dependence,
+                                   period=period)
+
+    times = [0.0, 0.25, 1.0, 1.25, 2.0]
+    for t in times:
+        bnd_pair = bndry.boundary_pair(discr, state, t=t, btag=BTAG_ALL, eos=eos)
+        exp = expected(t)
+        err = discr.norm(bnd_pair.ext - exp, np.inf, dd=BTAG_ALL)
+        assert err < 1e-12 * discr.norm(exp, np.inf, dd=BTAG_ALL)
+
+    expected_ncalls = 2 if time_dependence == "periodic" else 1
+    assert ncalls[0] == expected_ncalls
+
+    # The cache is kept per discretization, so the same boundary tag on
+    # another discretization gets its own exterior solution
+    other_mesh = generate_regular_rect_mesh(
+        a=(-0.5,) * dim, b=(0.5,) * dim, n=(nel_1d + 1,) * dim
+    )
+    discr = EagerDGDiscretization(actx, other_mesh, order=2)
+    nodes = thaw(actx, discr.nodes())
+    bnd_nodes = thaw(actx, discr.discr_from_dd(BTAG_ALL).nodes())
+    state = lump(nodes, t=0.0, eos=eos)
+
+    for t in times:
+        bnd_pair = bndry.boundary_pair(discr, state, t=t, btag=BTAG_ALL, eos=eos)
+        exp = expected(t)
+        err = discr.norm(bnd_pair.ext - exp, np.inf, dd=BTAG_ALL)
+        assert err < 1e-12 * discr.norm(exp, np.inf, dd=BTAG_ALL)
+
+    assert ncalls[0] == 2*expected_ncalls
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+@pytest.mark.parametrize("speed", [0.3, 2.0])
+def test_characteristic_boundary_identity(actx_factory, dim, speed):
+    """Check that the characteristic boundaries preserve a matching uniform flow.
+
+    If the interior state matches the reference state (or pressure), the
+    exterior state must equal the interior state for subsonic and supersonic
+    flow in any direction.
+    """
+    actx = actx_factory()
+
+    nel_1d = 4
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+
+    mesh = generate_regular_rect_mesh(
+        a=(-0.5,) * dim, b=(0.5,) * dim, n=(nel_1d,) * dim
+    )
+
+    discr = EagerDGDiscretization(actx, mesh, order=3)
+    nodes = thaw(actx, discr.nodes())
+    eos = IdealSingleGas()
+
+    from functools import partial
+    bnd_norm = partial(discr.norm, p=np.inf, dd=BTAG_ALL)
+
+    from mirgecom.initializers import Uniform
+    from mirgecom.boundary import (
+        CharacteristicInflowBoundary,
+        CharacteristicOutflowBoundary,
+    )
+
+    for vdir in range(dim):
+        for parity in [1.0, -1.0]:
+            vel = np.zeros(shape=(dim,))
+            vel[vdir] = parity*speed
+            initializer = Uniform(dim=dim, velocity=vel)
+            state = initializer(nodes)
+            pressure = discr.project("vol", BTAG_ALL,
+                                     eos.pressure(split_conserved(dim, state)))
+
+            for bndry in [CharacteristicInflowBoundary(initializer),
+                          CharacteristicOutflowBoundary(pressure)]:
+                bnd_pair = bndry.boundary_pair(discr, state, t=0.0,
+                                               btag=BTAG_ALL, eos=eos)
+                err = bnd_norm(bnd_pair.ext - bnd_pair.int)
+                assert err < 1e-12 * bnd_norm(bnd_pair.int)
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_characteristic_boundary_invariants(actx_factory, dim):
+    """Check which Riemann invariants the characteristic boundary imposes.
+
+    For subsonic flow, the exterior state must carry the outgoing invariant of
+    the interior state and the incoming invariant of the reference state, and
+    the entropy of the upwind side.
+    """
+    actx = actx_factory()
+
+    nel_1d = 4
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+
+    mesh = generate_regular_rect_mesh(
+        a=(-0.5,) * dim, b=(0.5,) * dim, n=(nel_1d,) * dim
+    )
+
+    discr = EagerDGDiscretization(actx, mesh, order=3)
+    nodes = thaw(actx, discr.nodes())
+    nhat = thaw(actx, discr.normal(BTAG_ALL))
+    eos = IdealSingleGas()
+    gamma = eos.gamma()
+
+    from functools import partial
+    bnd_norm = partial(discr.norm, p=np.inf, dd=BTAG_ALL)
+
+    from mirgecom.initializers import Uniform
+    from mirgecom.boundary import CharacteristicInflowBoundary
+
+    int_vel = 0.3*np.ones(dim)/np.sqrt(dim)
+    ref_vel = -0.2*np.ones(dim)/np.sqrt(dim)
+    # Same sound speed, different entropy
+    state = Uniform(dim=dim, rho=1.0, p=1.0, velocity=int_vel)(nodes)
+    reference = Uniform(dim=dim, rho=1.2, p=1.2, velocity=ref_vel)
+
+    bndry = CharacteristicInflowBoundary(reference)
+    bnd_pair = bndry.boundary_pair(discr, state, t=0.0, btag=BTAG_ALL, eos=eos)
+    ref_soln = reference(thaw(actx, discr.discr_from_dd(BTAG_ALL).nodes()))
+
+    def invariants(q):
+        cv = split_conserved(dim, q)
+        vn = np.dot(cv.momentum, nhat) / cv.mass
+        c = eos.sound_speed(cv)
+        entropy = eos.pressure(cv) / cv.mass**gamma
+        return vn + 2*c/(gamma - 1), vn - 2*c/(gamma - 1), vn, entropy
+
+    int_r_plus, _, _, int_entropy = invariants(bnd_pair.int)
+    _, ref_r_minus, _, ref_entropy = invariants(ref_soln)
+    ext_r_plus, ext_r_minus, ext_vn, ext_entropy = invariants(bnd_pair.ext)
+
+    assert bnd_norm(ext_r_plus - int_r_plus) < 1e-12 * bnd_norm(int_r_plus)
+    assert bnd_norm(ext_r_minus - ref_r_minus) < 1e-12 * bnd_norm(ref_r_minus)
+
+    entropy_err = actx.np.where(ext_vn > 0,
+        ext_entropy - int_entropy, ext_entropy - ref_entropy)
+    assert bnd_norm(entropy_err) < 1e-12 * bnd_norm(int_entropy)
+
+    # The flow leaves the domain on some faces and enters on others
+    ones = 1. + 0*ext_vn
+    assert bnd_norm(actx.np.where(ext_vn > 0, ones, 0*ones)) == 1.
+    assert bnd_norm(actx.np.where(ext_vn < 0, ones, 0*ones)) == 1.
+
+
+def test_characteristic_boundary_non_reflecting(actx_factory):
+    """Check that an acoustic pulse leaves through a characteristic boundary.
+
+    A right-running simple wave is advanced until it has left the domain. With
+    the characteristic boundary, hardly any of it may be reflected, unlike with
+    a slip wall.
+    """
+    actx = actx_factory()
+
+    dim = 1
+    order = 3
+    nel = 32
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mesh = generate_regular_rect_mesh(a=(0.,), b=(1.,), n=(nel + 1,))
+
+    discr = EagerDGDiscretization(actx, mesh, order=order)
+    nodes = thaw(actx, discr.nodes())
+    eos = IdealSingleGas()
+    gamma = eos.gamma()
+
+    from mirgecom.euler import inviscid_operator, join_conserved
+    from mirgecom.initializers import Uniform
+    from mirgecom.boundary import CharacteristicInflowBoundary
+    from mirgecom.integrators import rk4_step
+
+    rho0 = 1.
+    p0 = 1.
+    c0 = np.sqrt(gamma*p0/rho0)
+    amplitude = 1e-3
+
+    # Right-running acoustic simple wave
+    dp = amplitude*actx.np.exp(-((nodes[0] - 0.5)/0.08)**2)
+    mass = rho0 + dp/c0**2
+    vel = dp/(rho0*c0)
+    initial_state = join_conserved(dim=dim, mass=mass,
+        energy=(p0 + dp)/(gamma - 1) + 0.5*mass*vel**2,
+        momentum=make_obj_array([mass*vel]))
+
+    # Until the pulse has left the domain, but before a reflection at the right
+    # boundary could leave through the left one
+    t_final = 0.85/c0
+    h = 1./nel
+    nsteps = int(np.ceil(t_final / (0.5*h/(c0*(2*order + 1)))))
+    dt = t_final/nsteps
+
+    def get_residual_pressure(bndry):
+        boundaries = {BTAG_ALL: bndry}
+
+        def rhs(t, q):
+            return inviscid_operator(discr, eos=eos, boundaries=boundaries, q=q,
+                                     t=t)
+
+        state = initial_state
+        t = 0.
+        for _ in range(nsteps):
+            state = rk4_step(state, t, dt, rhs)
+            t += dt
+
+        pressure = eos.pressure(split_conserved(dim, state))
+        return discr.norm(pressure - p0, np.inf)
+
+    residual = get_residual_pressure(
+        CharacteristicInflowBoundary(Uniform(dim=dim, rho=rho0, p=p0)))
+    assert residual < 0.05*amplitude
+
+    # The slip wall reflects the pulse, which shows that the test can tell
+    reflected = get_residual_pressure(AdiabaticSlipBoundary())
+    assert reflected > 0.5*amplitude
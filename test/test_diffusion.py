@@ -29,6 +29,7 @@ import pymbolic.primitives as prim
 import mirgecom.symbolic as sym
 from mirgecom.diffusion import (
     diffusion_operator,
+    DiffusionOperator,
     DirichletDiffusionBoundary,
     NeumannDiffusionBoundary)
 from meshmode.dof_array import thaw, DOFArray
@@ -323,6 +324,79 @@ def test_diffusion_accuracy(actx_factory, problem, nsteps, dt, scales, order,
                 or eoc_rec.max_error() < 1e-11)
 
 
+@pytest.mark.parametrize("order", [2, 3])
+@pytest.mark.parametrize(("problem", "nsteps", "dt", "scales"),
+    [
+        (get_decaying_trig_truncated_domain(2, 2.), 200, 1.e-5, [8, 12, 16]),
+        (get_static_trig_var_diff(2), 200, 1.e-5, [8, 12, 16]),
+    ])
+def test_diffusion_sipg_accuracy(actx_factory, problem, nsteps, dt, scales, order):
+    """
+    Checks the accuracy of the interior penalty scheme by solving the heat equation
+    for a given problem setup.
+    """
+    actx = actx_factory()
+
+    p = problem
+
+    sym_diffusion_u = sym_diffusion(p.dim, p.sym_alpha, p.sym_u)
+
+    sym_t = pmbl.var("t")
+    sym_f = sym.diff(sym_t)(p.sym_u) - sym_diffusion_u
+
+    from pytools.convergence import EOCRecorder
+    eoc_rec = EOCRecorder()
+
+    for n in scales:
+        mesh = p.get_mesh(n)
+
+        from grudge.eager import EagerDGDiscretization
+        from meshmode.discretization.poly_element import \
+                QuadratureSimplexGroupFactory, \
+                PolynomialWarpAndBlendGroupFactory
+        discr = EagerDGDiscretization(actx, mesh,
+                quad_tag_to_group_factory={
+                    QTAG_NONE: PolynomialWarpAndBlendGroupFactory(order),
+                    "quad": QuadratureSimplexGroupFactory(3*order),
+                    })
+
+        nodes = thaw(actx, discr.nodes())
+
+        def sym_eval(expr, t):
+            return sym.EvaluationMapper({"x": nodes, "t": t})(expr)
+
+        alpha = sym_eval(p.sym_alpha, 0.)
+        quad_tag = "quad" if isinstance(alpha, DOFArray) else QTAG_NONE
+
+        def get_rhs(t, u):
+            return (diffusion_operator(discr, quad_tag=quad_tag, alpha=alpha,
+                    boundaries=p.get_boundaries(discr, actx, t), u=u,
+                    scheme="sipg")
+                + sym_eval(sym_f, t))
+
+        t = 0.
+
+        u = sym_eval(p.sym_u, t)
+
+        from mirgecom.integrators import rk4_step
+
+        for istep in range(nsteps):
+            u = rk4_step(u, t, dt, get_rhs)
+            t += dt
+
+        expected_u = sym_eval(p.sym_u, t)
+
+        rel_linf_err = (
+            discr.norm(u - expected_u, np.inf)
+            / discr.norm(expected_u, np.inf))
+        eoc_rec.add_data_point(1./n, rel_linf_err)
+
+    print("L^inf error:")
+    print(eoc_rec)
+    assert (eoc_rec.order_estimate() >= order - 0.5
+                or eoc_rec.max_error() < 1e-11)
+
+
 @pytest.mark.parametrize("order", [1, 2, 3, 4])
 @pytest.mark.parametrize("problem",
     [
@@ -464,6 +538,265 @@ def test_diffusion_obj_array_vectorize(actx_factory):
     assert rel_linf_err < 1.e-5
 
 
+def _reference_diffusion_operator(discr, quad_tag, alpha, boundaries, u):
+    """Frozen copy of the original single-component diffusion operator.
+
+    Projects the diffusivity and evaluates the normals on every call, so that
+    it does not depend on any of the coefficients cached by
+    :class:`~mirgecom.diffusion.DiffusionOperator`.
+    """
+    from grudge.eager import interior_trace_pair, cross_rank_trace_pairs
+    from grudge.symbolic.primitives import DOFDesc, as_dofdesc
+
+    actx = u.array_context
+
+    def sqrt(x):
+        return actx.np.sqrt(x) if isinstance(x, DOFArray) else np.sqrt(x)
+
+    def q_flux(u_tpair):
+        dd_quad = u_tpair.dd.with_qtag(quad_tag)
+        normal_quad = thaw(actx, discr.normal(dd_quad))
+        sqrt_alpha_quad = sqrt(discr.project("vol", dd_quad, alpha))
+        u_avg_quad = discr.project(u_tpair.dd, dd_quad, u_tpair.avg)
+        return discr.project(dd_quad, dd_quad.with_dtag("all_faces"),
+            -sqrt_alpha_quad * u_avg_quad * normal_quad)
+
+    def u_flux(q_tpair):
+        dd_quad = q_tpair.dd.with_qtag(quad_tag)
+        normal_quad = thaw(actx, discr.normal(dd_quad))
+        sqrt_alpha_quad = sqrt(discr.project("vol", dd_quad, alpha))
+        q_avg_quad = discr.project(q_tpair.dd, dd_quad, q_tpair.avg)
+        return discr.project(dd_quad, dd_quad.with_dtag("all_faces"),
+            -sqrt_alpha_quad * np.dot(q_avg_quad, normal_quad))
+
+    dd_quad = DOFDesc("vol", quad_tag)
+    dd_allfaces_quad = DOFDesc("all_faces", quad_tag)
+
+    alpha_quad = discr.project("vol", dd_quad, alpha)
+    sqrt_alpha_quad = sqrt(alpha_quad)
+    grad_alpha_quad = discr.project("vol", dd_quad,
+        discr.grad(alpha) if isinstance(alpha, DOFArray) else 0.)
+
+    u_quad = discr.project("vol", dd_quad, u)
+
+    q = discr.inverse_mass(
+        discr.mass(dd_quad, -0.5/sqrt_alpha_quad * grad_alpha_quad * u_quad)
+        + discr.weak_grad(dd_quad, -sqrt_alpha_quad * u_quad)
+        - discr.face_mass(
+            dd_allfaces_quad,
+            q_flux(interior_trace_pair(discr, u))
+            + sum(
+                bdry.get_q_flux(discr, quad_tag, alpha, as_dofdesc(btag), u)
+                for btag, bdry in boundaries.items())
+            + sum(
+                q_flux(tpair) for tpair in cross_rank_trace_pairs(discr, u))))
+
+    q_quad = discr.project("vol", dd_quad, q)
+
+    return discr.inverse_mass(
+        discr.weak_div(dd_quad, -sqrt_alpha_quad*q_quad)
+        - discr.face_mass(
+            dd_allfaces_quad,
+            u_flux(interior_trace_pair(discr, q))
+            + sum(
+                bdry.get_u_flux(discr, quad_tag, alpha, as_dofdesc(btag), q)
+                for btag, bdry in boundaries.items())
+            + sum(
+                u_flux(tpair) for tpair in cross_rank_trace_pairs(discr, q))))
+
+
+@pytest.mark.parametrize("problem",
+    [
+        get_decaying_trig_truncated_domain(2, 2.),
+        get_static_trig_var_diff(2),
+    ])
+def test_diffusion_operator_object(actx_factory, problem):
+    """
+    Checks that a reusable DiffusionOperator with precomputed coefficients agrees
+    with a frozen copy of the original algorithm and with the exact diffusion
+    operator, for scalars and object arrays.
+    """
+    actx = actx_factory()
+
+    p = problem
+
+    mesh = p.get_mesh(8)
+
+    order = 3
+
+    from grudge.eager import EagerDGDiscretization
+    from meshmode.discretization.poly_element import \
+            QuadratureSimplexGroupFactory, \
+            PolynomialWarpAndBlendGroupFactory
+    discr = EagerDGDiscretization(actx, mesh,
+            quad_tag_to_group_factory={
+                QTAG_NONE: PolynomialWarpAndBlendGroupFactory(order),
+                "quad": QuadratureSimplexGroupFactory(3*order),
+                })
+
+    nodes = thaw(actx, discr.nodes())
+
+    def sym_eval(expr):
+        return sym.EvaluationMapper({"x": nodes, "t": 0.})(expr)
+
+    alpha = sym_eval(p.sym_alpha)
+    quad_tag = "quad" if isinstance(alpha, DOFArray) else QTAG_NONE
+
+    boundaries = p.get_boundaries(discr, actx, 0.)
+
+    u = sym_eval(p.sym_u)
+
+    reference = _reference_diffusion_operator(discr, quad_tag, alpha,
+        boundaries, u)
+
+    # The reference must itself approximate the exact operator
+    exact = sym_eval(sym_diffusion(p.dim, p.sym_alpha, p.sym_u))
+    assert discr.norm(reference - exact, np.inf) < 0.1 * discr.norm(exact, np.inf)
+
+    def rel_err(result, expected):
+        return (discr.norm(result - expected, np.inf)
+            / discr.norm(expected, np.inf))
+
+    op = DiffusionOperator(discr, quad_tag=quad_tag, alpha=alpha,
+        boundaries=boundaries)
+
+    # Apply twice to check that the cached quantities are reused correctly
+    for _ in range(2):
+        result = op(u)
+        assert isinstance(result, DOFArray)
+        assert rel_err(result, reference) < 1e-12
+
+    op_vector = DiffusionOperator(discr, quad_tag=quad_tag, alpha=alpha,
+        boundaries=[boundaries, boundaries])
+    result_vector = op_vector(make_obj_array([u, 2*u]))
+
+    assert result_vector.shape == (2,)
+    assert rel_err(result_vector[0], reference) < 1e-12
+    assert rel_err(result_vector[1], 2*reference) < 1e-12
+
+
+def test_diffusion_sipg_requires_exterior_values(actx_factory):
+    """
+    Checks that the interior penalty scheme rejects boundaries that do not
+    provide exterior values, while the default scheme accepts them.
+    """
+    actx = actx_factory()
+
+    p = get_decaying_trig(2, 1.)
+
+    from grudge.eager import EagerDGDiscretization
+    discr = EagerDGDiscretization(actx, p.get_mesh(4), order=2)
+
+    from mirgecom.diffusion import DiffusionBoundary
+
+    class FluxOnlyBoundary(DiffusionBoundary):
+        def __init__(self, bdry):
+            self.bdry = bdry
+
+        def get_q_flux(self, discr, quad_tag, alpha, dd, u):
+            return self.bdry.get_q_flux(discr, quad_tag, alpha, dd, u)
+
+        def get_u_flux(self, discr, quad_tag, alpha, dd, q):
+            return self.bdry.get_u_flux(discr, quad_tag, alpha, dd, q)
+
+    boundaries = {
+        btag: FluxOnlyBoundary(bdry)
+        for btag, bdry in p.get_boundaries(discr, actx, 0.).items()}
+
+    DiffusionOperator(discr, quad_tag=QTAG_NONE, alpha=1., boundaries=boundaries)
+
+    with pytest.raises(TypeError):
+        DiffusionOperator(discr, quad_tag=QTAG_NONE, alpha=1.,
+            boundaries=boundaries, scheme="sipg")
+
+
+@pytest.mark.parametrize("scheme", ["ldg", "sipg"])
+def test_diffusion_boundary_coefficients(actx_factory, scheme):
+    """
+    Checks that DiffusionOperator passes its precomputed coefficients to the
+    boundary methods that accept them, and that boundaries with the plain
+    signatures compute them on their own with the same result.
+    """
+    actx = actx_factory()
+
+    p = get_static_trig_var_diff(2)
+
+    order = 3
+
+    from grudge.eager import EagerDGDiscretization
+    from meshmode.discretization.poly_element import \
+            QuadratureSimplexGroupFactory, \
+            PolynomialWarpAndBlendGroupFactory
+    discr = EagerDGDiscretization(actx, p.get_mesh(8),
+            quad_tag_to_group_factory={
+                QTAG_NONE: PolynomialWarpAndBlendGroupFactory(order),
+                "quad": QuadratureSimplexGroupFactory(3*order),
+                })
+
+    nodes = thaw(actx, discr.nodes())
+
+    def sym_eval(expr):
+        return sym.EvaluationMapper({"x": nodes, "t": 0.})(expr)
+
+    alpha = sym_eval(p.sym_alpha)
+    u = sym_eval(p.sym_u)
+
+    from mirgecom.diffusion import DiffusionBoundary
+
+    class PlainBoundary(DiffusionBoundary):
+        def __init__(self, bdry):
+            self.bdry = bdry
+
+        def get_q_flux(self, discr, quad_tag, alpha, dd, u):
+            return self.bdry.get_q_flux(discr, quad_tag, alpha, dd, u)
+
+        def get_u_flux(self, discr, quad_tag, alpha, dd, q):
+            return self.bdry.get_u_flux(discr, quad_tag, alpha, dd, q)
+
+        def get_sipg_exterior_values(self, discr, alpha, dd, u_int,
+                                     alpha_grad_u_int):
+            return self.bdry.get_sipg_exterior_values(discr, alpha, dd, u_int,
+                alpha_grad_u_int)
+
+    received = []
+
+    class RecordingBoundary(PlainBoundary):
+        def get_q_flux(self, discr, quad_tag, alpha, dd, u, *,
+                       alpha_quad=None, sqrt_alpha_quad=None, normal_quad=None):
+            received.append(sqrt_alpha_quad is not None
+                            and normal_quad is not None)
+            return self.bdry.get_q_flux(discr, quad_tag, alpha, dd, u,
+                sqrt_alpha_quad=sqrt_alpha_quad, normal_quad=normal_quad)
+
+        def get_sipg_exterior_values(self, discr, alpha, dd, u_int,
+                                     alpha_grad_u_int, *, alpha_int=None,
+                                     normal=None):
+            received.append(alpha_int is not None and normal is not None)
+            return self.bdry.get_sipg_exterior_values(discr, alpha, dd, u_int,
+                alpha_grad_u_int, alpha_int=alpha_int, normal=normal)
+
+    boundaries = p.get_boundaries(discr, actx, 0.)
+
+    def apply(bdry_cls):
+        bdries = {
+            btag: bdry if bdry_cls is None else bdry_cls(bdry)
+            for btag, bdry in boundaries.items()}
+        return DiffusionOperator(discr, quad_tag="quad", alpha=alpha,
+            boundaries=bdries, scheme=scheme)(u)
+
+    expected = apply(None)
+
+    def rel_err(result):
+        return (discr.norm(result - expected, np.inf)
+            / discr.norm(expected, np.inf))
+
+    assert rel_err(apply(PlainBoundary)) < 1e-12
+    assert not received
+
+    assert rel_err(apply(RecordingBoundary)) < 1e-12
+    assert received and all(received)
+
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1:
@@ -0,0 +1,237 @@
+"""Test the diffusion operator on partitioned meshes."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import os
+import sys
+import numpy as np
+import pyopencl as cl
+import pyopencl.tools as cl_tools
+import logging
+import pytest
+
+from pytools.obj_array import make_obj_array
+from meshmode.array_context import PyOpenCLArrayContext
+from meshmode.dof_array import DOFArray, thaw
+from grudge.eager import EagerDGDiscretization
+from grudge.symbolic.primitives import QTAG_NONE
+
+import mirgecom.symbolic as sym
+from mirgecom.diffusion import diffusion_operator, DiffusionOperator
+from mirgecom.exchange import free_exchange_resources
+
+logger = logging.getLogger(__name__)
+
+
+def _make_partitioned_discr(actx, comm, mesh_factory, order):
+    """Distribute the mesh from *mesh_factory* and discretize the local part."""
+    from meshmode.distributed import MPIMeshDistributor, get_partition_by_pymetis
+    mesh_dist = MPIMeshDistributor(comm)
+    num_parts = comm.Get_size()
+
+    if mesh_dist.is_mananger_rank():
+        mesh = mesh_factory()
+        part_per_element = get_partition_by_pymetis(mesh, num_parts)
+        local_mesh = mesh_dist.send_mesh_parts(mesh, part_per_element, num_parts)
+    else:
+        local_mesh = mesh_dist.receive_mesh_part()
+
+    from meshmode.discretization.poly_element import \
+            QuadratureSimplexGroupFactory, \
+            PolynomialWarpAndBlendGroupFactory
+    return EagerDGDiscretization(actx, local_mesh,
+        quad_tag_to_group_factory={
+            QTAG_NONE: PolynomialWarpAndBlendGroupFactory(order),
+            "quad": QuadratureSimplexGroupFactory(3*order),
+        },
+        mpi_communicator=comm)
+
+
+def _test_diffusion_object_array_within_mpi():
+    """Compare the batched operator to a per-component reference."""
+    cl_ctx = cl.create_some_context()
+    queue = cl.CommandQueue(cl_ctx)
+    actx = PyOpenCLArrayContext(queue,
+        allocator=cl_tools.MemoryPool(cl_tools.ImmediateAllocator(queue)))
+
+    from mpi4py import MPI
+    comm = MPI.COMM_WORLD
+
+    from test_diffusion import (
+        get_static_trig_var_diff,
+        sym_diffusion,
+        _reference_diffusion_operator)
+
+    p = get_static_trig_var_diff(2)
+    discr = _make_partitioned_discr(actx, comm, lambda: p.get_mesh(8), order=3)
+    assert discr.connected_ranks()
+
+    nodes = thaw(actx, discr.nodes())
+
+    def sym_eval(expr):
+        return sym.EvaluationMapper({"x": nodes, "t": 0.})(expr)
+
+    alpha = sym_eval(p.sym_alpha)
+    boundaries = p.get_boundaries(discr, actx, 0.)
+
+    u = sym_eval(p.sym_u)
+    components = make_obj_array([u, nodes[0]*u, 2*u + nodes[1]])
+
+    op = DiffusionOperator(discr, quad_tag="quad", alpha=alpha,
+        boundaries=[boundaries]*len(components))
+    result = op(components)
+
+    assert result.shape == components.shape
+
+    # Each component must match the original operator applied on its own, which
+    # exchanges it separately through grudge
+    for result_i, u_i in zip(result, components):
+        expected_i = _reference_diffusion_operator(discr, "quad", alpha,
+            boundaries, u_i)
+        assert isinstance(result_i, DOFArray)
+        assert discr.norm(result_i - expected_i, np.inf) < 1e-12 * (
+            discr.norm(expected_i, np.inf))
+
+    exact = sym_eval(sym_diffusion(p.dim, p.sym_alpha, p.sym_u))
+    assert discr.norm(result[0] - exact, np.inf) < 0.1 * (
+        discr.norm(exact, np.inf))
+
+    free_exchange_resources(discr)
+
+
+def _global_l2_error(discr, result, exact):
+    """Return the $L^2$ norm of *result* - *exact* over all ranks."""
+    local_error_squared = discr.norm(result - exact, 2)**2
+
+    comm = discr.mpi_communicator
+    if comm is None:
+        return np.sqrt(local_error_squared)
+
+    from mpi4py import MPI
+    return np.sqrt(comm.allreduce(local_error_squared, op=MPI.SUM))
+
+
+def _test_diffusion_sipg_within_mpi():
+    """Compare the interior penalty scheme on a partitioned and a serial mesh."""
+    cl_ctx = cl.create_some_context()
+    queue = cl.CommandQueue(cl_ctx)
+    actx = PyOpenCLArrayContext(queue,
+        allocator=cl_tools.MemoryPool(cl_tools.ImmediateAllocator(queue)))
+
+    from mpi4py import MPI
+    comm = MPI.COMM_WORLD
+
+    from test_diffusion import get_static_trig_var_diff, sym_diffusion
+
+    p = get_static_trig_var_diff(2)
+    order = 3
+
+    def get_error(discr):
+        nodes = thaw(actx, discr.nodes())
+
+        def sym_eval(expr):
+            return sym.EvaluationMapper({"x": nodes, "t": 0.})(expr)
+
+        alpha = sym_eval(p.sym_alpha)
+        u = sym_eval(p.sym_u)
+        exact = sym_eval(sym_diffusion(p.dim, p.sym_alpha, p.sym_u))
+
+        result = diffusion_operator(discr, quad_tag="quad", alpha=alpha,
+            boundaries=p.get_boundaries(discr, actx, 0.), u=u, scheme="sipg")
+
+        return (_global_l2_error(discr, result, exact),
+                _global_l2_error(discr, 0*exact, exact))
+
+    discr = _make_partitioned_discr(actx, comm, lambda: p.get_mesh(8), order)
+    assert discr.connected_ranks()
+
+    error, exact_norm = get_error(discr)
+
+    # The element sizes on the faces, including the exchanged ones, are cached,
+    # so a second application gives the same result
+    assert get_error(discr)[0] == error
+
+    free_exchange_resources(discr)
+
+    # Every rank discretizes the whole mesh on its own for comparison
+    from meshmode.discretization.poly_element import \
+            QuadratureSimplexGroupFactory, \
+            PolynomialWarpAndBlendGroupFactory
+    serial_discr = EagerDGDiscretization(actx, p.get_mesh(8),
+        quad_tag_to_group_factory={
+            QTAG_NONE: PolynomialWarpAndBlendGroupFactory(order),
+            "quad": QuadratureSimplexGroupFactory(3*order),
+        })
+
+    serial_error, serial_exact_norm = get_error(serial_discr)
+
+    assert abs(exact_norm - serial_exact_norm) < 1e-10 * serial_exact_norm
+    assert abs(error - serial_error) < 1e-8 * serial_error
+    assert error < 0.1 * exact_norm
+
+
+@pytest.mark.mpi
+@pytest.mark.parametrize("num_ranks", [2, 3])
+def test_diffusion_object_array_mpi(num_ranks):
+    """Check the batched diffusion operator on a partitioned mesh."""
+    pytest.importorskip("mpi4py")
+
+    newenv = os.environ.copy()
+    newenv["RUN_WITHIN_MPI"] = "1"
+    newenv["TEST"] = "object_array"
+
+    from subprocess import check_call
+    check_call([
+        "mpiexec", "-n", str(num_ranks), sys.executable, "-m", "mpi4py",
+        __file__], env=newenv)
+
+
+@pytest.mark.mpi
+@pytest.mark.parametrize("num_ranks", [2, 3])
+def test_diffusion_sipg_mpi(num_ranks):
+    """Check the interior penalty scheme on a partitioned mesh."""
+    pytest.importorskip("mpi4py")
+
+    newenv = os.environ.copy()
+    newenv["RUN_WITHIN_MPI"] = "1"
+    newenv["TEST"] = "sipg"
+
+    from subprocess import check_call
+    check_call([
+        "mpiexec", "-n", str(num_ranks), sys.executable, "-m", "mpi4py",
+        __file__], env=newenv)
+
+
+if __name__ == "__main__":
+    if "RUN_WITHIN_MPI" in os.environ:
+        # Make the helpers of test_diffusion importable
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        {
+            "object_array": _test_diffusion_object_array_within_mpi,
+            "sipg": _test_diffusion_sipg_within_mpi,
+        }[os.environ["TEST"]]()
+    else:
+        from pytest import main
+        main([__file__])
@@ -413,6 +413,54 @@ def test_facial_flux(actx_factory, nspecies, order, dim):
     )
 
 
+@pytest.mark.parametrize("dim", [2, 3])
+def test_domain_boundary_flux(actx_factory, dim):
+    """Check that the fluxes across several tagged boundaries, summed on the
+    domain boundary, match the sum of the separately projected fluxes.
+    """
+    actx = actx_factory()
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    from grudge import sym as grudge_sym
+
+    axes = ["x", "y", "z"][:dim]
+    mesh = generate_regular_rect_mesh(
+        a=(-0.5,) * dim, b=(0.5,) * dim, n=(4,) * dim,
+        boundary_tag_to_face={
+            f"{side}{axis}": [f"{side}{axis}"]
+            for axis in axes for side in ["-", "+"]})
+
+    discr = EagerDGDiscretization(actx, mesh, order=2)
+    nodes = thaw(actx, discr.nodes())
+    eos = IdealSingleGas()
+
+    from mirgecom.initializers import Uniform
+    q = Lump(dim=dim, velocity=np.ones(dim))(nodes)
+    boundary_state = Uniform(dim=dim)
+
+    from mirgecom.euler import _facial_flux, _domain_boundary_flux
+
+    q_tpairs = [
+        PrescribedBoundary(boundary_state).boundary_pair(
+            discr, q, btag=grudge_sym.DTAG_BOUNDARY(f"{side}{axis}"), eos=eos,
+            t=0.0)
+        for axis in axes for side in ["-", "+"]]
+
+    expected = sum(_facial_flux(discr, eos=eos, q_tpair=tpair)
+                   for tpair in q_tpairs)
+
+    # Twice, to check the cached connections
+    for _ in range(2):
+        result = _domain_boundary_flux(discr, eos, q_tpairs)
+        err = discr.norm(result - expected, np.inf, dd="all_faces")
+        assert err < 1e-12 * discr.norm(expected, np.inf, dd="all_faces")
+
+    # Fewer than two boundaries are projected directly
+    result = _domain_boundary_flux(discr, eos, q_tpairs[:1])
+    expected = _facial_flux(discr, eos=eos, q_tpair=q_tpairs[0])
+    assert discr.norm(result - expected, np.inf, dd="all_faces") == 0
+
+
 @pytest.mark.parametrize("nspecies", [0, 10])
 @pytest.mark.parametrize("dim", [1, 2, 3])
 @pytest.mark.parametrize("order", [1, 2, 3])
@@ -0,0 +1,162 @@
+"""Test the exchange of partition boundary traces."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import os
+import sys
+import numpy as np
+import pyopencl as cl
+import pyopencl.tools as cl_tools
+import logging
+import pytest
+
+from pytools.obj_array import make_obj_array
+from meshmode.array_context import PyOpenCLArrayContext
+from meshmode.dof_array import DOFArray, thaw
+from grudge.eager import EagerDGDiscretization
+from meshmode.array_context import (  # noqa
+    pytest_generate_tests_for_pyopencl_array_context
+    as pytest_generate_tests)
+
+from mirgecom.exchange import (
+    cross_rank_trace_pairs,
+    cross_rank_trace_pairs_many,
+    configure_exchange,
+    free_exchange_resources,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def test_cross_rank_trace_pairs_serial(actx_factory):
+    """Check that a discretization without communicator has no trace pairs."""
+    actx = actx_factory()
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mesh = generate_regular_rect_mesh(a=(-0.5,)*2, b=(0.5,)*2, n=(4,)*2)
+    discr = EagerDGDiscretization(actx, mesh, order=2)
+
+    u = thaw(actx, discr.nodes())[0]
+    assert cross_rank_trace_pairs(discr, u) == []
+    assert cross_rank_trace_pairs_many(discr, [u, 1]) == [[], []]
+
+
+def _check_trace_pairs(discr, result, expected):
+    """Check that two lists of trace pairs agree, regardless of their order."""
+    assert len(result) == len(expected)
+
+    expected_by_dd = {tpair.dd: tpair for tpair in expected}
+    for tpair in result:
+        expected_tpair = expected_by_dd[tpair.dd]
+        for actual, desired in [(tpair.int, expected_tpair.int),
+                                (tpair.ext, expected_tpair.ext)]:
+            for actual_i, desired_i in zip(actual, desired):
+                assert discr.norm(actual_i - desired_i, np.inf, dd=tpair.dd) \
+                    < 1e-14
+
+
+def _test_cross_rank_trace_pairs_within_mpi(use_shared_memory):
+    """Compare the exchange to grudge's on a partitioned mesh."""
+    cl_ctx = cl.create_some_context()
+    queue = cl.CommandQueue(cl_ctx)
+    actx = PyOpenCLArrayContext(queue,
+        allocator=cl_tools.MemoryPool(cl_tools.ImmediateAllocator(queue)))
+
+    from mpi4py import MPI
+    comm = MPI.COMM_WORLD
+    num_parts = comm.Get_size()
+
+    from meshmode.distributed import MPIMeshDistributor, get_partition_by_pymetis
+    mesh_dist = MPIMeshDistributor(comm)
+
+    dim = 2
+    if mesh_dist.is_mananger_rank():
+        from meshmode.mesh.generation import generate_regular_rect_mesh
+        mesh = generate_regular_rect_mesh(a=(-0.5,)*dim, b=(0.5,)*dim,
+                                          n=(8,)*dim)
+        part_per_element = get_partition_by_pymetis(mesh, num_parts)
+        local_mesh = mesh_dist.send_mesh_parts(mesh, part_per_element, num_parts)
+    else:
+        local_mesh = mesh_dist.receive_mesh_part()
+
+    discr = EagerDGDiscretization(actx, local_mesh, order=2,
+                                  mpi_communicator=comm)
+    nodes = thaw(actx, discr.nodes())
+    fields = make_obj_array([nodes[0], nodes[1]**2, nodes[0]*nodes[1] + 1])
+
+    from grudge.eager import cross_rank_trace_pairs as grudge_trace_pairs
+    expected = grudge_trace_pairs(discr, fields)
+
+    with configure_exchange(discr, max_components=3,
+                            use_shared_memory=use_shared_memory):
+        # within the window capacity
+        _check_trace_pairs(discr, cross_rank_trace_pairs(discr, fields), expected)
+
+        # a tag offset that overlapped the internal tags of earlier versions
+        _check_trace_pairs(discr, cross_rank_trace_pairs(discr, fields, tag=150),
+                           expected)
+
+        # beyond the window capacity, exchanged through point-to-point messages
+        wide_fields = make_obj_array([*fields, *(2*fields)])
+        wide_result, = cross_rank_trace_pairs_many(discr, [wide_fields])
+        _check_trace_pairs(discr, wide_result,
+                           grudge_trace_pairs(discr, wide_fields))
+
+        single = DOFArray(actx, tuple(ary.astype(np.float32) for ary in nodes[0]))
+        with pytest.raises(ValueError):
+            cross_rank_trace_pairs(discr, make_obj_array([nodes[0], single]))
+
+    # Freed collectively on exit, a later exchange sets it up again
+    from mirgecom.exchange import _exchangers
+    assert discr not in _exchangers
+    _check_trace_pairs(discr, cross_rank_trace_pairs(discr, fields), expected)
+    free_exchange_resources(discr)
+    assert discr not in _exchangers
+
+
+@pytest.mark.mpi
+@pytest.mark.parametrize("num_ranks", [2, 3])
+@pytest.mark.parametrize("use_shared_memory", [True, False])
+def test_cross_rank_trace_pairs_mpi(num_ranks, use_shared_memory):
+    """Check that the exchange agrees with grudge's under MPI."""
+    pytest.importorskip("mpi4py")
+
+    newenv = os.environ.copy()
+    newenv["RUN_WITHIN_MPI"] = "1"
+    newenv["USE_SHARED_MEMORY"] = str(int(use_shared_memory))
+
+    from subprocess import check_call
+    check_call([
+        "mpiexec", "-n", str(num_ranks), sys.executable, "-m", "mpi4py",
+        __file__], env=newenv)
+
+
+if __name__ == "__main__":
+    if "RUN_WITHIN_MPI" in os.environ:
+        _test_cross_rank_trace_pairs_within_mpi(
+            bool(int(os.environ["USE_SHARED_MEMORY"])))
+    else:
+        from pytest import main
+        main([__file__])
@@ -0,0 +1,140 @@
+"""Test the cache of geometric quantities."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import numpy as np
+import logging
+import pytest
+
+from meshmode.dof_array import thaw
+from meshmode.mesh import BTAG_ALL
+from grudge.eager import EagerDGDiscretization
+from meshmode.array_context import (  # noqa
+    pytest_generate_tests_for_pyopencl_array_context
+    as pytest_generate_tests)
+
+from mirgecom.geometry import get_geometry, invalidate_geometry
+
+logger = logging.getLogger(__name__)
+
+
+def _make_discr(actx, dim=2, n=4):
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mesh = generate_regular_rect_mesh(a=(-1.,)*dim, b=(1.,)*dim, n=(n,)*dim)
+    return EagerDGDiscretization(actx, mesh, order=2)
+
+
+def test_geometry_cache(actx_factory):
+    """Check that cached quantities are computed once and are correct."""
+    actx = actx_factory()
+    discr = _make_discr(actx)
+
+    geometry = get_geometry(discr, actx)
+    assert get_geometry(discr, actx) is geometry
+    assert geometry.discr is discr
+
+    nodes = geometry.nodes()
+    assert geometry.nodes("vol") is nodes
+    assert discr.norm(nodes - thaw(actx, discr.nodes()), np.inf) < 1e-15
+
+    normal = geometry.normal(BTAG_ALL)
+    assert geometry.normal(BTAG_ALL) is normal
+    assert discr.norm(normal - thaw(actx, discr.normal(BTAG_ALL)), np.inf,
+                      dd=BTAG_ALL) < 1e-15
+
+    assert geometry.element_size() is geometry.element_size()
+    assert geometry.volume_jacobian() is geometry.volume_jacobian()
+    assert geometry.face_jacobian(BTAG_ALL) is geometry.face_jacobian(BTAG_ALL)
+
+    # For the right triangles of a 3x3 grid of squares of side 2/3, h is
+    # area/perimeter = (2/9)/(4/3 + 2*sqrt(2)/3)
+    expected_h = (2/9) / (4/3 + 2*np.sqrt(2)/3)
+    assert discr.norm(geometry.element_size() - expected_h, np.inf) < 1e-12
+
+    int_h = geometry.face_element_size("int_faces")
+    assert geometry.face_element_size("int_faces") is int_h
+    assert discr.norm(int_h - expected_h, np.inf, dd="int_faces") < 1e-12
+
+
+def test_geometry_cache_is_read_only(actx_factory):
+    """Check that in-place updates cannot corrupt the shared arrays."""
+    actx = actx_factory()
+    discr = _make_discr(actx)
+
+    geometry = get_geometry(discr, actx)
+    normal = geometry.normal(BTAG_ALL)
+    expected = thaw(actx, discr.normal(BTAG_ALL))
+
+    with pytest.raises(ValueError):
+        normal *= -1
+    with pytest.raises(ValueError):
+        normal[0] = 0*normal[0]
+
+    # Out-of-place operations work as usual
+    flipped = -normal
+    assert discr.norm(flipped + expected, np.inf, dd=BTAG_ALL) < 1e-15
+    assert geometry.normal(BTAG_ALL) is normal
+    assert discr.norm(normal - expected, np.inf, dd=BTAG_ALL) < 1e-15
+
+
+def test_geometry_invalidate(actx_factory):
+    """Check that invalidating the cache recomputes its quantities."""
+    actx = actx_factory()
+    discr = _make_discr(actx)
+
+    geometry = get_geometry(discr, actx)
+    nodes = geometry.nodes()
+    normal = geometry.normal(BTAG_ALL)
+
+    geometry.invalidate()
+    assert geometry.nodes() is not nodes
+    assert geometry.normal(BTAG_ALL) is not normal
+    assert discr.norm(geometry.nodes() - nodes, np.inf) < 1e-15
+
+    nodes = geometry.nodes()
+    invalidate_geometry(discr)
+    new_geometry = get_geometry(discr, actx)
+    assert new_geometry is not geometry
+    assert new_geometry.nodes() is not nodes
+
+    # A different array context replaces the cache
+    other_actx = actx_factory()
+    assert get_geometry(discr, other_actx) is not new_geometry
+    assert get_geometry(discr, other_actx).actx is other_actx
+
+    # Caches of other discretizations are not affected
+    other_discr = _make_discr(actx, n=5)
+    other_geometry = get_geometry(other_discr, actx)
+    invalidate_geometry(discr)
+    assert get_geometry(other_discr, actx) is other_geometry
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        exec(sys.argv[1])
+    else:
+        from pytest import main
+        main([__file__])
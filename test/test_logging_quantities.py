@@ -0,0 +1,193 @@
+"""Test the time series logging quantities."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import numpy as np
+import logging
+import pytest  # noqa
+
+from pytools.obj_array import make_obj_array
+from meshmode.dof_array import thaw
+from grudge.eager import EagerDGDiscretization
+from meshmode.array_context import (  # noqa
+    pytest_generate_tests_for_pyopencl_array_context
+    as pytest_generate_tests)
+
+from mirgecom.exchange import get_exchange_statistics, write_communication_matrix
+from mirgecom.logging_quantities import (
+    CommunicationProfile,
+    DiscretizationBasedQuantity,
+    DiscretizationBasedQuantityGroup,
+    StateConsumer,
+    set_sim_state,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _SerialDiscretization:
+    """Stands in for a discretization without a communicator."""
+
+    mpi_communicator = None
+
+
+def test_communication_profile():
+    """Check that the profile logs the statistics since the previous call."""
+    discr = _SerialDiscretization()
+    stats = get_exchange_statistics(discr)
+    profile = CommunicationProfile(discr)
+
+    def record_exchange(wait_times):
+        stats.num_exchanges += 1
+        for remote_rank, wait_time in wait_times.items():
+            stats[remote_rank].messages_sent += 1
+            stats[remote_rank].messages_received += 1
+            stats[remote_rank].bytes_sent += 1024*1024
+            stats[remote_rank].bytes_received += 2*1024*1024
+            stats[remote_rank].wait_time += wait_time
+
+    record_exchange({1: 0.5, 2: 1.})
+    record_exchange({1: 0.5, 2: 1.})
+    assert profile() == [2, 4, 4., 8., 3., 2.]
+
+    record_exchange({1: 2., 2: 1.})
+    assert profile() == [1, 2, 2., 4., 3., 2.]
+
+    assert profile() == [0, 0, 0., 0., 0., 0.]
+
+    # after a reset, the profile starts over
+    stats.reset()
+    record_exchange({3: 0.25})
+    assert profile() == [1, 1, 1., 2., 0.25, 0.25]
+
+
+def test_write_communication_matrix(tmp_path):
+    """Check the communication matrix written by a single rank."""
+    discr = _SerialDiscretization()
+    stats = get_exchange_statistics(discr)
+    stats[0].messages_received = 3
+    stats[0].bytes_received = 24
+    stats[0].wait_time = 0.5
+
+    write_communication_matrix(discr, str(tmp_path / "comm.csv"))
+    with open(tmp_path / "comm.csv") as inf:
+        lines = inf.read().splitlines()
+    assert lines == ["sender,receiver,messages,bytes,receiver_wait_time",
+                     "0,0,3,24,0.5"]
+
+    import json
+    write_communication_matrix(discr, str(tmp_path / "comm.json"))
+    with open(tmp_path / "comm.json") as inf:
+        matrices = json.load(inf)
+    assert matrices["nranks"] == 1
+    assert np.array_equal(matrices["bytes"], [[24]])
+
+
+class _GatherDescriptor:
+    def __init__(self, quantity):
+        self.quantity = quantity
+
+
+class _LogManager:
+    """Stands in for a :class:`logpyle.LogManager` with some state consumers."""
+
+    def __init__(self, before, after):
+        self.before_gather_descriptors = [_GatherDescriptor(q) for q in before]
+        self.after_gather_descriptors = [_GatherDescriptor(q) for q in after]
+
+
+def test_deferred_state_vars():
+    """Check that the state variables are extracted once, on first access."""
+    calls = []
+
+    def extract_vars(dim, state, eos):
+        calls.append(state)
+        return {"mass": state}
+
+    def other_extract_vars(dim, state, eos):
+        return {"energy": 2*state}
+
+    consumers = [StateConsumer(extract_vars), StateConsumer(extract_vars)]
+    other = StateConsumer(other_extract_vars)
+    mgr = _LogManager(consumers[:1], [consumers[1], other])
+
+    set_sim_state(mgr, 2, 1., eos=None)
+    assert calls == []
+
+    assert consumers[0].state_vars == {"mass": 1.}
+    assert consumers[1].state_vars == {"mass": 1.}
+    assert consumers[0].state_vars == {"mass": 1.}
+    assert other.state_vars == {"energy": 2.}
+    assert calls == [1.]
+
+    # a new state is extracted again, and only if it is accessed
+    set_sim_state(mgr, 2, 3., eos=None)
+    set_sim_state(mgr, 2, 4., eos=None)
+    assert consumers[1].state_vars == {"mass": 4.}
+    assert calls == [1., 4.]
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_discretization_based_quantity_group(actx_factory, dim):
+    """Check that the group evaluates the same values as single quantities."""
+    actx = actx_factory()
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    # more elements than one chunk of the group's reduction kernel
+    mesh = generate_regular_rect_mesh(a=(-0.5,)*dim, b=(1.,)*dim,
+                                      n=(8 if dim < 3 else 5,)*dim)
+    discr = EagerDGDiscretization(actx, mesh, order=3)
+    nodes = thaw(actx, discr.nodes())
+
+    state_vars = {
+        "mass": 1 + actx.np.exp(-np.dot(nodes, nodes)),
+        "momentum": make_obj_array([nodes[i] - 0.25*i for i in range(dim)]),
+        }
+
+    def extract_vars(dim, state, eos):
+        return state_vars
+
+    def units(quantity):
+        return "1"
+
+    reductions = [(quantity, op, axis)
+                  for op in ["min", "max", "L2_norm"]
+                  for quantity, axis in [("mass", None)]
+                  + [("momentum", i) for i in range(dim)]]
+
+    group = DiscretizationBasedQuantityGroup(discr, reductions, extract_vars,
+                                             units)
+    assert group() == [None] * len(reductions)
+
+    group.set_state_vars(state_vars)
+    values = group()
+
+    for (quantity, op, axis), value in zip(reductions, values):
+        single = DiscretizationBasedQuantity(discr, quantity, op, extract_vars,
+                                             units, axis=axis)
+        single.set_state_vars(state_vars)
+        expected = single()
+        logger.info(f"{op}_{quantity}{axis}: {value} {expected}")
+        assert abs(value - expected) <= 1e-12 * abs(expected)
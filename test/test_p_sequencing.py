@@ -0,0 +1,286 @@
+"""Test transfer of fields between discretization orders."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import numpy as np
+import logging
+import pytest
+
+from pytools.obj_array import make_obj_array
+from meshmode.dof_array import thaw
+from grudge.eager import EagerDGDiscretization
+from meshmode.array_context import (  # noqa
+    pytest_generate_tests_for_pyopencl_array_context
+    as pytest_generate_tests)
+
+from mirgecom.p_sequencing import OrderChange
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+@pytest.mark.parametrize(("low_order", "high_order"), [(1, 3), (2, 4)])
+def test_order_change(actx_factory, dim, low_order, high_order):
+    """Check that prolongation is exact and that restriction undoes it."""
+    actx = actx_factory()
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mesh = generate_regular_rect_mesh(
+        a=(-0.5,)*dim, b=(0.5,)*dim, n=(4,)*dim)
+
+    low_discr = EagerDGDiscretization(actx, mesh, order=low_order)
+    high_discr = EagerDGDiscretization(actx, mesh, order=high_order)
+
+    def poly(discr):
+        # degree low_order, so it is represented exactly by both discretizations
+        nodes = thaw(actx, discr.nodes())
+        return 1 + sum(nodes[i]**(low_order - i % low_order)
+                       for i in range(dim))
+
+    u_low = poly(low_discr)
+    fields = np.empty((2, 1), dtype=object)
+    fields[0, 0] = u_low
+    fields[1, 0] = 2*u_low
+
+    prolong = OrderChange(actx, low_discr, high_discr)
+    restrict = OrderChange(actx, high_discr, low_discr)
+
+    u_high = prolong(fields)
+    assert u_high.shape == fields.shape
+
+    prolong_err = high_discr.norm(u_high[0, 0] - poly(high_discr), np.inf)
+    roundtrip_err = low_discr.norm(restrict(u_high)[1, 0] - 2*u_low, np.inf)
+    logger.info(f"prolongation error: {prolong_err}, "
+                f"roundtrip error: {roundtrip_err}")
+
+    assert prolong_err < 1e-10
+    assert roundtrip_err < 1e-10
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+@pytest.mark.parametrize(("low_order", "high_order"), [(1, 3), (2, 4)])
+def test_restriction_is_l2_projection(actx_factory, dim, low_order, high_order):
+    """Check that restriction yields the :math:`L^2` projection.
+
+    The error of restricting a polynomial of degree *high_order* must be
+    orthogonal to all polynomials of degree *low_order*.
+    """
+    actx = actx_factory()
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mesh = generate_regular_rect_mesh(
+        a=(-0.5,)*dim, b=(0.5,)*dim, n=(3,)*dim)
+
+    low_discr = EagerDGDiscretization(actx, mesh, order=low_order)
+    high_discr = EagerDGDiscretization(actx, mesh, order=high_order)
+
+    nodes = thaw(actx, high_discr.nodes())
+    u_high = 1 + sum(nodes[i]**(high_order - i) for i in range(dim))
+
+    u_low = OrderChange(actx, high_discr, low_discr)(u_high)
+    err = OrderChange(actx, low_discr, high_discr)(u_low) - u_high
+
+    # not representable at the lower order, so the restriction is not exact
+    assert high_discr.norm(err, np.inf) > 1e-3
+
+    # err and the test polynomials are of degree at most high_order, so the
+    # nodal mass matrix integrates their product exactly
+    from meshmode.dof_array import flatten
+    mass_err = actx.to_numpy(flatten(high_discr.mass(err)))
+
+    from pytools import generate_nonnegative_integer_tuples_summing_to_at_most
+    for exponents in generate_nonnegative_integer_tuples_summing_to_at_most(
+            low_order, dim):
+        test_poly = 1 + 0*nodes[0]
+        for i, exponent in enumerate(exponents):
+            test_poly = test_poly * nodes[i]**exponent
+
+        inner_product = np.dot(actx.to_numpy(flatten(test_poly)), mass_err)
+        logger.info(f"exponents {exponents}: inner product {inner_product}")
+        assert abs(inner_product) < 1e-12
+
+
+def test_order_change_rejects_tensor_product_groups(actx_factory):
+    """Check that the transfer matrix is only built for simplex groups."""
+    actx = actx_factory()
+
+    from meshmode.mesh import TensorProductElementGroup
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mesh = generate_regular_rect_mesh(
+        a=(-0.5,)*2, b=(0.5,)*2, n=(3,)*2,
+        group_cls=TensorProductElementGroup)
+
+    from meshmode.discretization import Discretization
+    from meshmode.discretization.poly_element import (
+        LegendreGaussLobattoTensorProductGroupFactory)
+    discr = Discretization(actx, mesh,
+        LegendreGaussLobattoTensorProductGroupFactory(order=2))
+
+    from mirgecom.p_sequencing import make_order_change_matrix
+    with pytest.raises(TypeError):
+        make_order_change_matrix(discr.groups[0], discr.groups[0])
+
+
+@pytest.mark.parametrize("stop_early", [False, True])
+def test_advance_state_p_sequenced(actx_factory, stop_early):
+    """Check a two-stage run of an exponential decay.
+
+    A stage stopped by its timestep function must end the run.
+    """
+    actx = actx_factory()
+
+    dim = 2
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mesh = generate_regular_rect_mesh(
+        a=(-0.5,)*dim, b=(0.5,)*dim, n=(3,)*dim)
+
+    low_discr = EagerDGDiscretization(actx, mesh, order=1)
+    high_discr = EagerDGDiscretization(actx, mesh, order=3)
+
+    nodes = thaw(actx, low_discr.nodes())
+    state = make_obj_array([1 + nodes[0] - 2*nodes[1]])
+
+    dt = 1/32
+    nsteps = 4
+
+    def rhs(t, state):
+        return -state
+
+    high_rhs_calls = []
+
+    def high_rhs(t, state):
+        high_rhs_calls.append(t)
+        return -state
+
+    low_steps = []
+
+    def low_timestep(state):
+        if stop_early and len(low_steps) == 2:
+            return -1
+        low_steps.append(dt)
+        return dt
+
+    from mirgecom.integrators import rk4_step
+    from mirgecom.p_sequencing import OrderStage, advance_state_p_sequenced
+    stages = [
+        OrderStage(discr=low_discr, rhs=rhs, t_final=nsteps*dt,
+                   get_timestep=low_timestep),
+        OrderStage(discr=high_discr, rhs=high_rhs, t_final=2*nsteps*dt,
+                   get_timestep=lambda state: dt),
+    ]
+
+    istep, t, result = advance_state_p_sequenced(stages, rk4_step, state)
+
+    # amplification factor of RK4 applied to du/dt = -u
+    amplification = 1 - dt + dt**2/2 - dt**3/6 + dt**4/24
+
+    if stop_early:
+        assert istep == 2
+        assert t == 2*dt
+        assert not high_rhs_calls
+        result_discr = low_discr
+        expected = amplification**2 * state
+    else:
+        assert istep == 2*nsteps
+        assert t == 2*nsteps*dt
+        assert high_rhs_calls
+        result_discr = high_discr
+        expected = (amplification**(2*nsteps)
+                    * OrderChange(actx, low_discr, high_discr)(state))
+
+    err = result_discr.norm(result[0] - expected[0], np.inf)
+    logger.info(f"error: {err}")
+    assert err < 1e-12
+
+
+def test_advance_state_p_sequenced_logging(actx_factory):
+    """Check that the logged quantities follow the state to the next stage."""
+    actx = actx_factory()
+
+    dim = 2
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mesh = generate_regular_rect_mesh(
+        a=(-0.5,)*dim, b=(0.5,)*dim, n=(3,)*dim)
+
+    low_discr = EagerDGDiscretization(actx, mesh, order=1)
+    high_discr = EagerDGDiscretization(actx, mesh, order=3)
+
+    nodes = thaw(actx, low_discr.nodes())
+    state = make_obj_array([1 + nodes[0] - 2*nodes[1]])
+
+    def extract_vars(dim, state, eos):
+        return {"mass": state[0]}
+
+    def units(quantity):
+        return "1"
+
+    from logpyle import LogManager
+    from mirgecom.logging_quantities import (
+        DiscretizationBasedQuantity, DiscretizationBasedQuantityGroup)
+    logmgr = LogManager(None, "w")
+    logmgr.add_quantity(DiscretizationBasedQuantityGroup(low_discr,
+        [("mass", "max", None), ("mass", "L2_norm", None)], extract_vars, units))
+    logmgr.add_quantity(DiscretizationBasedQuantity(low_discr, "mass", "min",
+        extract_vars, units))
+
+    dt = 1/32
+    nsteps = 2
+
+    def rhs(t, state):
+        return -state
+
+    from mirgecom.integrators import rk4_step
+    from mirgecom.p_sequencing import OrderStage, advance_state_p_sequenced
+    stages = [
+        OrderStage(discr=low_discr, rhs=rhs, t_final=nsteps*dt,
+                   get_timestep=lambda state: dt),
+        OrderStage(discr=high_discr, rhs=rhs, t_final=2*nsteps*dt,
+                   get_timestep=lambda state: dt),
+    ]
+
+    istep, t, result = advance_state_p_sequenced(stages, rk4_step, state,
+        logmgr=logmgr, dim=dim)
+
+    assert istep == 2*nsteps
+
+    # the quantities are gathered before each step, so the first gathering on
+    # the second stage sees the transferred state; gather the final state too
+    logmgr.tick_before()
+
+    def logged(name):
+        _, _, data = logmgr.get_expr_dataset(name)
+        assert [step for step, _ in data] == list(range(1, 2*nsteps + 1))
+        return data[-1][1]
+
+    expected = {
+        "max_mass": high_discr.nodal_max("vol", result[0]),
+        "L2_norm_mass": high_discr.norm(result[0], 2),
+        "min_mass": high_discr.nodal_min("vol", result[0]),
+    }
+    for name, value in expected.items():
+        logger.info(f"{name}: logged {logged(name)}, expected {value}")
+        assert abs(logged(name) - value) < 1e-12
+
+    logmgr.close()
@@ -0,0 +1,355 @@
+"""Test the profiling tools."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import json
+import numpy as np
+import logging
+import pytest
+
+import pyopencl as cl
+import pyopencl.array as cla
+from meshmode.array_context import (  # noqa
+    pytest_generate_tests_for_pyopencl_array_context
+    as pytest_generate_tests)
+
+from mirgecom.profiling import (
+    CrossRankProfile,
+    gather_cross_rank_profile,
+    PyOpenCLProfilingArrayContext,
+    SingleCallKernelProfile,
+    DevicePeaks,
+    measure_device_peaks,
+    TrackingMemoryPool,
+)
+from mirgecom.timing import (
+    RegionTimer,
+    timed_region,
+    enable_region_timing,
+    disable_region_timing,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# {{{ cross-rank profile
+
+def _make_cross_rank_profile():
+    return CrossRankProfile(
+        ranks=[{"rank": 0, "partition": 1, "hostname": "a", "nelements": 10},
+               {"rank": 1, "partition": 0, "hostname": "a", "nelements": None}],
+        kernel_times={"knl": np.array([1., 3.])},
+        region_times={"step": np.array([2., 4.]),
+                      "step/rhs": np.array([1., 2.])})
+
+
+def test_cross_rank_profile_tables(tmp_path):
+    """Check the imbalance and per-rank tables and the JSON output."""
+    profile = _make_cross_rank_profile()
+
+    header, row = profile.tabulate_kernels().rows
+    # imbalance (max-mean)/mean, slowest rank first
+    assert row[0] == "knl"
+    assert row[4] == "0.500"
+    assert row[5] == "1, 0"
+
+    _, rank0, rank1 = profile.tabulate_ranks().rows
+    # only top-level regions count toward the region time of a rank
+    assert rank0 == [0, 1, "a", 10, "1", "2"]
+    assert rank1 == [1, 0, "a", "--", "3", "4"]
+
+    profile.write_json(str(tmp_path / "profile.json"))
+    with open(tmp_path / "profile.json") as inf:
+        data = json.load(inf)
+    assert data["ranks"] == profile.ranks
+    assert data["region_times"]["step/rhs"] == [1., 2.]
+
+
+class _Mesh:
+    nelements = 12
+
+
+class _Discretization:
+    """Stands in for a discretization on one partition of a mesh."""
+
+    def __init__(self, comm):
+        self.mpi_communicator = comm
+        self.mesh = _Mesh()
+
+
+def test_gather_cross_rank_profile():
+    """Check the gathered profile of a single rank."""
+    pytest.importorskip("mpi4py")
+    from mpi4py import MPI
+
+    timer = RegionTimer()
+    timer.enter("step")
+    timer.exit()
+
+    profile = gather_cross_rank_profile(MPI.COMM_SELF, region_timer=timer)
+    assert profile.ranks[0]["partition"] is None
+    assert profile.ranks[0]["nelements"] is None
+    assert set(profile.region_times) == {"step"}
+    assert profile.kernel_times == {}
+
+    # the partition is the rank in the communicator of the discretization
+    profile = gather_cross_rank_profile(MPI.COMM_SELF, region_timer=timer,
+                                        discr=_Discretization(MPI.COMM_WORLD))
+    assert profile.ranks[0]["partition"] == MPI.COMM_WORLD.Get_rank()
+    assert profile.ranks[0]["nelements"] == 12
+
+# }}}
+
+
+# {{{ profiling array context
+
+def _make_profiling_queue(actx_factory):
+    return cl.CommandQueue(actx_factory().queue.context,
+        properties=cl.command_queue_properties.PROFILING_ENABLE)
+
+
+def test_profile_event_harvesting(actx_factory):
+    """Check that the event buffer stays bounded and no events are lost."""
+    queue = _make_profiling_queue(actx_factory)
+    actx = PyOpenCLProfilingArrayContext(queue, max_pending_events=4,
+                                         harvest_interval=2,
+                                         use_persistent_stats_cache=False)
+
+    timer = enable_region_timing()
+    try:
+        a = cla.zeros(queue, 1000, np.float64)
+        nlaunches = 50
+        with timed_region("adds"):
+            for _ in range(nlaunches):
+                a = a + 1
+                assert len(actx.profile_events) < 4
+
+        # device times are attributed to the active region timer on transfer
+        actx._wait_and_transfer_profile_events()
+    finally:
+        disable_region_timing()
+
+    assert not actx.profile_events
+    assert np.all(a.get() == nlaunches)
+
+    # the kernels of the additions, but not those of cla.zeros, which ran
+    # outside of the region
+    num_calls = sum(r.num_calls for r in actx.profile_results.values())
+    assert num_calls >= nlaunches
+    assert timer.device_times["adds"].num_values == nlaunches
+
+    # results are accumulated per kernel, not stored per call
+    assert all(r.time.num_values == r.num_calls
+               for r in actx.profile_results.values())
+
+
+def test_kernel_stats_cache(actx_factory, tmp_path, monkeypatch):
+    """Check that kernel statistics are computed once and then looked up."""
+    from pytools.persistent_dict import WriteOncePersistentDict
+    from loopy.tools import LoopyKeyBuilder
+    import mirgecom.profiling as profiling
+
+    monkeypatch.setattr(profiling, "_kernel_stats_cache",
+        WriteOncePersistentDict("mirgecom-test-kernel-stats",
+                                key_builder=LoopyKeyBuilder(),
+                                container_dir=str(tmp_path)))
+
+    num_computed = 0
+    compute_kernel_stats = PyOpenCLProfilingArrayContext._compute_kernel_stats
+
+    def counting_compute_kernel_stats(self, program, kwargs):
+        nonlocal num_computed
+        num_computed += 1
+        return compute_kernel_stats(self, program, kwargs)
+
+    monkeypatch.setattr(PyOpenCLProfilingArrayContext, "_compute_kernel_stats",
+                        counting_compute_kernel_stats)
+
+    from meshmode.array_context import make_loopy_program
+    prg = make_loopy_program("{[i]: 0 <= i < n}", "out[i] = 2*x[i]",
+                             name="double")
+
+    queue = _make_profiling_queue(actx_factory)
+    x = cla.zeros(queue, 100, np.float64)
+
+    actx = PyOpenCLProfilingArrayContext(queue)
+    actx.call_loopy(prg, x=x)
+    actx.call_loopy(prg, x=x)
+    assert num_computed == 1
+
+    # a new array context (as in a later run) finds them in the persistent cache
+    actx = PyOpenCLProfilingArrayContext(queue)
+    actx.call_loopy(prg, x=x)
+    assert num_computed == 1
+    assert actx.get_profiling_data_for_kernel("double").flops.sum() > 0
+
+    # unless the persistent cache is disabled
+    actx = PyOpenCLProfilingArrayContext(queue, use_persistent_stats_cache=False)
+    actx.call_loopy(prg, x=x)
+    assert num_computed == 2
+
+
+def test_profiling_requires_profiling_queue(actx_factory):
+    """Check that a queue without profiling is rejected."""
+    queue = cl.CommandQueue(actx_factory().queue.context)
+    with pytest.raises(RuntimeError):
+        PyOpenCLProfilingArrayContext(queue)
+
+# }}}
+
+
+# {{{ device peaks and roofline
+
+def test_measure_device_peaks(actx_factory):
+    """Smoke test for the peak measurement, with a queue without profiling."""
+    queue = actx_factory().queue
+    peaks = measure_device_peaks(queue, nbytes=2**20, fma_iterations=16,
+                                 ntrials=2)
+
+    assert peaks.device_name == queue.device.name
+    assert peaks.bandwidth > 0
+    assert peaks.flops > 0
+
+
+def test_roofline(actx_factory, tmp_path):
+    """Check the roofline metrics for kernels with known counts and times."""
+    from mirgecom.profiling import _KernelProfileAccumulator
+
+    actx = PyOpenCLProfilingArrayContext(_make_profiling_queue(actx_factory))
+
+    # 1 s, 1 GFlop, 1 GByte: memory bound at a bandwidth of 0.5 GByte/s
+    memory_bound = _KernelProfileAccumulator()
+    memory_bound.add_result(SingleCallKernelProfile(
+        time=1e9, flops=1e9, bytes_accessed=1e9, footprint_bytes=1e9))
+    # 2 s, 100 GFlop, 1 GByte: compute bound at 10 GFlops/s
+    compute_bound = _KernelProfileAccumulator()
+    compute_bound.add_result(SingleCallKernelProfile(
+        time=2e9, flops=1e11, bytes_accessed=1e9, footprint_bytes=1e9))
+    # no flops: not on the roofline
+    copy = _KernelProfileAccumulator()
+    copy.add_result(SingleCallKernelProfile(
+        time=1e9, flops=0, bytes_accessed=1e9, footprint_bytes=1e9))
+
+    actx.profile_results = {"memory_bound": memory_bound,
+                            "compute_bound": compute_bound,
+                            "copy": copy}
+
+    peaks = DevicePeaks(device_name="device", bandwidth=0.5, flops=10)
+    compute_row, memory_row = actx._roofline_rows(peaks)
+
+    assert compute_row["kernel"] == "compute_bound"
+    assert compute_row["bound"] == "compute"
+    assert compute_row["attainable_gflops_per_sec"] == pytest.approx(10)
+    assert compute_row["percent_of_attainable"] == pytest.approx(500)
+
+    assert memory_row["kernel"] == "memory_bound"
+    assert memory_row["bound"] == "memory"
+    assert memory_row["intensity"] == pytest.approx(1)
+    assert memory_row["attainable_gflops_per_sec"] == pytest.approx(0.5)
+    assert memory_row["percent_of_attainable"] == pytest.approx(200)
+
+    actx.write_roofline(peaks, str(tmp_path / "roofline.json"))
+    with open(tmp_path / "roofline.json") as inf:
+        data = json.load(inf)
+    assert data["peaks"]["bandwidth"] == 0.5
+    assert [row["kernel"] for row in data["kernels"]] == \
+        ["compute_bound", "memory_bound"]
+
+    actx.write_roofline(peaks, str(tmp_path / "roofline.csv"))
+    with open(tmp_path / "roofline.csv") as inf:
+        assert len(inf.read().splitlines()) == 3
+
+# }}}
+
+
+# {{{ memory pool tracking
+
+def test_tracking_memory_pool(actx_factory):
+    """Check the byte counts through allocation, release, and freeing."""
+    import gc
+    import pyopencl.tools as cl_tools
+
+    queue = actx_factory().queue
+    pool = cl_tools.MemoryPool(cl_tools.ImmediateAllocator(queue))
+    tracker = TrackingMemoryPool(pool)
+
+    nbytes = 10000
+    size = pool.alloc_size(pool.bin_number(nbytes))
+
+    def counts():
+        return (tracker.active_bytes, tracker.held_bytes, tracker.num_allocations,
+                tracker.num_misses)
+
+    buf = tracker(nbytes)
+    assert counts() == (size, 0, 1, 1)
+
+    del buf
+    gc.collect()
+    assert counts() == (0, size, 1, 1)
+
+    # reuses the held block
+    buf = tracker(nbytes)
+    assert counts() == (size, 0, 2, 1)
+    assert tracker.peak_active_bytes == size
+
+    del buf
+    gc.collect()
+    tracker.free_held()
+    assert counts() == (0, 0, 2, 1)
+    assert pool.held_blocks == 0
+
+    buf = tracker(nbytes)
+    del buf
+    gc.collect()
+    assert counts() == (0, size, 3, 2)
+
+    # the pool frees its held blocks behind the tracker's back, as it does
+    # when an allocation fails for lack of memory
+    pool.free_held()
+    assert counts() == (0, 0, 3, 2)
+
+    buf = tracker(nbytes)
+    assert counts() == (size, 0, 4, 3)
+
+    # peaks per region, including nested regions
+    enable_region_timing()
+    try:
+        with timed_region("outer"):
+            with timed_region("inner"):
+                buf2 = tracker(4*nbytes)
+    finally:
+        disable_region_timing()
+
+    peak = size + pool.alloc_size(pool.bin_number(4*nbytes))
+    assert tracker.region_peak_active_bytes == {"outer": peak,
+                                                "outer/inner": peak}
+
+    tracker.reset_interval_peak()
+    del buf, buf2
+    gc.collect()
+    assert tracker.interval_peak_active_bytes == peak
+    assert tracker.active_bytes == 0
+
+# }}}
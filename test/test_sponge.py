@@ -0,0 +1,143 @@
+"""Test the sponge-layer source term."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import numpy as np
+import logging
+import pytest
+
+from pytools.obj_array import make_obj_array
+from meshmode.dof_array import thaw
+from meshmode.mesh import BTAG_ALL
+from mirgecom.euler import split_conserved
+from mirgecom.initializers import Lump, Uniform
+from mirgecom.sponge import SpongeSource, box_sponge_weight, add_sponge
+from grudge.eager import EagerDGDiscretization
+from meshmode.array_context import (  # noqa
+    pytest_generate_tests_for_pyopencl_array_context
+    as pytest_generate_tests)
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+@pytest.mark.parametrize("exponent", [1, 2])
+def test_box_sponge_weight(actx_factory, dim, exponent):
+    """Check the sponge weight against its definition.
+
+    The weight must vanish inside the box, equal the amplitude at a distance of
+    *thickness* from it, and grow as the given power of the distance in between.
+    """
+    actx = actx_factory()
+
+    # The domain extends exactly to the outer edge of the layer
+    inner_min = (-0.5, -0.25, -0.5)[:dim]
+    inner_max = (0.5, 0.5, 0.25)[:dim]
+    thickness = 0.5
+    amplitude = 10.0
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mesh = generate_regular_rect_mesh(
+        a=tuple(a - thickness for a in inner_min),
+        b=tuple(b + thickness for b in inner_max),
+        n=(7,) * dim)
+
+    discr = EagerDGDiscretization(actx, mesh, order=2)
+    nodes = thaw(actx, discr.nodes())
+
+    weight = box_sponge_weight(nodes, inner_min=inner_min, inner_max=inner_max,
+                               thickness=thickness, amplitude=amplitude,
+                               exponent=exponent)
+
+    # Host reference, node by node
+    for igrp, weight_i in enumerate(weight):
+        x = np.array([actx.to_numpy(nodes[idim][igrp]) for idim in range(dim)])
+        distance = np.max([
+            np.maximum(np.maximum(a - x_i, x_i - b), 0)
+            for x_i, a, b in zip(x, inner_min, inner_max)], axis=0)
+
+        weight_i = actx.to_numpy(weight_i)
+        inside = distance == 0
+        assert np.any(inside) and np.any(~inside)
+        assert np.all(weight_i[inside] == 0)
+        assert np.allclose(weight_i, amplitude*(distance/thickness)**exponent,
+                           rtol=1e-12, atol=0)
+
+    # The outer boundary is at a distance of thickness from the box
+    bnd_weight = discr.project("vol", BTAG_ALL, weight)
+    assert discr.norm(bnd_weight - amplitude, np.inf, dd=BTAG_ALL) \
+        < 1e-12 * amplitude
+    assert abs(discr.norm(weight, np.inf) - amplitude) < 1e-12 * amplitude
+
+
+def test_sponge_source(actx_factory):
+    """Check the relaxation source term."""
+    actx = actx_factory()
+
+    dim = 2
+    nel_1d = 8
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+
+    mesh = generate_regular_rect_mesh(
+        a=(-1.0,) * dim, b=(1.0,) * dim, n=(nel_1d,) * dim
+    )
+
+    discr = EagerDGDiscretization(actx, mesh, order=2)
+    nodes = thaw(actx, discr.nodes())
+
+    weight = box_sponge_weight(nodes, inner_min=(-0.5,) * dim,
+                               inner_max=(0.5,) * dim, thickness=0.5,
+                               amplitude=10.0)
+
+    target = Uniform(dim=dim, rho=2.0, p=3.0)(nodes)
+    state = Lump(dim=dim)(nodes)
+
+    expected = make_obj_array([weight*(t_i - q_i)
+                               for t_i, q_i in zip(target, state)])
+
+    # The target may be given as conserved variables or as a state vector
+    for sponge_target in [split_conserved(dim, target), target]:
+        sponge = SpongeSource(weight, target=sponge_target)
+        source = sponge(state)
+
+        assert discr.norm(source - expected, np.inf) < 1e-12 * discr.norm(
+            expected, np.inf)
+
+    def rhs(t, q):
+        return 0*q
+
+    source = add_sponge(rhs, sponge)(0.0, state)
+    assert discr.norm(source - expected, np.inf) < 1e-12 * discr.norm(
+        expected, np.inf)
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        exec(sys.argv[1])
+    else:
+        from pytest import main
+        main([__file__])
@@ -0,0 +1,140 @@
+"""Test the estimation of stable timesteps."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import numpy as np
+import logging
+import pytest
+
+from pytools.obj_array import flat_obj_array
+from meshmode.dof_array import flatten, unflatten
+from meshmode.mesh import BTAG_ALL
+from grudge.eager import EagerDGDiscretization
+from grudge.symbolic.primitives import QTAG_NONE
+from meshmode.array_context import (  # noqa
+    pytest_generate_tests_for_pyopencl_array_context
+    as pytest_generate_tests)
+
+from mirgecom.integrators import rk4_step
+from mirgecom.stability import (
+    estimate_eigenvalues,
+    estimate_spectral_radius,
+    stability_region_radius,
+    get_stable_timestep,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _get_wave_rhs(discr):
+    from mirgecom.wave import WaveOperator
+    wave_operator = WaveOperator(discr, c=1)
+
+    def rhs(t, w):
+        return wave_operator(w)
+
+    return rhs, 1 + discr.dim
+
+
+def _get_diffusion_rhs(discr):
+    from mirgecom.diffusion import DiffusionOperator, DirichletDiffusionBoundary
+    diffusion_operator = DiffusionOperator(discr, quad_tag=QTAG_NONE, alpha=1.,
+        boundaries={BTAG_ALL: DirichletDiffusionBoundary(0.)})
+
+    def rhs(t, u):
+        return flat_obj_array(diffusion_operator(u[0]))
+
+    return rhs, 1
+
+
+def _get_jacobian(actx, discr, rhs, nfields):
+    """Assemble the matrix of the linear operator *rhs* column by column."""
+    vol_discr = discr.discr_from_dd("vol")
+    ndofs = vol_discr.ndofs
+
+    def from_vector(vec):
+        return flat_obj_array([
+            unflatten(actx, vol_discr,
+                      actx.from_numpy(vec[i*ndofs:(i+1)*ndofs].copy()))
+            for i in range(nfields)])
+
+    def to_vector(fields):
+        return np.concatenate([actx.to_numpy(flatten(f)) for f in fields])
+
+    columns = []
+    for j in range(nfields*ndofs):
+        unit = np.zeros(nfields*ndofs)
+        unit[j] = 1
+        columns.append(to_vector(rhs(0., from_vector(unit))))
+
+    return np.array(columns).T, from_vector(np.zeros(nfields*ndofs))
+
+
+@pytest.mark.parametrize("get_rhs", [_get_wave_rhs, _get_diffusion_rhs])
+def test_estimate_eigenvalues(actx_factory, get_rhs):
+    """Compare the estimates for a 1D DG operator to its assembled matrix."""
+    actx = actx_factory()
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mesh = generate_regular_rect_mesh(a=(-1.,), b=(1.,), n=(9,))
+    discr = EagerDGDiscretization(actx, mesh, order=3)
+
+    rhs, nfields = get_rhs(discr)
+    jacobian, zeros = _get_jacobian(actx, discr, rhs, nfields)
+
+    exact = np.linalg.eigvals(jacobian)
+    exact_radius = np.max(np.abs(exact))
+
+    radius = estimate_spectral_radius(discr, rhs, zeros, niterations=30,
+                                      rtol=1e-6)
+    assert abs(radius - exact_radius) < 0.02*exact_radius
+
+    # Take the complex conjugate pairs of the upwind wave operator into account
+    estimates = estimate_eigenvalues(discr, rhs, zeros, niterations=30,
+                                     rtol=1e-6)
+    dominant = exact[np.argmax(np.abs(exact))]
+    assert np.min(np.abs(estimates - dominant)) < 0.02*exact_radius
+
+    exact_dt = min(
+        stability_region_radius(rk4_step, float(np.round(np.angle(
+            min(lam.real, 0) + 1j*abs(lam.imag)), 4))) / abs(lam)
+        for lam in exact if lam != 0)
+
+    dt = get_stable_timestep(discr, rhs, zeros, rk4_step, niterations=30,
+                             rtol=1e-6)
+    assert 0.5*exact_dt < dt < exact_dt
+
+    # The estimates are cached per key
+    assert estimate_eigenvalues(discr, rhs, zeros, cache_key="op") is \
+        estimate_eigenvalues(discr, lambda t, w: 0*w, zeros, cache_key="op")
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        exec(sys.argv[1])
+    else:
+        from pytest import main
+        main([__file__])
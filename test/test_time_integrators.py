@@ -64,3 +64,16 @@ def test_integration_order(integrator, method_order):
 
     logger.info(f"Time Integrator EOC:\n = {integrator_eoc}")
     assert integrator_eoc.order_estimate() >= method_order - .01
+
+
+@pytest.mark.parametrize(("integrator", "eigenvalue_angle", "expected_radius"),
+                         [(rk4_step, np.pi, 2.785293563),
+                          (rk4_step, np.pi/2, 2*np.sqrt(2)),
+                          (euler_step, np.pi, 2.),
+                          (euler_step, np.pi/2, 0.)])
+def test_stability_region_radius(integrator, eigenvalue_angle, expected_radius):
+    """Test the extent of the stability regions against known values."""
+    from mirgecom.stability import stability_region_radius
+
+    radius = stability_region_radius(integrator, eigenvalue_angle)
+    assert abs(radius - expected_radius) < 1e-6
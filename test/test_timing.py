@@ -0,0 +1,109 @@
+"""Test the timing regions."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import json
+import pytest
+
+from mirgecom.timing import (
+    timed_region,
+    enable_region_timing,
+    disable_region_timing,
+    get_region_timer,
+    current_region_path,
+)
+
+
+@pytest.fixture
+def region_timer():
+    """Enable region timing for the duration of a test."""
+    timer = enable_region_timing()
+    yield timer
+    disable_region_timing()
+
+
+def test_timed_region_disabled():
+    """Check that regions record nothing while timing is disabled."""
+    disable_region_timing()
+
+    with timed_region("region"):
+        assert current_region_path() is None
+
+    assert get_region_timer() is None
+
+
+def test_timed_region_context_manager(region_timer):
+    """Check the paths and call counts of nested regions."""
+    for _ in range(3):
+        with timed_region("outer"):
+            assert current_region_path() == "outer"
+            with timed_region("inner"):
+                assert current_region_path() == "outer/inner"
+            assert current_region_path() == "outer"
+
+    assert current_region_path() is None
+    assert set(region_timer.region_times) == {"outer", "outer/inner"}
+    assert region_timer.region_times["outer"].num_values == 3
+    assert region_timer.region_times["outer/inner"].num_values == 3
+    assert (region_timer.region_times["outer/inner"].sum()
+            <= region_timer.region_times["outer"].sum())
+
+
+def test_timed_region_decorator(region_timer):
+    """Check that a decorated function is timed on each call, even if it raises."""
+    @timed_region("func")
+    def func(fail):
+        assert current_region_path() == "func"
+        if fail:
+            raise RuntimeError
+
+    func(False)
+    with pytest.raises(RuntimeError):
+        func(True)
+
+    assert current_region_path() is None
+    assert region_timer.region_times["func"].num_values == 2
+
+
+def test_chrome_trace(tmp_path):
+    """Check the Chrome trace, including dropped events."""
+    timer = enable_region_timing(max_trace_events=2)
+    try:
+        for _ in range(3):
+            with timed_region("step"):
+                pass
+        timer.add_device_time("step", 1.5)
+    finally:
+        disable_region_timing()
+
+    assert timer.device_times["step"].sum() == 1.5
+
+    timer.write_chrome_trace(str(tmp_path / "trace-{rank}.json"), rank=3)
+    with open(tmp_path / "trace-3.json") as inf:
+        trace = json.load(inf)
+
+    assert [event["name"] for event in trace["traceEvents"]] == ["step", "step"]
+    assert all(event["pid"] == 3 for event in trace["traceEvents"])
+    assert trace["otherData"]["num_dropped_events"] == 1
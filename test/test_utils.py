@@ -0,0 +1,104 @@
+"""Test the utilities."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+
+import numpy as np
+import pytest
+
+from mirgecom.utils import StatisticsAccumulator
+
+
+def test_statistics_accumulator_empty():
+    """Test that an empty accumulator returns no statistics."""
+    acc = StatisticsAccumulator()
+
+    assert acc.num_values == 0
+    assert acc.sum() is None
+    assert acc.mean() is None
+    assert acc.variance() is None
+    assert acc.percentile(50) is None
+    assert acc.histogram() == ([], [])
+
+    # None values are ignored
+    acc.add_value(None)
+    assert acc.num_values == 0
+
+
+@pytest.mark.parametrize("scale_factor", [1, 1e-9])
+def test_statistics_accumulator_moments(scale_factor):
+    """Test the moments of the accumulator against numpy."""
+    rng = np.random.default_rng(seed=42)
+    values = rng.lognormal(mean=10, sigma=1, size=10000)
+
+    acc = StatisticsAccumulator(scale_factor=scale_factor)
+    for v in values:
+        acc.add_value(v)
+
+    scaled = values * scale_factor
+
+    assert acc.num_values == len(values)
+    assert np.isclose(acc.sum(), np.sum(scaled))
+    assert np.isclose(acc.mean(), np.mean(scaled))
+    assert np.isclose(acc.min(), np.min(scaled))
+    assert np.isclose(acc.max(), np.max(scaled))
+    assert np.isclose(acc.variance(), np.var(scaled))
+    assert np.isclose(acc.std(), np.std(scaled))
+
+
+def test_statistics_accumulator_percentiles():
+    """Test the approximate percentiles and the histogram of the accumulator."""
+    rng = np.random.default_rng(seed=7)
+    # Mostly fast values with a slow tail, as for kernel times with jitter
+    values = np.concatenate([
+        rng.uniform(1e-3, 2e-3, size=9800),
+        rng.uniform(1e-1, 2e-1, size=200)])
+
+    acc = StatisticsAccumulator()
+    for v in values:
+        acc.add_value(v)
+
+    # Relative accuracy of the log-binned histogram
+    rtol = 10**(1/(2*acc.bins_per_decade)) - 1
+
+    for q in [50, 95, 99]:
+        assert np.isclose(acc.percentile(q), np.percentile(values, q), rtol=rtol)
+
+    assert acc.percentile(0) == np.min(values)
+    assert acc.percentile(100) == np.max(values)
+
+    with pytest.raises(ValueError):
+        acc.percentile(101)
+
+    edges, counts = acc.histogram()
+    assert sum(counts) == len(values)
+    for (lower, upper), count in zip(edges, counts):
+        assert count == np.sum((values >= lower) & (values < upper))
+
+    # Values <= 0 are counted, but not in the histogram
+    acc.add_value(0)
+    assert acc.percentile(0) == 0
+    assert sum(acc.histogram()[1]) == len(values)
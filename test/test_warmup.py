@@ -0,0 +1,63 @@
+"""Test the ahead-of-time kernel compilation entry point."""
+
+__copyright__ = """
+Copyright (C) 2020 University of Illinois Board of Trustees
+"""
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import os
+import sys
+import pytest
+
+from mirgecom.warmup import main
+
+
+def test_warmup_main(capsys):
+    """Smoke test for the serial command-line entry point."""
+    main(["--dim", "2", "--order", "1", "--nspecies", "2",
+          "--operators", "inviscid,diffusion,wave", "--integrator", "euler"])
+
+    out = capsys.readouterr().out
+    assert "First call time" in out
+    assert "Total" in out
+
+
+def test_warmup_main_unknown_operator():
+    """Check that an unknown operator is rejected before compiling anything."""
+    with pytest.raises(SystemExit):
+        main(["--operators", "inviscid,viscous"])
+
+
+@pytest.mark.mpi
+def test_warmup_main_mpi():
+    """Smoke test for the entry point on a partitioned mesh under MPI."""
+    pytest.importorskip("mpi4py")
+
+    from subprocess import check_output
+    out = check_output([
+        "mpiexec", "-n", "2", sys.executable, "-m", "mpi4py", "-m",
+        "mirgecom.warmup", "--leader-first", "node", "--dim", "2",
+        "--order", "1", "--operators", "inviscid,wave"],
+        env=os.environ.copy()).decode()
+
+    assert "Serial mesh:" in out
+    assert "Partitioned mesh:" in out